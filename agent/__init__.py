@@ -4,25 +4,51 @@ Agent module for LangChain-based video analysis and processing.
 
 from models import VideoSegment, VideoSegmentation
 
-# Functional LCEL-style exports from video_segmenter folder
-from .video_segmenter import (
-    create_segmentation_chain,
-    segment_video,
-    segment_long_video,
-    format_transcript_snippets,
-    format_timestamp,
-    create_streaming_segmentation_chain,
-    prepare_segmentation_input
-)
+# Functional LCEL-style exports from video_segmenter folder, imported on first
+# use (PEP 562) so "import agent.chatbot" doesn't load the segmentation stack
+_SEGMENTER_EXPORTS = {
+    "create_segmentation_chain",
+    "segment_video",
+    "segment_video_batched",
+    "segment_long_video",
+    "segment_long_video_async",
+    "segment_long_video_with_stats",
+    "segment_long_video_stream",
+    "format_transcript_snippets",
+    "index_transcript_snippets",
+    "format_transcript_window",
+    "format_timestamp",
+    "create_streaming_segmentation_chain",
+    "create_batched_segmentation_chain",
+    "prepare_segmentation_input"
+}
+
+
+def __getattr__(name):
+    """Load video_segmenter exports lazily."""
+    if name in _SEGMENTER_EXPORTS:
+        from . import video_segmenter
+        value = getattr(video_segmenter, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "VideoSegment", 
     "VideoSegmentation",
     "create_segmentation_chain",
     "segment_video",
+    "segment_video_batched",
     "segment_long_video",
+    "segment_long_video_async",
+    "segment_long_video_with_stats",
+    "segment_long_video_stream",
     "format_transcript_snippets",
+    "index_transcript_snippets",
+    "format_transcript_window",
     "format_timestamp",
     "create_streaming_segmentation_chain",
+    "create_batched_segmentation_chain",
     "prepare_segmentation_input"
 ]
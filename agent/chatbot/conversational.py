@@ -1,8 +1,28 @@
+import asyncio
+import json
+import logging
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from langchain_core.messages import AIMessageChunk
 from langchain_core.prompts import PromptTemplate
 from langchain.agents import create_agent
 from langchain.tools import tool
-from src.config import instruction_model
+from src.config import instruction_model, get_draft_model
 from models import get_db
+from .semantic_cache import get_semantic_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Transcript lookups started while the model is still streaming its tool call,
+# keyed by (video_id, start_time, end_time, max_snippets)
+_prefetch_executor = ThreadPoolExecutor(max_workers=4)
+_pending_transcripts = {}
 
 
 @tool
@@ -22,54 +42,178 @@ def getSegmentTranscript(video_id: str, start_time: int, end_time: int, max_snip
     Returns:
         Transcript text for the time range, or error message if video not found
     """
+    # Reuse a lookup already started by stream_chatbot()
+    pending = _pending_transcripts.pop((video_id, start_time, end_time, max_snippets), None)
+    if pending is not None:
+        return pending.result()
+    
+    return _segment_transcript(video_id, start_time, end_time, max_snippets)
+
+
+def _segment_transcript(video_id: str, start_time: int, end_time: int, max_snippets: int = 50) -> str:
+    """Look up transcript text for a time range (see getSegmentTranscript)."""
     db = get_db()
     
-    # Get video from database
-    video = db.get_video(video_id)
-    if not video:
+    # Get time index over the video's transcript
+    index = db.get_transcript_index(video_id)
+    if not index:
         return f"Error: Video {video_id} not found in database"
     
-    transcript = video["transcript"]
+    starts, ends, texts = index["starts"], index["ends"], index["texts"]
+    
+    if index["ends_sorted"]:
+        # Snippets ending after start_time form a suffix, so bisect ends directly
+        first = bisect_right(ends, start_time)
+    else:
+        # Snippets starting before this point end before start_time, so skip them
+        first = bisect_right(starts, start_time - index["max_duration"])
     
     # Handle exact time query (start == end)
     if start_time == end_time:
         # Find the snippet that contains this exact timestamp
-        for snippet in transcript:
-            snippet_start = snippet["start"]
-            snippet_end = snippet_start + snippet.get("duration", 0)
-            
-            if snippet_start <= start_time < snippet_end:
-                return snippet["text"]
+        for i in range(first, bisect_right(starts, start_time)):
+            if ends[i] > start_time:
+                return texts[i]
         
         return f"No transcript found at {start_time} seconds"
     
-    # Handle time range query
-    relevant_snippets = []
-    for snippet in transcript:
-        snippet_start = snippet["start"]
-        snippet_end = snippet_start + snippet.get("duration", 0)
-        
-        # Include snippet if it overlaps with the requested range
-        if snippet_start < end_time and snippet_end > start_time:
-            relevant_snippets.append(snippet)
-            
-            # Stop if we've reached the limit
-            if len(relevant_snippets) >= max_snippets:
-                break
+    # Handle time range query: snippets overlapping [start_time, end_time)
+    last = bisect_left(starts, end_time)
+    if index["ends_sorted"]:
+        # Every snippet in [first, last) overlaps the range
+        relevant_texts = texts[first:min(last, first + max_snippets)]
+    else:
+        relevant_texts = []
+        for i in range(first, last):
+            if ends[i] > start_time:
+                relevant_texts.append(texts[i])
+                
+                # Stop if we've reached the limit
+                if len(relevant_texts) >= max_snippets:
+                    break
     
-    if not relevant_snippets:
+    if not relevant_texts:
         return f"No transcript found between {start_time}s and {end_time}s"
     
     # Join all snippet texts
-    transcript_text = " ".join(snippet["text"] for snippet in relevant_snippets)
+    transcript_text = " ".join(relevant_texts)
     
     # Add notice if limit was reached
-    if len(relevant_snippets) >= max_snippets:
+    if len(relevant_texts) >= max_snippets:
         transcript_text += f"\n\n[Note: Showing first {max_snippets} snippets. Total range may contain more.]"
     
     return transcript_text
 
 
+# Fields of a segment line, in format order
+_segment_fields = itemgetter("title", "start_time", "end_time", "summary")
+
+# video_id -> (segmentation id, formatted segments), LRU ordered; prompts are
+# built in worker threads, so the lock guards it
+_segments_text_cache = OrderedDict()
+_segments_text_cache_lock = threading.Lock()
+_SEGMENTS_CACHE_SIZE = 2048
+
+
+def _format_segments(video_id: str) -> str:
+    """
+    Format the video segments as one line per segment.
+    
+    The formatted string is cached per video and keyed by the segmentation's
+    row id, which changes on every re-segmentation, so it is rebuilt only
+    when a new segmentation is saved.
+    
+    Args:
+        video_id: YouTube video ID
+    
+    Returns:
+        Formatted segments string
+    """
+    segmentation = get_db().get_segmentation(video_id)
+    
+    if not segmentation or not segmentation.get("segmentation"):
+        return "No segments available yet."
+    
+    version = segmentation["id"]
+    with _segments_text_cache_lock:
+        cached = _segments_text_cache.get(video_id)
+        if cached is not None and cached[0] == version:
+            _segments_text_cache.move_to_end(video_id)
+            return cached[1]
+    
+    segments = segmentation["segmentation"]["segments"]
+    text = "\n".join(["- %s (%ss - %ss): %s" % _segment_fields(seg) for seg in segments])
+    
+    with _segments_text_cache_lock:
+        _segments_text_cache[video_id] = (version, text)
+        _segments_text_cache.move_to_end(video_id)
+        while len(_segments_text_cache) > _SEGMENTS_CACHE_SIZE:
+            _segments_text_cache.popitem(last=False)
+    
+    return text
+
+
+def clear_segments_cache(video_id: str = None):
+    """
+    Forget what was derived from a video's segments, after it is (re-)segmented.
+    
+    Cached segment strings are rebuilt on their own once stale, but cached
+    answers were written from the old segments (or from none) and are dropped.
+    
+    Args:
+        video_id: Video whose segments changed, or None for all videos
+    """
+    with _segments_text_cache_lock:
+        if video_id is None:
+            _segments_text_cache.clear()
+        else:
+            _segments_text_cache.pop(video_id, None)
+    get_semantic_cache().clear(video_id)
+
+
+# Approximate token budget for the conversation history in each prompt
+MAX_HISTORY_TOKENS = 2000
+
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _format_history(conversation_history: list = None, max_tokens: int = MAX_HISTORY_TOKENS) -> str:
+    """
+    Format conversation history as one "role: content" line per message.
+    
+    Only the most recent messages fitting max_tokens are kept (the latest one
+    is always kept), so the prompt stays bounded over long sessions.
+    
+    Args:
+        conversation_history: List of {"role", "content"} messages, oldest first
+        max_tokens: Approximate token budget for the formatted history
+    
+    Returns:
+        Formatted history string
+    """
+    if not conversation_history:
+        return "No previous conversation."
+    
+    # Walk back from the newest message until the budget is used up
+    lines = []
+    used = 0
+    for msg in reversed(conversation_history):
+        line = f"{msg.get('role', 'user')}: {msg.get('content', '')}"
+        used += _estimate_tokens(line)
+        if lines and used > max_tokens:
+            break
+        lines.append(line)
+    
+    omitted = len(conversation_history) - len(lines)
+    if omitted:
+        lines.append(f"({omitted} earlier messages omitted)")
+    
+    return "\n".join(reversed(lines))
+
+
 def format_instructions(video_id: str = None, video_title: str = None, conversation_history: list = None) -> dict:
     """
     Format all variables needed for the agent initialization.
@@ -82,45 +226,21 @@ def format_instructions(video_id: str = None, video_title: str = None, conversat
     Returns:
         Dictionary with all formatted variables for the agent
     """
-    db = get_db()
-    
     # If video_id is None, set default values
     if video_id is None:
         formatted_segments = "No video specified yet."
         video_title = video_title or "No video"
-        formatted_history = "No previous conversation." if not conversation_history else "\n".join([
-            f"{msg.get('role', 'user')}: {msg.get('content', '')}"
-            for msg in conversation_history
-        ])
     else:
-        # Get video info from database if title not provided or to fetch segments
-        video = db.get_video(video_id)
-        
-        # Use provided title, or fetch from DB, or use fallback
+        # Fetch title from DB only if not provided, or use fallback
         if video_title is None:
+            video = get_db().get_video(video_id)
             video_title = video.get("title", f"Video {video_id}") if video else f"Video {video_id}"
         
-        # Get segmentation from database
-        segmentation = db.get_segmentation(video_id)
-        
-        # Format video segments
-        if segmentation and segmentation.get("segmentation"):
-            segments = segmentation["segmentation"]["segments"]
-            formatted_segments = "\n".join([
-                f"- {seg['title']} ({seg['start_time']}s - {seg['end_time']}s): {seg['summary']}"
-                for seg in segments
-            ])
-        else:
-            formatted_segments = "No segments available yet."
-        
-        # Format conversation history
-        if conversation_history:
-            formatted_history = "\n".join([
-                f"{msg.get('role', 'user')}: {msg.get('content', '')}"
-                for msg in conversation_history
-            ])
-        else:
-            formatted_history = "No previous conversation."
+        # Format video segments (memoized per video)
+        formatted_segments = _format_segments(video_id)
+    
+    # Format conversation history
+    formatted_history = _format_history(conversation_history)
     
     # Format tool information
     tool_name = getSegmentTranscript.name
@@ -135,8 +255,8 @@ def format_instructions(video_id: str = None, video_title: str = None, conversat
     }
 
 
-# Agent prompt template
-prompt = """You are a youtube chatbot designed to assist users with inquiries about youtube videos.
+# Agent system prompt: static per video, so providers can reuse the cached prefix
+system_prompt = """You are a youtube chatbot designed to assist users with inquiries about youtube videos.
 your primary function is to provide accurate and concise information based on the video's transcript and metadata.
 and assist users in navigating and understanding the content of youtube videos effectively by providing exercises and explanations.
 You should be able to answer questions related to the video's content, summarize key points, and provide additional context or explanations as needed.
@@ -148,33 +268,278 @@ Tool available:
 here is the video title: {video_title}
 Heres the key segments of the video:
 {video_segments}
+"""
 
-The conversation history so far:
+# Per-turn user prompt
+user_prompt = """The conversation history so far:
 {conversation_history}
 
 User message: {message}
 
 """
 
-template = PromptTemplate(
+# PromptTemplates kept for documentation/introspection; the hot path formats
+# the raw strings with str.format_map to skip PromptTemplate's per-call validation
+system_template = PromptTemplate(
     input_variables=[
         "tool_names",
         "tool",
         "video_title",
         "video_segments",
+    ],
+    template=system_prompt,
+)
+
+user_template = PromptTemplate(
+    input_variables=[
         "conversation_history",
         "message",
     ],
-    template=prompt,
+    template=user_prompt,
 )
 
-# Initialize agent with prompt, tools, and model
+
+@lru_cache(maxsize=1024)
+def _format_system_prompt(tool_names: str, tool: str, video_title: str, video_segments: str) -> str:
+    """Format the system prompt, memoized since it only changes on re-segmentation."""
+    return system_prompt.format_map({
+        "tool_names": tool_names,
+        "tool": tool,
+        "video_title": video_title,
+        "video_segments": video_segments,
+    })
+
+
+def _format_messages(video_id: str, video_title: str, message: str, conversation_history: list = None) -> list:
+    """
+    Format the agent messages for one call.
+    
+    The static video context goes in the system message and the per-turn
+    content in the user message, so the prompt prefix stays identical across
+    turns and can be served from the provider's prompt cache.
+    
+    Args:
+        video_id: YouTube video ID
+        video_title: Title of the video
+        message: Message to answer (a single question or a tagged batch)
+        conversation_history: List of previous conversation messages
+    
+    Returns:
+        List of system and user message dicts
+    """
+    # Format all the context variables
+    context = format_instructions(video_id, video_title, conversation_history)
+    
+    system = _format_system_prompt(
+        context["tool_names"],
+        context["tool"],
+        context["video_title"],
+        context["video_segments"],
+    )
+    user = user_prompt.format_map({
+        "conversation_history": context["conversation_history"],
+        "message": message,
+    })
+    
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+
+
+# Initialize agent with tools and model (the formatted prompt is sent per call)
 agent = create_agent(
     model=instruction_model,
-    tools=[getSegmentTranscript],
-    system_prompt=prompt
+    tools=[getSegmentTranscript]
+)
+
+# Small model tried first for conversational turns (greetings, thanks, questions
+# about the assistant) that need nothing from the video; its draft is kept when
+# it answers without calling the transcript tool and stays short
+DRAFT_MAX_CHARS = 400
+draft_stats = {"hits": 0, "misses": 0}
+
+# Whole messages the draft model may answer; anything else could be about the
+# video's content and goes to the agent, which can read the transcript
+_SMALL_TALK_RE = re.compile(
+    r"(hi|hello|hey|yo|thanks?|thank you|thx|ok|okay|cool|great|nice|got it|"
+    r"bye|goodbye|good (morning|afternoon|evening)|who are you|what can you do)"
+    r"( (there|so much|a lot|again))?[\s!.?,:)]*",
+    re.I
+)
+
+
+def _is_small_talk(message: str) -> bool:
+    """Whether a message is a conversational turn the draft model may answer."""
+    return _SMALL_TALK_RE.fullmatch(message.strip()) is not None
+
+
+def _accept_draft(draft) -> str:
+    """
+    Decide whether a draft reply can be returned instead of running the agent.
+    
+    Args:
+        draft: Draft model response message, or None if the draft call failed
+    
+    Returns:
+        The draft text, or None if the full agent should answer
+    """
+    content = draft.content if draft is not None and isinstance(draft.content, str) else ""
+    if not content.strip() or draft.tool_calls or len(content) >= DRAFT_MAX_CHARS:
+        draft_stats["misses"] += 1
+        return None
+    
+    draft_stats["hits"] += 1
+    logger.info("⚡ Draft answer used (%d/%d hits)", draft_stats['hits'], draft_stats['hits'] + draft_stats['misses'])
+    return content
+
+
+@lru_cache(maxsize=1)
+def _get_draft_llm():
+    """Draft model with the transcript tool bound, created on the first small-talk turn."""
+    return get_draft_model().bind_tools([getSegmentTranscript])
+
+
+def _draft_reply(messages: list) -> str:
+    """Ask the draft model for a short answer (see _accept_draft)."""
+    try:
+        return _accept_draft(_get_draft_llm().invoke(messages))
+    except Exception as e:
+        logger.warning("⚠️  Draft model failed: %s", e)
+        return _accept_draft(None)
+
+
+async def _adraft_reply(messages: list) -> str:
+    """Async version of _draft_reply()."""
+    try:
+        return _accept_draft(await _get_draft_llm().ainvoke(messages))
+    except Exception as e:
+        logger.warning("⚠️  Draft model failed: %s", e)
+        return _accept_draft(None)
+
+
+# Instructions prepended to the message when several questions share one call
+BATCH_INSTRUCTIONS = (
+    "The user asked several questions. Answer each one separately and start every answer "
+    "on a new line with the tag of its question, e.g. \"[1] ...\"."
 )
 
+# Matches the "[i]" tag at the start of each answer in a batched response
+_ANSWER_TAG_RE = re.compile(r"^\[(\d+)\][ \t]*(.*)", re.M)
+
+
+def _split_batched_answers(text: str, count: int) -> list:
+    """
+    Split a batched response into one answer per "[i]"-tagged question.
+    
+    Args:
+        text: Final agent message containing "[i] answer" blocks
+        count: Number of questions in the batch
+    
+    Returns:
+        List of answers, with None for questions whose tag is missing or empty
+    """
+    answers = {}
+    matches = list(_ANSWER_TAG_RE.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        answers[int(match.group(1))] = text[match.start(2):end].strip() or None
+    
+    return [answers.get(i) for i in range(1, count + 1)]
+
+
+def _answer_single(item: dict) -> str:
+    """
+    Answer one user turn on its own (draft model for small talk, else the agent).
+    
+    Args:
+        item: Dict with video_id, video_title, user_message and optional
+            conversation_history
+    
+    Returns:
+        Agent response
+    """
+    message = item["user_message"]
+    messages = _format_messages(
+        item["video_id"], item["video_title"], message, item.get("conversation_history")
+    )
+    
+    # Small-talk turns try the draft model first
+    content = _draft_reply(messages) if _is_small_talk(message) else None
+    if content is None:
+        response = agent.invoke({"messages": messages})
+        content = response["messages"][-1].content
+    return content
+
+
+def run_chatbot_batch(items: list) -> list:
+    """
+    Run the chatbot agent for several user turns, sharing one call per video.
+    
+    Items with the same video and conversation history are answered by a single
+    agent call whose message lists the questions as "[1] q1", "[2] q2", ...
+    Questions the batched reply leaves untagged are asked again on their own.
+    A single small-talk turn is first offered to the draft model, and the agent
+    runs when the draft is rejected or the question may be about the video.
+    
+    Args:
+        items: List of dicts with video_id, video_title, user_message and
+            optional conversation_history
+    
+    Returns:
+        List of agent responses in the same order as items
+    """
+    cache = get_semantic_cache()
+    responses = [None] * len(items)
+    
+    # Group items sharing the same prompt prefix
+    buckets = {}
+    for index, item in enumerate(items):
+        history = item.get("conversation_history") or []
+        
+        # Opening questions don't depend on history, so they can be served from cache
+        if not history:
+            cached = cache.get(item["video_id"], item["user_message"])
+            if cached:
+                responses[index] = cached
+                continue
+        
+        history_key = tuple((msg.get("role", "user"), msg.get("content", "")) for msg in history)
+        key = (item["video_id"], item["video_title"], history_key)
+        buckets.setdefault(key, []).append(index)
+    
+    for indexes in buckets.values():
+        # A single question is sent as-is
+        if len(indexes) == 1:
+            responses[indexes[0]] = _answer_single(items[indexes[0]])
+        else:
+            # Several are tagged with their index
+            first = items[indexes[0]]
+            questions = "\n".join(
+                f"[{i}] {items[index]['user_message']}"
+                for i, index in enumerate(indexes, 1)
+            )
+            messages = _format_messages(
+                first["video_id"], first["video_title"],
+                f"{BATCH_INSTRUCTIONS}\n{questions}", first.get("conversation_history")
+            )
+            response = agent.invoke({"messages": messages})
+            answers = _split_batched_answers(response["messages"][-1].content, len(indexes))
+            
+            for index, answer in zip(indexes, answers):
+                if answer is None:
+                    # The reply can't be attributed to this question, so ask it alone
+                    logger.warning("⚠️  Batched reply has no answer tagged for a question, asking it separately")
+                    answer = _answer_single(items[index])
+                responses[index] = answer
+        
+        for index in indexes:
+            item = items[index]
+            if not item.get("conversation_history"):
+                cache.set(item["video_id"], item["user_message"], responses[index])
+    
+    return responses
+
 
 def run_chatbot(video_id: str, video_title: str, user_message: str, conversation_history: list = None):
     """
@@ -189,16 +554,170 @@ def run_chatbot(video_id: str, video_title: str, user_message: str, conversation
     Returns:
         Agent's response
     """
-    # Format all the context variables
-    context = format_instructions(video_id, video_title, conversation_history)
+    return run_chatbot_batch([{
+        "video_id": video_id,
+        "video_title": video_title,
+        "user_message": user_message,
+        "conversation_history": conversation_history,
+    }])[0]
+
+
+def _prefetch_tool_calls(gathered: AIMessageChunk, started: dict):
+    """
+    Start getSegmentTranscript lookups for tool calls whose arguments are complete.
     
-    # Add the current user message
-    context["message"] = user_message
+    Args:
+        gathered: Tool-call chunks of the current model turn merged so far
+        started: Lookups already started for this response, updated in place
+    """
+    for tool_call in gathered.tool_call_chunks:
+        if tool_call.get("name") != getSegmentTranscript.name or not tool_call.get("args"):
+            continue
+        
+        # Arguments are still streaming until they parse as JSON
+        try:
+            args = getSegmentTranscript.args_schema.model_validate(json.loads(tool_call["args"]))
+        except ValueError:
+            continue
+        
+        key = (args.video_id, args.start_time, args.end_time, args.max_snippets)
+        if key in started:
+            continue
+        
+        started[key] = _prefetch_executor.submit(_segment_transcript, *key)
+        _pending_transcripts[key] = started[key]
+
+
+async def stream_chatbot(video_id: str, video_title: str, user_message: str, conversation_history: list = None):
+    """
+    Stream the chatbot agent's response token by token.
+    
+    Small talk (greetings, thanks, questions about the assistant) is answered
+    by the draft model in one piece. Otherwise the agent streams the answer,
+    and transcript lookups for getSegmentTranscript calls are started as soon
+    as the model has streamed their arguments, so the database work overlaps
+    the rest of the model's output instead of waiting for the tool step.
     
-    # Invoke the agent with all variables
+    Args:
+        video_id: YouTube video ID
+        video_title: Title of the video
+        user_message: The user's current message/question
+        conversation_history: List of previous conversation messages
+    
+    Yields:
+        Response text chunks as the model generates them
+    """
+    async for _, text in _stream_turns(video_id, video_title, user_message, conversation_history):
+        yield text
 
-    formatted_prompt = template.format(**context)
 
-    response = agent.invoke({"system_instructions":formatted_prompt})
+async def _stream_turns(video_id: str, video_title: str, user_message: str, conversation_history: list = None):
+    """
+    Stream the response text tagged with the model turn it belongs to.
+    
+    The agent may write some text before a tool call and answer after it, so
+    only the last turn's text is the reply; that is what gets cached.
+    
+    Args:
+        video_id: YouTube video ID
+        video_title: Title of the video
+        user_message: The user's current message/question
+        conversation_history: List of previous conversation messages
+    
+    Yields:
+        (turn ID, text chunk) tuples; the turn ID is None for cached and draft answers
+    """
+    cache = get_semantic_cache()
+    
+    # Opening questions don't depend on history, so they can be served from cache
+    # (embedding the question blocks, so lookups run in a worker thread)
+    if not conversation_history:
+        cached = await asyncio.to_thread(cache.get, video_id, user_message)
+        if cached:
+            yield None, cached
+            return
+    
+    # Assemble the prompt off the event loop (first turns on a video read and
+    # parse the segmentation from SQLite)
+    messages = await asyncio.to_thread(
+        _format_messages, video_id, video_title, user_message, conversation_history
+    )
+    
+    # Small talk is answered by the draft model
+    draft = await _adraft_reply(messages) if _is_small_talk(user_message) else None
+    if draft is not None:
+        if not conversation_history:
+            await asyncio.to_thread(cache.set, video_id, user_message, draft)
+        yield None, draft
+        return
     
-    return response["messages"][-1].content
\ No newline at end of file
+    final_turn, final_chunks = None, []
+    gathered = None
+    started = {}
+    try:
+        async for chunk, metadata in agent.astream(
+            {"messages": messages},
+            stream_mode="messages"
+        ):
+            if not isinstance(chunk, AIMessageChunk):
+                continue
+            
+            # Start transcript lookups as soon as tool-call arguments are complete
+            if chunk.tool_call_chunks:
+                # Only merge chunks from the same model turn
+                gathered = chunk if gathered is None or gathered.id != chunk.id else gathered + chunk
+                _prefetch_tool_calls(gathered, started)
+            
+            # Only forward text generated by the model (skip tool results)
+            if chunk.content:
+                if chunk.id != final_turn:
+                    final_turn, final_chunks = chunk.id, []
+                final_chunks.append(chunk.content)
+                yield chunk.id, chunk.content
+    finally:
+        # Drop lookups the agent never asked for
+        for key, future in started.items():
+            if _pending_transcripts.get(key) is future:
+                del _pending_transcripts[key]
+    
+    if not conversation_history:
+        await asyncio.to_thread(cache.set, video_id, user_message, "".join(final_chunks))
+
+
+async def arun_chatbot(video_id: str, video_title: str, user_message: str, conversation_history: list = None):
+    """
+    Run the chatbot agent asynchronously with formatted context.
+    
+    Same as run_chatbot() but awaits the agent, so the event loop can serve
+    other requests while waiting on the LLM. Shares stream_chatbot()'s code
+    path and returns the text of the final model turn, like run_chatbot().
+    
+    Args:
+        video_id: YouTube video ID
+        video_title: Title of the video
+        user_message: The user's current message/question
+        conversation_history: List of previous conversation messages
+    
+    Returns:
+        Agent's response
+    """
+    final_turn, final_chunks = None, []
+    async for turn, text in _stream_turns(video_id, video_title, user_message, conversation_history):
+        if turn != final_turn:
+            final_turn, final_chunks = turn, []
+        final_chunks.append(text)
+    return "".join(final_chunks)
+
+
+async def run_chatbot_many(requests: list) -> list:
+    """
+    Run several independent chatbot requests concurrently.
+    
+    Args:
+        requests: List of dicts with arun_chatbot() keyword arguments
+    
+    Returns:
+        List of responses (or raised exceptions) in the same order as requests
+    """
+    tasks = [arun_chatbot(**request) for request in requests]
+    return await asyncio.gather(*tasks, return_exceptions=True)
@@ -5,6 +5,7 @@ This shows how to access video data and segments from the database
 to provide context-aware responses.
 """
 
+from bisect import bisect_left
 from models import get_db
 
 
@@ -20,13 +21,13 @@ def get_video_context(video_id: str) -> dict:
     """
     db = get_db()
     
-    # Get video transcript
-    video = db.get_video(video_id)
-    if not video:
+    # Get video transcript and segmentation in one round-trip
+    bundle = db.prefetch_video_bundle(video_id)
+    if not bundle:
         return {"error": f"Video {video_id} not found in database"}
     
-    # Get segmentation
-    segmentation = db.get_segmentation(video_id)
+    video = bundle["video"]
+    segmentation = bundle["segmentation"]
     if not segmentation:
         return {
             "video_id": video_id,
@@ -98,17 +99,16 @@ def get_transcript_snippet(video_id: str, start_time: float, end_time: float) ->
     """
     db = get_db()
     
-    video = db.get_video(video_id)
-    if not video:
+    index = db.get_transcript_index(video_id)
+    if not index:
         return ""
     
-    # Filter transcript snippets by time
-    relevant_snippets = [
-        snippet for snippet in video["transcript"]
-        if snippet["start"] >= start_time and snippet["start"] < end_time
-    ]
+    # Snippets are sorted by start, so the time window is one contiguous slice
+    starts = index["starts"]
+    first = bisect_left(starts, start_time)
+    last = bisect_left(starts, end_time, first)
     
-    return " ".join(snippet["text"] for snippet in relevant_snippets)
+    return " ".join(index["texts"][first:last])
 
 
 # Example usage in conversational context
@@ -0,0 +1,166 @@
+"""
+Semantic cache for chatbot answers.
+
+Questions are embedded with sentence-transformers (all-MiniLM-L6-v2) when it is
+installed, so paraphrased questions about the same video reuse a stored answer.
+Without it, the cache falls back to matching normalized question text. Either
+way, the numbers and timestamps in the questions must match exactly, since
+embeddings barely tell "at 3:10" from "at 13:10".
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Optional dependency
+    np = None
+    SentenceTransformer = None
+
+
+_NORMALIZE_RE = re.compile(r"[^\w\s]")
+
+# Numbers and timestamps (e.g. "3", "2.5", "13:10", "1:02:03")
+_NUMBER_RE = re.compile(r"\d+(?:[:.]\d+)*")
+
+
+def _normalize(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(_NORMALIZE_RE.sub("", text.lower()).split())
+
+
+def _numbers(text: str) -> tuple:
+    """Numbers and timestamps in a question, in order."""
+    return tuple(_NUMBER_RE.findall(text))
+
+
+class SemanticCache:
+    """Per-video LRU cache of answers keyed by question embeddings."""
+
+    def __init__(self, threshold: float = 0.92, ttl_seconds: float = 3600,
+                 max_videos: int = 256, max_entries_per_video: int = 256,
+                 model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: How long a stored answer stays valid
+            max_videos: Maximum number of videos kept (least recently used evicted)
+            max_entries_per_video: Maximum number of answers kept per video
+            model_name: sentence-transformers model used for embeddings
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_videos = max_videos
+        self.max_entries_per_video = max_entries_per_video
+        self.model_name = model_name
+        self._model = None
+        self._model_lock = threading.Lock()
+        # video_id -> list of (key, numbers, answer, expires_at); the lock guards it
+        # across the threads of the batch path (embedding runs outside it)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        """Load the embedding model now instead of on the first question."""
+        if SentenceTransformer is not None and self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = SentenceTransformer(self.model_name)
+
+    def _embed(self, text: str):
+        """Return the lookup key for a question: an embedding, or normalized text."""
+        if SentenceTransformer is None:
+            return _normalize(text)
+        self.warm_up()
+        return self._model.encode(text, normalize_embeddings=True)
+
+    def _similarity(self, a, b) -> float:
+        """Cosine similarity of two keys (embeddings are already normalized)."""
+        if SentenceTransformer is None:
+            return 1.0 if a == b else 0.0
+        return float(np.dot(a, b))
+
+    def get(self, video_id: str, question: str) -> Optional[str]:
+        """
+        Look up a cached answer for a question about a video.
+
+        Args:
+            video_id: YouTube video ID
+            question: User question
+
+        Returns:
+            Cached answer, or None on a miss
+        """
+        if not self._cache.get(video_id):
+            return None
+
+        key = self._embed(question)
+        numbers = _numbers(question)
+        with self._lock:
+            entries = self._cache.get(video_id)
+            if not entries:
+                return None
+            self._cache.move_to_end(video_id)
+            now = time.monotonic()
+            entries[:] = [entry for entry in entries if entry[3] > now]
+            candidates = [entry for entry in entries if entry[1] == numbers]
+
+        best_answer, best_score = None, self.threshold
+        for entry_key, _, answer, _ in candidates:
+            score = self._similarity(key, entry_key)
+            if score >= best_score:
+                best_answer, best_score = answer, score
+
+        return best_answer
+
+    def set(self, video_id: str, question: str, answer: str):
+        """
+        Store an answer for a question about a video.
+
+        Args:
+            video_id: YouTube video ID
+            question: User question
+            answer: Agent answer to store (empty answers are not stored)
+        """
+        if not answer or not answer.strip():
+            return
+
+        key = self._embed(question)
+        with self._lock:
+            entries = self._cache.setdefault(video_id, [])
+            self._cache.move_to_end(video_id)
+
+            entries.append((key, _numbers(question), answer, time.monotonic() + self.ttl_seconds))
+            if len(entries) > self.max_entries_per_video:
+                del entries[0]
+
+            while len(self._cache) > self.max_videos:
+                self._cache.popitem(last=False)
+
+    def clear(self, video_id: Optional[str] = None):
+        """Drop cached answers for one video, or for all videos."""
+        with self._lock:
+            if video_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(video_id, None)
+
+
+# Singleton instance (the lock keeps concurrent first calls from loading the model twice)
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_semantic_cache() -> SemanticCache:
+    """Get or create semantic cache singleton instance."""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = SemanticCache()
+    return _cache_instance
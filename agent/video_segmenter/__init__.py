@@ -4,18 +4,28 @@ Video segmentation module with functional composition approach.
 
 from .create_segmentation_chain import create_segmentation_chain
 from .segment_video import segment_video
-from .segment_long_video import segment_long_video
-from .format_transcript_snippets import format_transcript_snippets
-from .format_timestamp import format_timestamp
+from .segment_video_batched import segment_video_batched
+from .segment_long_video import segment_long_video, segment_long_video_async, segment_long_video_with_stats, segment_long_video_stream
+from .format_transcript_snippets import format_transcript_snippets, index_transcript_snippets, format_transcript_window
+from .format_timestamp import format_timestamp, format_timestamps
 from .create_streaming_segmentation_chain import create_streaming_segmentation_chain
+from .create_batched_segmentation_chain import create_batched_segmentation_chain
 from .prepare_segmentation_input import prepare_segmentation_input
 
 __all__ = [
     "create_segmentation_chain",
     "segment_video",
+    "segment_video_batched",
     "segment_long_video",
+    "segment_long_video_async",
+    "segment_long_video_with_stats",
+    "segment_long_video_stream",
     "format_transcript_snippets",
+    "index_transcript_snippets",
+    "format_transcript_window",
     "format_timestamp",
+    "format_timestamps",
     "create_streaming_segmentation_chain",
+    "create_batched_segmentation_chain",
     "prepare_segmentation_input"
 ]
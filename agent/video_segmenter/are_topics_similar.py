@@ -17,16 +17,42 @@ def are_topics_similar(seg1, seg2, threshold: float = 0.3) -> bool:
     Returns:
         True if topics overlap >= threshold
     """
-    topics1 = set(topic.lower() for topic in seg1.key_topics)
-    topics2 = set(topic.lower() for topic in seg2.key_topics)
+    return topic_sets_similar(seg1.key_topics_set, seg2.key_topics_set, threshold)
+
+
+def topic_sets_similar(topics1: frozenset, topics2: frozenset, threshold: float = 0.3) -> bool:
+    """
+    Jaccard similarity check on already-lowercased topic sets.
+    
+    Args:
+        topics1, topics2: Sets of lowercased key topics
+        threshold: Minimum Jaccard similarity (0.0 - 1.0) to consider similar
     
+    Returns:
+        True if topics overlap >= threshold
+    """
     if not topics1 or not topics2:
         return False
     
     # Calculate Jaccard similarity: |A ∩ B| / |A ∪ B|
     intersection = len(topics1 & topics2)
-    union = len(topics1 | topics2)
+    union = len(topics1) + len(topics2) - intersection
+    
+    return intersection / union >= threshold
+
+
+def topic_masks_similar(mask1: int, mask2: int, threshold: float = 0.3) -> bool:
+    """
+    Jaccard similarity check on topic bitmasks (one bit per distinct topic).
+    
+    Args:
+        mask1, mask2: Bitmasks of lowercased key topics
+        threshold: Minimum Jaccard similarity (0.0 - 1.0) to consider similar
     
-    similarity = intersection / union if union > 0 else 0
+    Returns:
+        True if topics overlap >= threshold
+    """
+    if not mask1 or not mask2:
+        return False
     
-    return similarity >= threshold
+    return (mask1 & mask2).bit_count() / (mask1 | mask2).bit_count() >= threshold
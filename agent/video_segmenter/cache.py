@@ -0,0 +1,161 @@
+"""
+Cache segmentation chain results so re-segmenting the same transcript skips the LLM.
+
+Results are stored in Redis when the redis package is installed and REDIS_URL
+is set, otherwise in an in-process LRU. Entries expire after CACHE_TTL_SECONDS,
+and keys include PROMPT_VERSION so prompt changes don't reuse old results.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from models import VideoSegmentation
+from .create_segmentation_chain import PROMPT_VERSION
+
+try:
+    import redis
+except ImportError:  # Optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_TTL_SECONDS = 3600
+LOCAL_CACHE_SIZE = 256
+
+cache_stats = {"hits": 0, "misses": 0}
+
+# key -> (expiry time, VideoSegmentation), LRU ordered; used from the event
+# loop and from worker threads, so the lock guards it
+_local_cache = OrderedDict()
+_local_cache_lock = threading.Lock()
+_redis_client = None
+
+
+def _get_redis():
+    """Get the Redis client, or None if Redis isn't configured."""
+    global _redis_client
+    if _redis_client is None and redis is not None and os.getenv("REDIS_URL"):
+        _redis_client = redis.Redis.from_url(os.environ["REDIS_URL"])
+    return _redis_client
+
+
+def segmentation_cache_key(payload: dict, key_fields: tuple = ()) -> str:
+    """
+    Content-addressed key for a chain call.
+
+    Args:
+        payload: Chain input ({video_id, transcript})
+        key_fields: Extra values that change the result (e.g. model name)
+
+    Returns:
+        Hex digest identifying the call
+    """
+    data = json.dumps([PROMPT_VERSION, payload, list(key_fields)], sort_keys=True, default=str)
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+def _get(key: str) -> Optional[VideoSegmentation]:
+    """Look up a cached result in Redis, then in the local cache."""
+    client = _get_redis()
+    if client is not None:
+        try:
+            value = client.get(f"seg:{key}")
+            if value is not None:
+                return VideoSegmentation.model_validate_json(value)
+        except redis.RedisError as e:
+            logger.warning("⚠️  Redis get failed, using local cache: %s", e)
+
+    with _local_cache_lock:
+        entry = _local_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _local_cache[key]
+            return None
+        _local_cache.move_to_end(key)
+        return entry[1]
+
+
+def _set(key: str, result: VideoSegmentation):
+    """Store a result in Redis (if configured) and in the local cache."""
+    client = _get_redis()
+    if client is not None:
+        try:
+            client.setex(f"seg:{key}", CACHE_TTL_SECONDS, result.model_dump_json())
+        except redis.RedisError as e:
+            logger.warning("⚠️  Redis set failed: %s", e)
+
+    with _local_cache_lock:
+        _local_cache[key] = (time.monotonic() + CACHE_TTL_SECONDS, result)
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > LOCAL_CACHE_SIZE:
+            _local_cache.popitem(last=False)
+
+
+def _record(hit: bool):
+    """Count a cache hit or miss."""
+    cache_stats["hits" if hit else "misses"] += 1
+    if hit:
+        logger.info("♻️  Segmentation cache hit (%d hits, %d misses)", cache_stats['hits'], cache_stats['misses'])
+
+
+def lookup(payload: dict, key_fields: tuple = ()) -> Optional[VideoSegmentation]:
+    """
+    Get the cached result for a chain call, counting the hit or miss.
+
+    Args:
+        payload: Chain input ({video_id, transcript})
+        key_fields: Extra values that change the result (e.g. model name)
+
+    Returns:
+        Cached VideoSegmentation, or None on a miss
+    """
+    result = _get(segmentation_cache_key(payload, key_fields))
+    _record(result is not None)
+    return result
+
+
+def store(payload: dict, result: VideoSegmentation, key_fields: tuple = ()):
+    """Cache the result of a chain call (see lookup)."""
+    _set(segmentation_cache_key(payload, key_fields), result)
+
+
+def cached_invoke(chain, payload: dict, key_fields: tuple = (), refresh: bool = False) -> VideoSegmentation:
+    """
+    Run chain.invoke(payload), reusing a cached result for identical calls.
+
+    Args:
+        chain: Segmentation chain (see create_segmentation_chain)
+        payload: Chain input ({video_id, transcript})
+        key_fields: Extra values that change the result (e.g. model name)
+        refresh: Skip the cached result and replace it with a new call's
+
+    Returns:
+        VideoSegmentation result
+    """
+    result = None if refresh else lookup(payload, key_fields)
+    if result is None:
+        result = chain.invoke(payload)
+        store(payload, result, key_fields)
+    return result
+
+
+async def cached_ainvoke(chain, payload: dict, key_fields: tuple = (), refresh: bool = False) -> VideoSegmentation:
+    """Async version of cached_invoke()."""
+    result = None if refresh else lookup(payload, key_fields)
+    if result is None:
+        result = await chain.ainvoke(payload)
+        store(payload, result, key_fields)
+    return result
+
+
+def clear_segmentation_cache():
+    """Drop locally cached results (Redis entries expire on their own)."""
+    with _local_cache_lock:
+        _local_cache.clear()
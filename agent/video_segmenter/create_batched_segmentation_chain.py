@@ -0,0 +1,74 @@
+"""
+Create an LCEL chain that segments several transcript chunks in one request.
+"""
+
+import os
+from typing import Optional
+from langchain_core.prompts import PromptTemplate
+from models import VideoSegmentationBatch
+from .create_segmentation_chain import _get_llm
+from .fast_output_parser import FastPydanticOutputParser
+
+
+_BATCH_PARSER = FastPydanticOutputParser(pydantic_object=VideoSegmentationBatch)
+
+_BATCH_PROMPT = PromptTemplate(
+    template="""You are an expert at analyzing educational video transcripts and identifying logical topic segments.
+
+Below are {chunk_count} independent chunks of video transcripts with timestamps in [MM:SS] or [HH:MM:SS] format.
+Segment EACH chunk separately: identify distinct segments where the topic or concept changes.
+
+{chunks}
+
+INSTRUCTIONS:
+1. Return exactly {chunk_count} segmentations, one per chunk, in the same order as the chunks
+2. Use each chunk's VIDEO ID as the video_id of its segmentation
+3. **IMPORTANT**: Return start_time and end_time in SECONDS (not minutes or hours). 
+   Examples: [02:30] = 150 seconds, [01:30:45] = 5445 seconds
+4. Provide a clear title for each segment
+5. Write a brief 2-3 sentence summary
+6. List the entire key topics/concepts covered
+7. Estimate difficulty level (easy/medium/hard)
+8. Determine the overall topic/theme of each chunk
+
+{format_instructions}
+
+Provide your analysis:""",
+    input_variables=["chunk_count", "chunks"],
+    partial_variables={"format_instructions": _BATCH_PARSER.get_format_instructions()}
+)
+
+
+def format_chunk_batch(chunk_inputs: list) -> dict:
+    """
+    Pack several segmentation chain inputs into one batched chain input.
+    
+    Args:
+        chunk_inputs: List of {video_id, transcript} dicts
+    
+    Returns:
+        Input for the batched chain ({chunk_count, chunks})
+    """
+    chunks = "\n\n".join(
+        f"CHUNK {i}:\nVIDEO ID: {chunk_input['video_id']}\nTRANSCRIPT:\n{chunk_input['transcript']}"
+        for i, chunk_input in enumerate(chunk_inputs, 1)
+    )
+    return {"chunk_count": len(chunk_inputs), "chunks": chunks}
+
+
+def create_batched_segmentation_chain(api_key: Optional[str] = None, model: str = "llama-3.3-70b-versatile"):
+    """
+    Create an LCEL chain that segments several transcript chunks in one request.
+    
+    Args:
+        api_key: Groq API key (defaults to GROQ_API_KEY env variable)
+        model: LLM model to use
+    
+    Returns:
+        Runnable chain that takes format_chunk_batch() output and returns VideoSegmentationBatch
+    """
+    api_key = api_key or os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY not found in environment or provided")
+    
+    return _BATCH_PROMPT | _get_llm(api_key, model) | _BATCH_PARSER
@@ -2,42 +2,100 @@
 Create an LCEL chain for video segmentation.
 """
 
+import asyncio
+import atexit
 import os
+import weakref
+from functools import lru_cache
 from typing import Optional
+import httpx
 from langchain_groq import ChatGroq
-from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import PromptTemplate
 from models import VideoSegmentation
+from .fast_output_parser import FastPydanticOutputParser
 
+try:
+    import h2  # Enables HTTP/2 in httpx
+except ImportError:  # Optional dependency
+    h2 = None
 
-def create_segmentation_chain(api_key: Optional[str] = None, model: str = "llama-3.3-70b-versatile"):
-    """
-    Create an LCEL chain for video segmentation.
-    
-    Args:
-        api_key: Groq API key (defaults to GROQ_API_KEY env variable)
-        model: LLM model to use
+
+# Output parser and its format instructions are the same for every chain
+_PARSER = FastPydanticOutputParser(pydantic_object=VideoSegmentation)
+_FORMAT_INSTRUCTIONS = _PARSER.get_format_instructions()
+
+
+# One pool of keep-alive connections to the Groq API, shared by every chain
+_HTTP_OPTIONS = {
+    "http2": h2 is not None,
+    "timeout": 60.0,
+    "limits": httpx.Limits(max_connections=64, max_keepalive_connections=32),
+}
+_http_client = httpx.Client(**_HTTP_OPTIONS)
+atexit.register(_http_client.close)
+
+
+# Async ChatGroq clients per event loop: {loop: {(api_key, model, streaming): ChatGroq}}
+_loop_llms = weakref.WeakKeyDictionary()
+_loop_closers = set()
+
+
+def _get_llm(api_key: str, model: str, streaming: bool = False) -> ChatGroq:
+    """Get a ChatGroq client, reused across chains with the same settings."""
+    # Async connections belong to the event loop that opened them, so async
+    # clients are shared per loop (segment_long_video runs a new loop per call)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _get_sync_llm(api_key, model, streaming)
     
-    Returns:
-        Runnable chain that takes {video_id, transcript} and returns VideoSegmentation
-    """
-    api_key = api_key or os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in environment or provided")
+    llms = _loop_llms.get(loop)
+    if llms is None:
+        llms = _loop_llms[loop] = {}
+        # Closes the loop's clients when asyncio.run() cancels leftover tasks
+        closer = loop.create_task(_close_loop_llms(loop, llms))
+        _loop_closers.add(closer)
+        closer.add_done_callback(_loop_closers.discard)
     
-    # Initialize LLM
-    llm = ChatGroq(
+    key = (api_key, model, streaming)
+    if key not in llms:
+        llms[key] = _new_llm(api_key, model, streaming, httpx.AsyncClient(**_HTTP_OPTIONS))
+    return llms[key]
+
+
+@lru_cache(maxsize=32)
+def _get_sync_llm(api_key: str, model: str, streaming: bool) -> ChatGroq:
+    """ChatGroq client used outside any event loop, see _get_llm()."""
+    return _new_llm(api_key, model, streaming, None)
+
+
+def _new_llm(api_key: str, model: str, streaming: bool, http_async_client) -> ChatGroq:
+    return ChatGroq(
         model=model,
         temperature=0.1,
-        api_key=api_key
+        api_key=api_key,
+        streaming=streaming,
+        http_client=_http_client,
+        http_async_client=http_async_client
     )
-    
-    # Set up output parser
-    parser = PydanticOutputParser(pydantic_object=VideoSegmentation)
-    
-    # Create prompt
-    prompt = PromptTemplate(
-        template="""You are an expert at analyzing educational video transcripts and identifying logical topic segments.
+
+
+async def _close_loop_llms(loop, llms: dict):
+    """Wait until the loop shuts down, then close its async HTTP clients."""
+    try:
+        await asyncio.Event().wait()
+    finally:
+        _loop_llms.pop(loop, None)
+        for llm in llms.values():
+            await llm.http_async_client.aclose()
+
+
+# Bump when the prompts or parsing change, so cached results from older prompts aren't reused
+PROMPT_VERSION = 1
+
+# Prompt is the same for every chain
+_PROMPT = PromptTemplate(
+    template="""You are an expert at analyzing educational video transcripts and identifying logical topic segments.
 
 Given a video transcript with timestamps in [MM:SS] or [HH:MM:SS] format, identify distinct segments where the topic or concept changes.
 Each segment should represent a coherent section of the video covering a specific subtopic.
@@ -60,15 +118,34 @@ INSTRUCTIONS:
 {format_instructions}
 
 Provide your analysis:""",
-        input_variables=["video_id", "transcript"],
-        partial_variables={"format_instructions": parser.get_format_instructions()}
-    )
+    input_variables=["video_id", "transcript"],
+    partial_variables={"format_instructions": _FORMAT_INSTRUCTIONS}
+)
+
+
+def create_segmentation_chain(api_key: Optional[str] = None, model: str = "llama-3.3-70b-versatile"):
+    """
+    Create an LCEL chain for video segmentation.
+    
+    Args:
+        api_key: Groq API key (defaults to GROQ_API_KEY env variable)
+        model: LLM model to use
+    
+    Returns:
+        Runnable chain that takes {video_id, transcript} and returns VideoSegmentation
+    """
+    api_key = api_key or os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY not found in environment or provided")
+    
+    # Initialize LLM
+    llm = _get_llm(api_key, model)
     
     # LCEL chain composition
     chain = (
-        prompt 
+        _PROMPT 
         | llm 
-        | parser
+        | _PARSER
     )
     
     return chain
@@ -0,0 +1,32 @@
+"""
+Pydantic output parser that validates LLM JSON in a single pass.
+"""
+
+import re
+from pydantic import ValidationError
+from langchain_core.output_parsers import PydanticOutputParser
+
+# A JSON answer wrapped in a Markdown code fence
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+class FastPydanticOutputParser(PydanticOutputParser):
+    """
+    PydanticOutputParser that parses and validates with model_validate_json.
+    
+    Pydantic's JSON validation parses and validates in one pass, skipping the
+    intermediate Python dict built by json.loads. Anything the fast path can't
+    handle (extra text around the JSON, partial output, invalid data) goes
+    through the regular parser, so errors are reported the same way.
+    """
+    
+    def parse_result(self, result, *, partial: bool = False):
+        if not partial:
+            text = result[0].text.strip()
+            match = _FENCE_RE.match(text)
+            try:
+                return self.pydantic_object.model_validate_json(match.group(1) if match else text)
+            except ValidationError:
+                pass
+        
+        return super().parse_result(result, partial=partial)
@@ -2,14 +2,31 @@
 Format timestamp from seconds to HH:MM:SS or MM:SS.
 """
 
+# Zero-padded two-digit strings, indexed by value
+_PAD = [f"{i:02d}" for i in range(100)]
+
 
 def format_timestamp(seconds: float) -> str:
     """Convert seconds to HH:MM:SS or MM:SS format."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    hours, rem = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rem, 60)
     
     if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        return (_PAD[hours] if hours < 100 else str(hours)) + ":" + _PAD[minutes] + ":" + _PAD[secs]
     else:
-        return f"{minutes:02d}:{secs:02d}"
+        return _PAD[minutes] + ":" + _PAD[secs]
+
+
+def format_timestamps(seconds_list: list) -> list:
+    """Convert many second values at once (same output as format_timestamp for each)."""
+    pad = _PAD
+    stamps = []
+    append = stamps.append
+    for seconds in seconds_list:
+        hours, rem = divmod(int(seconds), 3600)
+        minutes, secs = divmod(rem, 60)
+        if hours > 0:
+            append((pad[hours] if hours < 100 else str(hours)) + ":" + pad[minutes] + ":" + pad[secs])
+        else:
+            append(pad[minutes] + ":" + pad[secs])
+    return stamps
@@ -2,40 +2,100 @@
 Format transcript snippets into timestamped text.
 """
 
-from .format_timestamp import format_timestamp
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice, takewhile
+from .format_timestamp import format_timestamps
 
+# Cheapest possible line: "[MM:SS] " with empty text, plus its newline separator
+_MIN_LINE_COST = 9
 
-def format_transcript_snippets(snippets: list, max_chars: int = 15000, start_time: float = 0, end_time: float = None) -> str:
+
+def format_transcript_snippets(snippets: list, max_chars: int = 15000, start_time: float = 0, end_time: float = None,
+                               starts_index: list = None) -> str:
     """
     Format transcript snippets into timestamped text.
-    
+
     Args:
         snippets: List of transcript snippets with .text, .start, .duration
         max_chars: Maximum characters to include
         start_time: Only include snippets starting after this time (in seconds)
         end_time: Only include snippets starting before this time (in seconds)
-    
+        starts_index: Optional precomputed [snippet.start for snippet in snippets]
+            (sorted); lets the time range be located by bisection instead of a scan
+
     Returns:
         Formatted transcript string
     """
-    lines = []
-    total_chars = 0
-    
-    for snippet in snippets:
-        # Filter by time range if specified
-        if snippet.start < start_time:
-            continue
-        if end_time is not None and snippet.start >= end_time:
-            break
-            
-        timestamp = format_timestamp(snippet.start)
-        line = f"[{timestamp}] {snippet.text}"
-        
-        if total_chars + len(line) > max_chars:
-            lines.append("... [transcript truncated for length] ...")
-            break
-        
-        lines.append(line)
-        total_chars += len(line) + 1
-    
+    # No more lines than this can fit, plus one to detect truncation
+    limit = (max_chars + 1) // _MIN_LINE_COST + 1
+
+    # Filter by time range if specified
+    if starts_index is not None:
+        first = bisect_left(starts_index, start_time)
+        last = bisect_left(starts_index, end_time, first) if end_time is not None else len(snippets)
+        candidates = snippets[first:min(last, first + limit)]
+    else:
+        window = (snippet for snippet in snippets if snippet.start >= start_time)
+        if end_time is not None:
+            window = takewhile(lambda snippet: snippet.start < end_time, window)
+        candidates = list(islice(window, limit))
+
+    stamps = format_timestamps([snippet.start for snippet in candidates])
+    lines = [f"[{stamp}] {snippet.text}" for stamp, snippet in zip(stamps, candidates)]
+
+    # Find how many lines fit using the running length of each line plus its newline
+    cutoff = bisect_right(list(accumulate(len(line) + 1 for line in lines)), max_chars + 1)
+
+    if cutoff < len(lines):
+        return "\n".join(lines[:cutoff] + ["... [transcript truncated for length] ..."])
+
     return "\n".join(lines)
+
+
+def index_transcript_snippets(snippets: list) -> dict:
+    """
+    Format every snippet line once so time windows can be cut without reformatting.
+
+    Args:
+        snippets: List of transcript snippets with .text, .start, .duration (sorted by start)
+
+    Returns:
+        Dictionary with "starts" (snippet start times), "lines" (formatted
+        "[timestamp] text" lines) and "offsets" (running length of the lines
+        plus their newlines, so offsets[i] covers lines[0..i])
+    """
+    starts = [snippet.start for snippet in snippets]
+    lines = [f"[{stamp}] {snippet.text}" for stamp, snippet in zip(format_timestamps(starts), snippets)]
+
+    return {
+        "starts": starts,
+        "lines": lines,
+        "offsets": list(accumulate(len(line) + 1 for line in lines))
+    }
+
+
+def format_transcript_window(index: dict, max_chars: int = 15000, start_time: float = 0, end_time: float = None) -> str:
+    """
+    Same output as format_transcript_snippets(), cut from a prebuilt index.
+
+    Args:
+        index: Result of index_transcript_snippets()
+        max_chars: Maximum characters to include
+        start_time: Only include snippets starting after this time (in seconds)
+        end_time: Only include snippets starting before this time (in seconds)
+
+    Returns:
+        Formatted transcript string
+    """
+    starts, lines, offsets = index["starts"], index["lines"], index["offsets"]
+
+    # Locate the time window, then the last line within budget, by bisection
+    first = bisect_left(starts, start_time)
+    last = bisect_left(starts, end_time, first) if end_time is not None else len(starts)
+    base = offsets[first - 1] if first else 0
+    cutoff = bisect_right(offsets, base + max_chars + 1, first, last)
+
+    if cutoff < last:
+        return "\n".join(lines[first:cutoff] + ["... [transcript truncated for length] ..."])
+
+    return "\n".join(lines[first:cutoff])
@@ -2,8 +2,14 @@
 Merge adjacent segments that might be duplicates, overlaps, or continuations.
 """
 
+import re
+from operator import le
 from models import VideoSegment
-from .are_topics_similar import are_topics_similar
+from .are_topics_similar import topic_masks_similar
+
+
+# Title markers of a segment continuing the previous one
+_CONTINUATION_RE = re.compile(r"continued|continuation|part 2|part two|part 3|\(cont|- cont", re.IGNORECASE)
 
 
 def merge_similar_segments(segments: list, similarity_threshold: int = 300) -> list:
@@ -32,51 +38,116 @@ def merge_similar_segments(segments: list, similarity_threshold: int = 300) -> l
     if not segments or len(segments) < 2:
         return segments
     
-    # Sort by start time
-    sorted_segments = sorted(segments, key=lambda s: s.start_time)
+    # Sort by start time (chunked results usually arrive in order already)
+    start_times = [seg.start_time for seg in segments]
+    if all(map(le, start_times, start_times[1:])):
+        sorted_segments = segments
+    else:
+        sorted_segments = sorted(segments, key=lambda s: s.start_time)
     merged = []
+    
+    # Topic bitmasks, one bit per distinct lowercased topic, built once per segment
+    vocab = {}
+    masks = []
+    for seg in sorted_segments:
+        mask = 0
+        for topic in seg.key_topics_set:
+            mask |= 1 << vocab.setdefault(topic, len(vocab))
+        masks.append(mask)
+    
+    # The segment being extended; continuations absorbed into it are collected
+    # here and built into one VideoSegment when the run ends
     current = sorted_segments[0]
+    current_topics = masks[0]
+    end_time = current.end_time
+    summary_parts = None  # Merged summary fragments (None until something is merged)
+    summary_len = len(current.summary)
+    merged_topics = None  # Union of merged key_topics (None until something is merged)
     
-    for next_seg in sorted_segments[1:]:
+    for next_seg, next_topics in zip(sorted_segments[1:], masks[1:]):
         # Calculate time gap between segments
-        time_gap = next_seg.start_time - current.end_time
+        time_gap = next_seg.start_time - end_time
         
         # Case 1: Overlapping segments (next starts before current ends)
         if time_gap < 0:
             # Keep the segment with more detailed information
-            if len(next_seg.summary) + len(next_seg.key_topics) > len(current.summary) + len(current.key_topics):
+            topic_count = len(merged_topics) if merged_topics is not None else len(current.key_topics)
+            if len(next_seg.summary) + len(next_seg.key_topics) > summary_len + topic_count:
                 current = next_seg
+                current_topics = next_topics
+                end_time = current.end_time
+                summary_parts = None
+                summary_len = len(current.summary)
+                merged_topics = None
             # Skip adding the less detailed one
             continue
         
         # Case 2: Adjacent segments - likely a continuation of a long segment
         is_adjacent = time_gap <= similarity_threshold  # Within 5 minutes
-        is_similar = are_topics_similar(current, next_seg, threshold=0.5)
+        is_similar = topic_masks_similar(current_topics, next_topics, threshold=0.5)
         
         # Check for explicit continuation markers in title
-        has_continuation_marker = any(
-            marker in next_seg.title.lower() 
-            for marker in ['continued', 'continuation', 'part 2', 'part two', 'part 3', '(cont', '- cont']
-        )
+        has_continuation_marker = _CONTINUATION_RE.search(next_seg.title) is not None
         
         # Merge if adjacent + similar, OR has explicit continuation marker
         if (is_adjacent and is_similar) or has_continuation_marker:
             # Merge: This is likely a single long segment split across chunks
-            current = VideoSegment(
-                title=current.title,  # Keep original title
-                summary=f"{current.summary} {next_seg.summary}".strip(),
-                start_time=current.start_time,
-                end_time=next_seg.end_time,  # Extend to next segment's end
-                key_topics=list(set(current.key_topics + next_seg.key_topics)),  # Combine unique topics
-                difficulty_level=current.difficulty_level  # Keep original difficulty
-            )
+            if summary_parts is None:
+                summary = f"{current.summary} {next_seg.summary}".strip()
+                summary_parts = [summary]
+                summary_len = len(summary)
+                merged_topics = set(current.key_topics)
+            else:
+                summary_len = _extend_summary(summary_parts, summary_len, next_seg.summary)
+            merged_topics.update(next_seg.key_topics)  # Combine unique topics
+            end_time = next_seg.end_time  # Extend to next segment's end
+            current_topics = current_topics | next_topics
             continue
         
         # Case 3: Distinct segments - keep both
-        merged.append(current)
+        merged.append(_finish_segment(current, end_time, summary_parts, merged_topics))
         current = next_seg
+        current_topics = next_topics
+        end_time = current.end_time
+        summary_parts = None
+        summary_len = len(current.summary)
+        merged_topics = None
     
     # Add the last segment
-    merged.append(current)
+    merged.append(_finish_segment(current, end_time, summary_parts, merged_topics))
     
     return merged
+
+
+def _extend_summary(summary_parts: list, summary_len: int, text: str) -> int:
+    """
+    Append text to a merged summary kept as fragments.
+    
+    Same result as summary = f"{summary} {text}".strip() on the joined
+    fragments, without copying the growing summary on every merge.
+    
+    Returns:
+        Length of the extended summary
+    """
+    text = text.rstrip()
+    if not text:
+        return summary_len
+    if not summary_len:
+        summary_parts[:] = [text.lstrip()]
+        return len(summary_parts[0])
+    summary_parts += (" ", text)
+    return summary_len + 1 + len(text)
+
+
+def _finish_segment(segment: VideoSegment, end_time: float, summary_parts, merged_topics) -> VideoSegment:
+    """Build the merged VideoSegment for a run starting at segment (or segment itself if nothing merged)."""
+    if summary_parts is None:
+        return segment
+    return VideoSegment(
+        title=segment.title,  # Keep original title
+        summary="".join(summary_parts),
+        start_time=segment.start_time,
+        end_time=end_time,
+        key_topics=list(merged_topics),
+        difficulty_level=segment.difficulty_level  # Keep original difficulty
+    )
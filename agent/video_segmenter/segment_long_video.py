@@ -2,50 +2,182 @@
 Segment long videos by processing them in chunks with overlap.
 """
 
-from typing import Optional
-from models import VideoSegmentation
+import asyncio
+import logging
+import math
+import random
+from typing import AsyncIterator, Optional, Tuple
+from groq import RateLimitError
+from models import ProcessingStats, VideoSegment, VideoSegmentation
 from .segment_video import segment_video
-from .format_transcript_snippets import format_transcript_snippets
+from .format_transcript_snippets import index_transcript_snippets, format_transcript_window
 from .format_timestamp import format_timestamp
 from .create_segmentation_chain import create_segmentation_chain
 from .merge_similar_segments import merge_similar_segments
+from .create_batched_segmentation_chain import create_batched_segmentation_chain, format_chunk_batch
+from .cache import cached_ainvoke, lookup, segmentation_cache_key, store
 
+logger = logging.getLogger(__name__)
 
-def segment_long_video(
+
+# Extra cache key field for results of the batched prompt, so runs that send
+# chunks one by one never reuse them (and vice versa)
+BATCHED_KEY_FIELDS = ("batched",)
+
+# Attempts per LLM request when rate limited, and the backoff between them (seconds)
+RATE_LIMIT_RETRIES = 6
+RATE_LIMIT_INITIAL_DELAY = 1.0
+RATE_LIMIT_MAX_DELAY = 30.0
+
+
+def _prepare_chunks(video_id: str, transcript_snippets: list, total_duration: float,
+                    chunk_duration: int, overlap_duration: int) -> tuple:
+    """
+    Split a transcript into overlapping chunks and build each chunk's chain input.
+    
+    Returns:
+        (chunk_windows, chunk_inputs, total_chunks) where chunk_windows holds
+        (chunk_start, chunk_end) pairs and chunk_inputs the {video_id, transcript} dicts
+    """
+    # Compute chunk boundaries (each chunk starts overlap_duration before the previous one ends)
+    step = chunk_duration - overlap_duration
+    total_chunks = max(math.ceil((total_duration - overlap_duration) / step), 1)
+    chunk_windows = [
+        (i * step, min(i * step + chunk_duration, total_duration))
+        for i in range(total_chunks)
+    ]
+    
+    # Format every line once, then cut each chunk's window from the index
+    transcript_index = index_transcript_snippets(transcript_snippets)
+    chunk_inputs = []
+    for chunk_number, (chunk_start, chunk_end) in enumerate(chunk_windows, start=1):
+        logger.info("Processing chunk %d/%d: %s - %s", chunk_number, total_chunks, format_timestamp(chunk_start), format_timestamp(chunk_end))
+        chunk_inputs.append({
+            "video_id": f"{video_id} (part {chunk_number})",
+            "transcript": format_transcript_window(
+                transcript_index,
+                max_chars=15000,
+                start_time=chunk_start,
+                end_time=chunk_end
+            )
+        })
+    
+    return chunk_windows, chunk_inputs, total_chunks
+
+
+def _new_segments(chunk_number: int, chunk_start: float, chunk_result: VideoSegmentation, overlap_duration: int) -> list:
+    """
+    Segments of a chunk result that don't duplicate the previous chunk.
+    
+    Only segments starting within the non-overlap portion are kept (all of
+    them for the first chunk), which prevents duplicates from overlapping regions.
+    """
+    if chunk_number == 1:
+        return list(chunk_result.segments)
+    
+    overlap_boundary = chunk_start + overlap_duration
+    return [segment for segment in chunk_result.segments if segment.start_time >= overlap_boundary]
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an LLM error is a rate limit (groq.RateLimitError or HTTP 429)."""
+    if isinstance(error, RateLimitError):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code == 429
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds to wait from the error's Retry-After header, if the API sent one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def _retry_rate_limited(call):
+    """
+    Await call(), retrying rate-limited attempts with exponential backoff and jitter.
+    
+    The wait honours the Retry-After header when present. Other errors, and
+    the last rate-limited attempt, are raised.
+    
+    Args:
+        call: Zero-argument coroutine function making one LLM request
+    
+    Returns:
+        Result of the first successful attempt
+    """
+    for attempt in range(1, RATE_LIMIT_RETRIES + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == RATE_LIMIT_RETRIES or not _is_rate_limit_error(e):
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = min(RATE_LIMIT_INITIAL_DELAY * 2 ** (attempt - 1), RATE_LIMIT_MAX_DELAY) + random.uniform(0, 1)
+            logger.warning("⏳ Rate limited, retrying in %.1fs (attempt %d/%d)", delay, attempt, RATE_LIMIT_RETRIES)
+            await asyncio.sleep(delay)
+
+
+async def segment_long_video_async(
     video_id: str, 
     transcript_snippets: list, 
     api_key: Optional[str] = None,
     chunk_duration: int = 3600,
-    overlap_duration: int = 300
+    overlap_duration: int = 300,
+    max_concurrency: int = 8,
+    chunks_per_call: int = 2,
+    chunk_store=None,
+    refresh: bool = False
 ) -> VideoSegmentation:
     """
-    Segment a long video by processing it in chunks with overlap.
+    Async version of segment_long_video() (same arguments and result).
     
-    For videos longer than chunk_duration, this splits the video into overlapping chunks,
-    processes each chunk separately, then merges the results while handling duplicates.
-    
-    KEY SEGMENT HANDLING:
-    - If a single topic segment exceeds 1 hour, it will be split across chunks
-    - The merge function detects continuations via:
-      1. Time adjacency (<5 min gap)
-      2. Topic similarity (>50% overlap)
-      3. Explicit continuation markers in titles
-    - Example: "Transformers Deep Dive" (0:30 - 2:15) split into 3 chunks
-      will be merged back into one continuous segment
+    Chunks are sent with chain.ainvoke and awaited together, with an
+    asyncio.Semaphore keeping at most max_concurrency requests in flight.
+    Consecutive chunks are packed chunks_per_call at a time into one request.
+    """
+    segmentation, _ = await segment_long_video_with_stats(
+        video_id,
+        transcript_snippets,
+        api_key=api_key,
+        chunk_duration=chunk_duration,
+        overlap_duration=overlap_duration,
+        max_concurrency=max_concurrency,
+        chunks_per_call=chunks_per_call,
+        chunk_store=chunk_store,
+        refresh=refresh
+    )
+    return segmentation
+
+
+async def segment_long_video_with_stats(
+    video_id: str, 
+    transcript_snippets: list, 
+    api_key: Optional[str] = None,
+    chunk_duration: int = 3600,
+    overlap_duration: int = 300,
+    max_concurrency: int = 8,
+    chunks_per_call: int = 2,
+    chunk_store=None,
+    refresh: bool = False
+) -> Tuple[VideoSegmentation, ProcessingStats]:
+    """
+    segment_long_video_async(), also returning how many chunks were processed.
     
-    RATE LIMIT HANDLING:
-    - If rate limit is hit mid-processing, returns partial results
-    - Includes metadata about which chunks were processed
-    
-    Args:
-        video_id: YouTube video ID
-        transcript_snippets: List of transcript snippets with .text, .start, .duration
-        api_key: Optional Groq API key
-        chunk_duration: Duration of each chunk in seconds (default: 3600 = 1 hour)
-        overlap_duration: Overlap between chunks in seconds (default: 300 = 5 minutes)
+    Callers that need the partial-result counts (e.g. to store them) should use
+    this instead of parsing the "[Partial: ...]" note in overall_topic.
     
     Returns:
-        VideoSegmentation object with all segments merged
+        (VideoSegmentation, ProcessingStats) tuple
     """
     # Calculate total duration
     if not transcript_snippets:
@@ -55,74 +187,118 @@ def segment_long_video(
     
     # If video is short enough, use regular segmentation
     if total_duration <= chunk_duration:
-        return segment_video(video_id, transcript_snippets, api_key)
+        segmentation = await asyncio.to_thread(segment_video, video_id, transcript_snippets, api_key, refresh)
+        return segmentation, ProcessingStats(chunks_processed=1, total_chunks=1)
     
-    # Process in chunks with overlap
+    chunk_windows, chunk_inputs, total_chunks = _prepare_chunks(
+        video_id, transcript_snippets, total_duration, chunk_duration, overlap_duration
+    )
     all_segments = []
-    chunk_start = 0
-    chunk_number = 1
-    total_chunks = int((total_duration - overlap_duration) / (chunk_duration - overlap_duration)) + 1
     last_processed_chunk = 0
+    rate_limited = False
     overall_topic = "Long video content"
     
-    while chunk_start < total_duration:
-        # Define chunk boundaries
-        chunk_end = min(chunk_start + chunk_duration, total_duration)
-        
-        print(f"Processing chunk {chunk_number}/{total_chunks}: {format_timestamp(chunk_start)} - {format_timestamp(chunk_end)}")
+    # Create chains once and process all chunks concurrently
+    chain = create_segmentation_chain(api_key)
+    batched_chain = create_batched_segmentation_chain(api_key) if chunks_per_call > 1 else None
+    semaphore = asyncio.Semaphore(max_concurrency)
+    key_fields = BATCHED_KEY_FIELDS if batched_chain is not None else ()
+    
+    async def run_chunk(chunk_input: dict):
+        async def attempt():
+            async with semaphore:
+                return await cached_ainvoke(chain, chunk_input, refresh=refresh)
+        return await _retry_rate_limited(attempt)
+    
+    async def run_batch(batch_inputs: list) -> list:
+        # Only send chunks that aren't cached yet
+        results = [None if refresh else lookup(chunk_input, key_fields) for chunk_input in batch_inputs]
+        pending = [i for i, result in enumerate(results) if result is None]
         
-        try:
-            # Format transcript for this chunk
-            chunk_transcript = format_transcript_snippets(
-                transcript_snippets,
-                max_chars=15000,
-                start_time=chunk_start,
-                end_time=chunk_end
-            )
-            
-            # Create chain and process chunk
-            chain = create_segmentation_chain(api_key)
-            chunk_result = chain.invoke({
-                "video_id": f"{video_id} (part {chunk_number})",
-                "transcript": chunk_transcript
-            })
-            
-            # Store overall topic from first successful chunk
-            if chunk_number == 1:
-                overall_topic = chunk_result.overall_topic
+        if len(pending) > 1:
+            batch_input = format_chunk_batch([batch_inputs[i] for i in pending])
             
-            # Add segments from this chunk
-            for segment in chunk_result.segments:
-                # Only include segments that start within the non-overlap portion
-                # This prevents duplicates from overlapping regions
-                if chunk_number == 1:
-                    # First chunk: include all segments
-                    all_segments.append(segment)
-                else:
-                    # Subsequent chunks: only include segments starting after overlap
-                    overlap_boundary = chunk_start + overlap_duration
-                    if segment.start_time >= overlap_boundary:
-                        all_segments.append(segment)
+            async def attempt():
+                async with semaphore:
+                    return await batched_chain.ainvoke(batch_input)
             
-            last_processed_chunk = chunk_number
-            
-        except Exception as e:
-            error_msg = str(e).lower()
+            try:
+                batch = await _retry_rate_limited(attempt)
+                if len(batch.segmentations) == len(pending):
+                    for i, result in zip(pending, batch.segmentations):
+                        store(batch_inputs[i], result, key_fields)
+                        results[i] = result
+                    return results
+                logger.warning("⚠️  Batched call returned %d segmentations for %d chunks, retrying one by one", len(batch.segmentations), len(pending))
+            except Exception as e:
+                # Still rate limited after the retries: single calls would be too
+                if _is_rate_limit_error(e):
+                    raise
+                # Otherwise one bad chunk mustn't fail its neighbours
+                logger.warning("⚠️  Batched call failed, retrying one by one: %s", e)
+        
+        # Fall back to one call per chunk
+        retried = await asyncio.gather(
+            *[run_chunk(batch_inputs[i]) for i in pending],
+            return_exceptions=True
+        )
+        for i, result in zip(pending, retried):
+            results[i] = result
+        return results
+    
+    # Reuse chunk results persisted by an earlier (e.g. rate-limited) run by
+    # seeding the cache with them
+    chunk_keys = [segmentation_cache_key(chunk_input, key_fields) for chunk_input in chunk_inputs]
+    persisted = set()
+    if chunk_store is not None and refresh:
+        chunk_store.delete_chunk_results(video_id)
+    elif chunk_store is not None:
+        for chunk_number, (chunk_key, chunk_input) in enumerate(zip(chunk_keys, chunk_inputs), start=1):
+            saved = chunk_store.get_chunk_result(chunk_key)
+            if saved is not None:
+                store(chunk_input, VideoSegmentation.model_validate(saved), key_fields)
+                persisted.add(chunk_number)
+        if persisted:
+            logger.info("♻️  Reusing %d/%d chunk results saved by an earlier run", len(persisted), total_chunks)
+    
+    # Pack consecutive chunks chunks_per_call at a time into one request
+    batches = [chunk_inputs[i:i + chunks_per_call] for i in range(0, len(chunk_inputs), max(chunks_per_call, 1))]
+    batch_results = await asyncio.gather(
+        *[run_batch(batch) for batch in batches],
+        return_exceptions=True
+    )
+    
+    # Flatten back to one result (or exception) per chunk
+    chunk_results = []
+    for batch, batch_result in zip(batches, batch_results):
+        chunk_results.extend([batch_result] * len(batch) if isinstance(batch_result, Exception) else batch_result)
+    
+    # Persist finished chunks so a retry after a rate limit doesn't redo them
+    if chunk_store is not None:
+        for chunk_number, (chunk_key, chunk_result) in enumerate(zip(chunk_keys, chunk_results), start=1):
+            if chunk_number not in persisted and not isinstance(chunk_result, Exception):
+                chunk_store.save_chunk_result(video_id, chunk_number, chunk_key, chunk_result)
+    
+    # Collect results in chunk order, stopping at the first rate-limited chunk
+    for chunk_number, ((chunk_start, _), chunk_result) in enumerate(zip(chunk_windows, chunk_results), start=1):
+        if isinstance(chunk_result, Exception):
             # Check if it's a rate limit error
-            if 'rate' in error_msg or 'limit' in error_msg or '429' in error_msg:
-                print(f"⚠️  Rate limit hit at chunk {chunk_number}. Returning partial results for {last_processed_chunk} chunks.")
+            if _is_rate_limit_error(chunk_result):
+                logger.warning("⚠️  Rate limit hit at chunk %d. Returning partial results for %d chunks.", chunk_number, last_processed_chunk)
+                rate_limited = True
                 break
             else:
                 # For other errors, re-raise
-                raise
+                raise chunk_result
+        
+        # Store overall topic from first successful chunk
+        if chunk_number == 1:
+            overall_topic = chunk_result.overall_topic
         
-        # Move to next chunk (subtract overlap to create continuity)
-        chunk_start = chunk_end - overlap_duration
-        chunk_number += 1
+        # Add segments from this chunk
+        all_segments.extend(_new_segments(chunk_number, chunk_start, chunk_result, overlap_duration))
         
-        # Break if we've reached the end
-        if chunk_end >= total_duration:
-            break
+        last_processed_chunk = chunk_number
     
     # Merge adjacent segments with similar topics
     # This handles segments that span multiple chunks (>1 hour segments)
@@ -133,9 +309,165 @@ def segment_long_video(
         processed_duration = format_timestamp(all_segments[-1].end_time if all_segments else 0)
         overall_topic = f"{overall_topic} [Partial: {last_processed_chunk}/{total_chunks} chunks processed up to {processed_duration}]"
     
-    return VideoSegmentation(
+    segmentation = VideoSegmentation(
         video_id=video_id,
         segments=merged_segments,
         total_segments=len(merged_segments),
         overall_topic=overall_topic
     )
+    stats = ProcessingStats(
+        chunks_processed=last_processed_chunk,
+        total_chunks=total_chunks,
+        rate_limited=rate_limited
+    )
+    return segmentation, stats
+
+
+def segment_long_video(
+    video_id: str, 
+    transcript_snippets: list, 
+    api_key: Optional[str] = None,
+    chunk_duration: int = 3600,
+    overlap_duration: int = 300,
+    max_concurrency: int = 8,
+    chunks_per_call: int = 2,
+    chunk_store=None,
+    refresh: bool = False
+) -> VideoSegmentation:
+    """
+    Segment a long video by processing it in chunks with overlap.
+    
+    For videos longer than chunk_duration, this splits the video into overlapping chunks,
+    processes each chunk separately, then merges the results while handling duplicates.
+    
+    KEY SEGMENT HANDLING:
+    - If a single topic segment exceeds 1 hour, it will be split across chunks
+    - The merge function detects continuations via:
+      1. Time adjacency (<5 min gap)
+      2. Topic similarity (>50% overlap)
+      3. Explicit continuation markers in titles
+    - Example: "Transformers Deep Dive" (0:30 - 2:15) split into 3 chunks
+      will be merged back into one continuous segment
+    
+    CONCURRENCY:
+    - Chunks are sent to the LLM concurrently (up to max_concurrency at a time)
+    - Consecutive chunks are packed into one request (chunks_per_call per request),
+      falling back to one request per chunk if the batched answer can't be used
+    - Results are still merged in chunk order
+    
+    RATE LIMIT HANDLING:
+    - Rate-limited requests are retried with exponential backoff and jitter
+      (honouring Retry-After), up to RATE_LIMIT_RETRIES attempts
+    - If a chunk is still rate limited after that, returns partial results
+    - Includes metadata about which chunks were processed
+    - With a chunk_store, finished chunks are saved and reused on the next run
+      (unless refresh is set)
+    
+    Args:
+        video_id: YouTube video ID
+        transcript_snippets: List of transcript snippets with .text, .start, .duration
+        api_key: Optional Groq API key
+        chunk_duration: Duration of each chunk in seconds (default: 3600 = 1 hour)
+        overlap_duration: Overlap between chunks in seconds (default: 300 = 5 minutes)
+        max_concurrency: Maximum number of LLM requests in flight at the same time
+        chunks_per_call: Number of chunks packed into one LLM request (1 disables packing)
+        chunk_store: Optional database (see VideoDatabase.save_chunk_result) used to
+            persist per-chunk results across runs
+        refresh: Re-send every chunk to the LLM, ignoring (and replacing) cached
+            and persisted chunk results, e.g. when reprocessing a video
+    
+    Returns:
+        VideoSegmentation object with all segments merged
+    """
+    return asyncio.run(segment_long_video_async(
+        video_id,
+        transcript_snippets,
+        api_key=api_key,
+        chunk_duration=chunk_duration,
+        overlap_duration=overlap_duration,
+        max_concurrency=max_concurrency,
+        chunks_per_call=chunks_per_call,
+        chunk_store=chunk_store,
+        refresh=refresh
+    ))
+
+
+async def segment_long_video_stream(
+    video_id: str, 
+    transcript_snippets: list, 
+    api_key: Optional[str] = None,
+    chunk_duration: int = 3600,
+    overlap_duration: int = 300,
+    max_concurrency: int = 8
+) -> AsyncIterator[VideoSegment]:
+    """
+    Yield segments of a long video as soon as each chunk is segmented.
+    
+    Chunks are processed concurrently like segment_long_video(), but each
+    chunk's segments are yielded as soon as its LLM call returns, so callers
+    can show the first segments without waiting for the whole video. Chunks
+    finish in any order and continuations across chunks are not merged; use
+    segment_long_video() for the final merged result. Rate-limited chunks
+    are retried with backoff, then skipped; other errors are raised.
+    
+    Args:
+        video_id: YouTube video ID
+        transcript_snippets: List of transcript snippets with .text, .start, .duration
+        api_key: Optional Groq API key
+        chunk_duration: Duration of each chunk in seconds (default: 3600 = 1 hour)
+        overlap_duration: Overlap between chunks in seconds (default: 300 = 5 minutes)
+        max_concurrency: Maximum number of LLM requests in flight at the same time
+    
+    Yields:
+        VideoSegment objects, grouped by chunk in completion order
+    """
+    if not transcript_snippets:
+        raise ValueError("No transcript snippets provided")
+    
+    total_duration = transcript_snippets[-1].start + transcript_snippets[-1].duration
+    
+    # If video is short enough, use regular segmentation
+    if total_duration <= chunk_duration:
+        result = await asyncio.to_thread(segment_video, video_id, transcript_snippets, api_key)
+        for segment in result.segments:
+            yield segment
+        return
+    
+    chunk_windows, chunk_inputs, total_chunks = _prepare_chunks(
+        video_id, transcript_snippets, total_duration, chunk_duration, overlap_duration
+    )
+    
+    chain = create_segmentation_chain(api_key)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_chunk(chunk_number: int, chunk_start: float, chunk_input: dict):
+        async def attempt():
+            async with semaphore:
+                return await cached_ainvoke(chain, chunk_input)
+        
+        try:
+            return chunk_number, chunk_start, await _retry_rate_limited(attempt)
+        except Exception as e:
+            return chunk_number, chunk_start, e
+    
+    tasks = [
+        asyncio.ensure_future(run_chunk(chunk_number, chunk_start, chunk_input))
+        for chunk_number, ((chunk_start, _), chunk_input) in enumerate(zip(chunk_windows, chunk_inputs), start=1)
+    ]
+    
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            chunk_number, chunk_start, chunk_result = await next_done
+            
+            if isinstance(chunk_result, Exception):
+                if _is_rate_limit_error(chunk_result):
+                    logger.warning("⚠️  Rate limit hit at chunk %d/%d, skipping it.", chunk_number, total_chunks)
+                    continue
+                raise chunk_result
+            
+            for segment in _new_segments(chunk_number, chunk_start, chunk_result, overlap_duration):
+                yield segment
+    finally:
+        # Stop outstanding chunks if the caller stops early
+        for task in tasks:
+            task.cancel()
@@ -6,9 +6,11 @@ from typing import Optional
 from models import VideoSegmentation
 from .create_segmentation_chain import create_segmentation_chain
 from .format_transcript_snippets import format_transcript_snippets
+from .cache import cached_invoke
 
 
-def segment_video(video_id: str, transcript_snippets: list, api_key: Optional[str] = None) -> VideoSegmentation:
+def segment_video(video_id: str, transcript_snippets: list, api_key: Optional[str] = None,
+                  refresh: bool = False) -> VideoSegmentation:
     """
     Segment a video transcript into logical parts.
     
@@ -16,6 +18,7 @@ def segment_video(video_id: str, transcript_snippets: list, api_key: Optional[st
         video_id: YouTube video ID
         transcript_snippets: List of transcript snippets with .text, .start, .duration
         api_key: Optional Groq API key
+        refresh: Call the LLM even if this transcript was segmented before
     
     Returns:
         VideoSegmentation object with structured segments
@@ -26,10 +29,10 @@ def segment_video(video_id: str, transcript_snippets: list, api_key: Optional[st
     # Format transcript
     formatted_transcript = format_transcript_snippets(transcript_snippets)
     
-    # Run chain
-    result = chain.invoke({
+    # Run chain (reusing the result if this transcript was segmented before)
+    result = cached_invoke(chain, {
         "video_id": video_id,
         "transcript": formatted_transcript
-    })
+    }, refresh=refresh)
     
     return result
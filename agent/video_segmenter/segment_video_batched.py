@@ -0,0 +1,133 @@
+"""
+Segment short videos, packing concurrent requests into shared LLM calls.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+from langchain_core.exceptions import OutputParserException
+from models import VideoSegmentation
+from .create_segmentation_chain import create_segmentation_chain
+from .create_batched_segmentation_chain import create_batched_segmentation_chain, format_chunk_batch
+from .format_transcript_snippets import format_transcript_snippets
+from .cache import cached_ainvoke, lookup, store
+
+logger = logging.getLogger(__name__)
+
+
+# How long a request waits for others to share its LLM call, and how many videos one call holds
+BATCH_WINDOW_SECONDS = 0.05
+MAX_VIDEOS_PER_CALL = 4
+
+# (event loop, api_key) -> [(chain input, future)] waiting for the next flush, and its flush timer
+_pending = {}
+_timers = {}
+
+# Running batch tasks; the event loop only keeps weak references to tasks
+_batch_tasks = set()
+
+
+async def segment_video_batched(video_id: str, transcript_snippets: list, api_key: Optional[str] = None,
+                                refresh: bool = False) -> VideoSegmentation:
+    """
+    Async segment_video() that shares LLM calls between concurrent requests.
+
+    Requests arriving within BATCH_WINDOW_SECONDS of each other are sent
+    together (up to MAX_VIDEOS_PER_CALL per call) through the batched
+    segmentation chain. A lone request, or a batch whose answer can't be
+    used, goes through the regular single-video chain.
+
+    Args:
+        video_id: YouTube video ID
+        transcript_snippets: List of transcript snippets with .text, .start, .duration
+        api_key: Optional Groq API key
+        refresh: Call the LLM even if this transcript was segmented before
+            (sent on its own, replacing the cached result)
+
+    Returns:
+        VideoSegmentation object with structured segments
+    """
+    payload = {
+        "video_id": video_id,
+        "transcript": format_transcript_snippets(transcript_snippets)
+    }
+
+    if refresh:
+        return await cached_ainvoke(create_segmentation_chain(api_key), payload, refresh=True)
+
+    # Reuse the result if this transcript was segmented before
+    result = lookup(payload)
+    if result is not None:
+        return result
+
+    loop = asyncio.get_running_loop()
+    key = (loop, api_key)
+    future = loop.create_future()
+    batch = _pending.setdefault(key, [])
+    batch.append((payload, future))
+
+    if len(batch) >= MAX_VIDEOS_PER_CALL:
+        _flush(key)
+    elif len(batch) == 1:
+        _timers[key] = loop.call_later(BATCH_WINDOW_SECONDS, _flush, key)
+
+    return await future
+
+
+def _flush(key: tuple):
+    """Send the requests waiting under key as one batch."""
+    timer = _timers.pop(key, None)
+    if timer is not None:
+        timer.cancel()
+    batch = _pending.pop(key, None)
+    if batch:
+        task = asyncio.ensure_future(_run_batch(key[1], batch))
+        _batch_tasks.add(task)
+        task.add_done_callback(_batch_tasks.discard)
+
+
+async def _run_batch(api_key: Optional[str], batch: list):
+    """Segment a batch of waiting requests and resolve their futures."""
+    payloads = [payload for payload, _ in batch]
+    try:
+        results = await _segment_payloads(api_key, payloads)
+    except Exception as e:
+        results = [e] * len(batch)
+
+    for (_, future), result in zip(batch, results):
+        if future.done():
+            continue
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+async def _segment_payloads(api_key: Optional[str], payloads: list) -> list:
+    """Segment several chain inputs, one call if possible; returns results or exceptions in order."""
+    results = [None] * len(payloads)
+    if len(payloads) > 1:
+        try:
+            batch = await create_batched_segmentation_chain(api_key).ainvoke(format_chunk_batch(payloads))
+            # Match results to requests by video ID, whatever order they came back in
+            by_video_id = {result.video_id: result for result in batch.segmentations}
+            for i, payload in enumerate(payloads):
+                result = by_video_id.get(payload["video_id"])
+                if result is not None:
+                    store(payload, result)
+                    results[i] = result
+            if None in results:
+                logger.warning("⚠️  Batched call returned segmentations for %s, expected %s; retrying the missing ones one by one", list(by_video_id), [payload["video_id"] for payload in payloads])
+        except OutputParserException as e:
+            logger.warning("⚠️  Batched call could not be parsed, retrying one by one: %s", e)
+
+    # Fall back to one call per video still missing
+    missing = [i for i, result in enumerate(results) if result is None]
+    chain = create_segmentation_chain(api_key)
+    retried = await asyncio.gather(
+        *[cached_ainvoke(chain, payloads[i]) for i in missing],
+        return_exceptions=True
+    )
+    for i, result in zip(missing, retried):
+        results[i] = result
+    return results
@@ -1,7 +1,10 @@
+import asyncio
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from agent.chatbot.conversational import run_chatbot
+from agent.chatbot.conversational import arun_chatbot, stream_chatbot
 from models import get_db
 
 router = APIRouter()
@@ -25,21 +28,21 @@ class ChatResponse(BaseModel):
     video_title: str
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat_with_video(request: ChatRequest):
+async def _prepare_chat(request: ChatRequest):
     """
-    Chat with a YouTube video using the conversational agent.
+    Validate the chat request against the database.
     
     Args:
         request: ChatRequest with video_id, message, and optional conversation_history
     
     Returns:
-        ChatResponse with the agent's response
+        Tuple of (video_title, conversation_history as list of dicts)
     """
     db = get_db()
     
-    # Get video from database to verify it exists and get title
-    video = db.get_video(request.video_id)
+    # Get video from database to verify it exists and get title (in a worker
+    # thread, as it loads the whole transcript)
+    video = await asyncio.to_thread(db.get_video, request.video_id)
     if not video:
         raise HTTPException(
             status_code=404,
@@ -62,9 +65,25 @@ async def chat_with_video(request: ChatRequest):
             for msg in request.conversation_history
         ]
     
+    return video_title, conversation_history
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat_with_video(request: ChatRequest):
+    """
+    Chat with a YouTube video using the conversational agent.
+    
+    Args:
+        request: ChatRequest with video_id, message, and optional conversation_history
+    
+    Returns:
+        ChatResponse with the agent's response
+    """
+    video_title, conversation_history = await _prepare_chat(request)
+    
     try:
         # Run the chatbot agent
-        response = run_chatbot(
+        response = await arun_chatbot(
             video_id=request.video_id,
             video_title=video_title,
             user_message=request.message,
@@ -85,6 +104,38 @@ async def chat_with_video(request: ChatRequest):
         )
 
 
+@router.post("/chat/stream")
+async def stream_chat_with_video(request: ChatRequest):
+    """
+    Chat with a YouTube video, streaming the response as Server-Sent Events.
+    
+    Each event is a `data:` frame holding a JSON-encoded text chunk. The stream
+    ends with a `data: [DONE]` frame, or an `event: error` frame on failure.
+    
+    Args:
+        request: ChatRequest with video_id, message, and optional conversation_history
+    
+    Returns:
+        StreamingResponse with media type text/event-stream
+    """
+    video_title, conversation_history = await _prepare_chat(request)
+    
+    async def event_stream():
+        try:
+            async for chunk in stream_chatbot(
+                video_id=request.video_id,
+                video_title=video_title,
+                user_message=request.message,
+                conversation_history=conversation_history
+            ):
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps(f'Error running chatbot: {str(e)}')}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/chat/segments/{video_id}")
 async def get_video_segments(video_id: str):
     """
@@ -98,16 +149,16 @@ async def get_video_segments(video_id: str):
     """
     db = get_db()
     
-    # Get video
-    video = db.get_video(video_id)
-    if not video:
+    # Get video and segmentation in one round-trip
+    bundle = await asyncio.to_thread(db.prefetch_video_bundle, video_id)
+    if not bundle:
         raise HTTPException(
             status_code=404,
             detail=f"Video {video_id} not found in database"
         )
     
-    # Get segmentation
-    segmentation = db.get_segmentation(video_id)
+    video = bundle["video"]
+    segmentation = bundle["segmentation"]
     if not segmentation:
         return {
             "video_id": video_id,
@@ -0,0 +1,26 @@
+"""
+JSON response class shared by the app and the endpoints.
+"""
+
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson when it is installed.
+    
+    orjson encodes in C and returns bytes directly, which matters for long
+    transcripts and segmentations. Without orjson this is a plain JSONResponse.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        """Encode content as JSON bytes."""
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
@@ -2,39 +2,39 @@
 Video segmentation API endpoints.
 """
 
+import asyncio
+import logging
+import uuid
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 from helpers.getTranscript import getTranscript
-from helpers import extract_video_id
-from agent import segment_video, segment_long_video
+from helpers.get_video_title import get_video_title
+from helpers import extract_video_id, run_coalesced
+from agent import segment_video_batched, segment_long_video_with_stats
+from agent.chatbot.conversational import clear_segments_cache
 from models import get_db
-import requests
+from .responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/segment", tags=["Segmentation"])
 
+# Videos longer than this are segmented in chunks by a background job
+LONG_VIDEO_SECONDS = 3600
 
-def get_video_title(video_id: str) -> str:
-    """
-    Fetch video title from YouTube using oembed API.
-    
-    Args:
-        video_id: YouTube video ID
-    
-    Returns:
-        Video title or None if unable to fetch
-    """
-    try:
-        url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("title")
-    except Exception as e:
-        print(f"⚠️  Could not fetch title for {video_id}: {e}")
-    return None
+# How many long-video jobs may run at once; the rest wait as "queued"
+LONG_VIDEO_WORKERS = 2
+
+# video_id -> long-video job that is queued, running or failed (finished jobs are dropped)
+_jobs = {}
+
+# Event loop -> semaphore bounding running jobs, and references keeping job tasks alive
+_job_slots = {}
+_job_tasks = set()
 
 
 @router.get("")
-def segment_video_endpoint(video_url: str, force: bool = False):
+async def segment_video_endpoint(video_url: str, force: bool = False):
     """
     Segment a YouTube video into logical parts using AI analysis.
     
@@ -46,6 +46,10 @@ def segment_video_endpoint(video_url: str, force: bool = False):
     Query parameters:
     - force: Set to true to force reprocessing even if cached (default: false)
     
+    Videos longer than an hour are segmented by a background job: the request
+    returns 202 Accepted with a job_id and a status_url to poll at
+    /segment/status, and the segments are served here once the job is done.
+    
     Returns structured segments with:
     - video_id: YouTube video ID
     - total_segments: Number of segments identified
@@ -63,28 +67,62 @@ def segment_video_endpoint(video_url: str, force: bool = False):
     if not video_id:
         raise HTTPException(status_code=400, detail="Invalid YouTube URL or video ID")
     
+    # A long video already being segmented in the background isn't started twice
+    job = _jobs.get(video_id)
+    if job and job["status"] != "failed":
+        return _job_response(job)
+    
     # Get database instance
     db = get_db()
     
+    # Reprocessing must not replay cached LLM output
+    refresh = force
+    
     # Check if segmentation already exists in database (unless force=true)
     if not force:
         cached_segmentation = db.get_segmentation(video_id)
         if cached_segmentation:
-            # Verify segmentation actually covers the full video
-            is_complete = _verify_segmentation_coverage(cached_segmentation, video_id, db)
+            # Verify segmentation actually covers the full video (may read the
+            # video and record the result, so it runs in a worker thread)
+            is_complete = await asyncio.to_thread(_verify_segmentation_coverage, cached_segmentation, video_id, db)
             
             if is_complete:
-                print(f"✅ Using cached complete segmentation for {video_id}")
-                return cached_segmentation["segmentation"]
+                logger.info("✅ Using cached complete segmentation for %s", video_id)
+                # Already plain JSON data, so skip FastAPI's encoder walk
+                return FastJSONResponse(cached_segmentation["segmentation"])
             else:
-                # Incomplete coverage - reprocess
-                print(f"⚠️  Cached segmentation incomplete. Re-processing entire video...")
+                # Incomplete coverage - reprocess. A rate-limited (partial) run resumes
+                # from its saved chunks; otherwise the cached output was truncated
+                refresh = cached_segmentation["processing_status"] != "partial"
+                logger.warning("⚠️  Cached segmentation incomplete. Re-processing entire video...")
     else:
-        print(f"🔄 Force reprocessing {video_id}")
-        print(f"🔄 Force reprocessing {video_id}")
+        logger.info("🔄 Force reprocessing %s", video_id)
+    
+    # Concurrent requests for the same video share one fetch and segmentation
+    result = await run_coalesced(("segment", video_id, refresh), lambda: _fetch_and_segment(video_id, db, refresh))
+    
+    if isinstance(result, dict):
+        return _job_response(result)
     
-    # Get transcript
-    res = getTranscript(video_id)
+    # Serialize straight to JSON with pydantic-core
+    return Response(content=result.model_dump_json(), media_type="application/json")
+
+
+async def _fetch_and_segment(video_id: str, db, refresh: bool = False):
+    """
+    Fetch and save a video's transcript, then segment it.
+    
+    Args:
+        video_id: YouTube video ID
+        db: Database instance
+        refresh: Bypass cached LLM results (and saved chunk results)
+    
+    Returns:
+        The saved VideoSegmentation, or the job info of a long video queued
+        for background segmentation
+    """
+    # Get transcript (blocking network calls run in a worker thread)
+    res = await asyncio.to_thread(getTranscript, video_id)
     
     if not res:
         raise HTTPException(status_code=404, detail="No transcript available for this video")
@@ -94,13 +132,13 @@ def segment_video_endpoint(video_url: str, force: bool = False):
         snippets = res.snippets if hasattr(res, 'snippets') else res
         
         # Fetch video title
-        video_title = get_video_title(video_id)
+        video_title = await asyncio.to_thread(get_video_title, video_id)
         if video_title:
-            print(f"📺 Fetched title: {video_title}")
+            logger.info("📺 Fetched title: %s", video_title)
         
         # Save video data to database with title
-        db.save_video(video_id, snippets, title=video_title)
-        print(f"💾 Saved video transcript for {video_id}")
+        await asyncio.to_thread(db.save_video, video_id, snippets, title=video_title)
+        logger.info("💾 Saved video transcript for %s", video_id)
         
         # Calculate video duration
         if snippets:
@@ -108,53 +146,124 @@ def segment_video_endpoint(video_url: str, force: bool = False):
         else:
             video_duration = 0
         
-        # Use chunked processing for videos longer than 1 hour
-        chunks_processed = None
-        total_chunks = None
+        # Videos longer than 1 hour are segmented in chunks by a background job
+        if video_duration > LONG_VIDEO_SECONDS:
+            return _start_long_video_job(video_id, snippets, db, refresh)
         
-        if video_duration > 3600:
-            total_chunks = int((video_duration - 300) / (3600 - 300)) + 1
-            segmentation = segment_long_video(
-                video_id=video_id,
-                transcript_snippets=snippets,
-                chunk_duration=3600,  # 1 hour chunks
-                overlap_duration=300  # 5 minute overlap between chunks
-            )
-            # Check if partial result (rate limit hit)
-            if "[Partial:" in segmentation.overall_topic:
-                # Extract chunks_processed from overall_topic
-                import re
-                match = re.search(r'\[Partial: (\d+)/(\d+)', segmentation.overall_topic)
-                if match:
-                    chunks_processed = int(match.group(1))
-                    total_chunks = int(match.group(2))
-                print(f"⚠️  Partial result: {chunks_processed}/{total_chunks} chunks processed due to rate limit")
-        else:
-            # Use regular segmentation for shorter videos
-            segmentation = segment_video(video_id, snippets)
+        # Regular segmentation for shorter videos (sharing LLM calls with concurrent requests)
+        segmentation = await segment_video_batched(video_id, snippets, refresh=refresh)
         
         # Save segmentation to database
-        segmentation_id = db.save_segmentation(
+        segmentation_id = await asyncio.to_thread(
+            db.save_segmentation,
             video_id=video_id,
-            segmentation_result=segmentation,
-            chunks_processed=chunks_processed,
-            total_chunks=total_chunks
+            segmentation_result=segmentation
         )
+        if segmentation_id < 0:
+            raise RuntimeError("could not save segmentation")
         
-        status = "partial" if chunks_processed and chunks_processed < total_chunks else "complete"
-        print(f"💾 Saved {status} segmentation for {video_id} (ID: {segmentation_id})")
+        # Chatbot prompts must pick up the new segments
+        clear_segments_cache(video_id)
         
-        return segmentation.model_dump()
+        logger.info("💾 Saved complete segmentation for %s (ID: %s)", video_id, segmentation_id)
+        return segmentation
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Segmentation failed: {str(e)}")
 
 
+def _start_long_video_job(video_id: str, snippets: list, db, refresh: bool = False) -> dict:
+    """
+    Queue background segmentation of a long video.
+    
+    Args:
+        video_id: YouTube video ID
+        snippets: Transcript snippets of the video
+        db: Database instance the result is saved to
+        refresh: Bypass cached LLM results and saved chunk results
+    
+    Returns:
+        Job info (job_id, video_id, status, error), also kept in _jobs until the job finishes
+    """
+    job = {"job_id": uuid.uuid4().hex, "video_id": video_id, "status": "queued", "error": None}
+    _jobs[video_id] = job
+    
+    task = asyncio.create_task(_run_long_video_job(job, snippets, db, refresh))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    
+    logger.info("📥 Queued long-video segmentation for %s (job %s)", video_id, job['job_id'])
+    return job
+
+
+async def _run_long_video_job(job: dict, snippets: list, db, refresh: bool = False):
+    """
+    Segment a long video in chunks and save the result, updating the job status.
+    
+    Args:
+        job: Job info created by _start_long_video_job
+        snippets: Transcript snippets of the video
+        db: Database instance the result is saved to
+        refresh: Bypass cached LLM results and saved chunk results
+    """
+    video_id = job["video_id"]
+    slots = _job_slots.setdefault(asyncio.get_running_loop(), asyncio.Semaphore(LONG_VIDEO_WORKERS))
+    
+    async with slots:
+        job["status"] = "running"
+        try:
+            segmentation, stats = await segment_long_video_with_stats(
+                video_id=video_id,
+                transcript_snippets=snippets,
+                chunk_duration=3600,  # 1 hour chunks
+                overlap_duration=300,  # 5 minute overlap between chunks
+                chunk_store=db,  # Retries skip chunks finished by earlier runs
+                refresh=refresh
+            )
+            
+            # Check if partial result (rate limit hit, possibly on the first chunk)
+            partial = stats.chunks_processed < stats.total_chunks
+            if partial:
+                logger.warning("⚠️  Partial result: %d/%d chunks processed due to rate limit", stats.chunks_processed, stats.total_chunks)
+            
+            segmentation_id = await asyncio.to_thread(
+                db.save_segmentation,
+                video_id=video_id,
+                segmentation_result=segmentation,
+                chunks_processed=stats.chunks_processed,
+                total_chunks=stats.total_chunks
+            )
+            if segmentation_id < 0:
+                raise RuntimeError("could not save segmentation")
+            
+            # Chatbot prompts must pick up the new segments
+            clear_segments_cache(video_id)
+            
+            status = "partial" if partial else "complete"
+            logger.info("💾 Saved %s segmentation for %s (ID: %s)", status, video_id, segmentation_id)
+            _jobs.pop(video_id, None)
+        except Exception as e:
+            logger.error("❌ Long-video segmentation failed for %s: %s", video_id, e)
+            job["status"] = "failed"
+            job["error"] = f"Segmentation failed: {str(e)}"
+
+
+def _job_response(job: dict) -> FastJSONResponse:
+    """202 Accepted response pointing the client at the job's status."""
+    return FastJSONResponse(status_code=202, content={
+        "video_id": job["video_id"],
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/segment/status?video_url={job['video_id']}"
+    })
+
+
 def _verify_segmentation_coverage(cached_segmentation: dict, video_id: str, db) -> bool:
     """
     Verify that cached segmentation covers the full video duration.
     
-    Compares the last segment's end_time with actual video duration.
+    Compares the last segment's end_time with actual video duration. A complete
+    segmentation that passed once is marked verified and not checked again.
     
     Args:
         cached_segmentation: Cached segmentation data from database
@@ -164,45 +273,40 @@ def _verify_segmentation_coverage(cached_segmentation: dict, video_id: str, db)
     Returns:
         True if segments cover at least 95% of video, False otherwise
     """
-    # Get video data to determine actual duration
-    video_data = db.get_video(video_id)
-    if not video_data:
-        print(f"  ❌ No video data found in database")
+    # Already verified (reset when the transcript is saved again)
+    if cached_segmentation["verified_at"] and cached_segmentation["processing_status"] == "complete":
+        return True
+    
+    # Actual video duration (end of the last snippet, stored with the transcript)
+    actual_duration = db.get_video_duration(video_id)
+    if actual_duration is None:
+        logger.info("  ❌ No video data found in database")
         return False
     
-    # Calculate actual video duration from transcript
-    transcript = video_data.get("transcript", [])
-    if not transcript or len(transcript) == 0:
-        print(f"  ❌ No transcript data")
+    if not actual_duration:
+        logger.info("  ❌ No transcript data")
         return False
     
-    last_snippet = transcript[-1]
-    if isinstance(last_snippet, dict):
-        actual_duration = last_snippet.get("start", 0) + last_snippet.get("duration", 0)
-    else:
-        actual_duration = last_snippet.start + last_snippet.duration
-    
-    # Get segments from cached segmentation
-    segments = cached_segmentation["segmentation"].get("segments", [])
-    if not segments or len(segments) == 0:
-        print(f"  ❌ No segments found")
+    # Last segment end is stored with the segmentation (None when it has no segments)
+    last_segment_end = cached_segmentation["last_segment_end"]
+    if last_segment_end is None:
+        logger.info("  ❌ No segments found")
         return False
     
-    # Find the last segment by end_time
-    last_segment_end = max(seg["end_time"] for seg in segments)
-    
     # Calculate coverage percentage
     coverage_percentage = (last_segment_end / actual_duration) * 100 if actual_duration > 0 else 0
     time_missing = actual_duration - last_segment_end
     
-    print(f"  📊 Video duration: {actual_duration:.0f}s | Last segment ends: {last_segment_end:.0f}s | Coverage: {coverage_percentage:.1f}%")
+    logger.info("  📊 Video duration: %.0fs | Last segment ends: %.0fs | Coverage: %.1f%%", actual_duration, last_segment_end, coverage_percentage)
     
     # Consider complete if segments cover at least 95% of video
     # (allows for slight variations in processing)
     is_complete = coverage_percentage >= 95.0
     
     if not is_complete:
-        print(f"  ❌ Incomplete: missing last {time_missing:.0f}s ({100-coverage_percentage:.1f}% uncovered)")
+        logger.info("  ❌ Incomplete: missing last %.0fs (%.1f%% uncovered)", time_missing, 100 - coverage_percentage)
+    elif cached_segmentation["processing_status"] == "complete":
+        db.mark_segmentation_verified(cached_segmentation["id"])
     
     return is_complete
 
@@ -283,38 +387,45 @@ def get_segmentation_status(video_url: str):
         video_url: YouTube video URL or ID
     
     Returns:
-        Status information including coverage percentage and completeness
+        Status information including coverage percentage and completeness,
+        or the job status while a long video is queued, running or has failed
     """
     video_id = extract_video_id(video_url)
     
     if not video_id:
         raise HTTPException(status_code=400, detail="Invalid YouTube URL or video ID")
     
+    # Background job for a long video takes precedence over older results
+    job = _jobs.get(video_id)
+    if job:
+        messages = {
+            "queued": "Queued: waiting for a free segmentation worker.",
+            "running": "Running: segmenting the video in chunks.",
+            "failed": f"{job['error']}. Request /segment again to retry."
+        }
+        return {
+            "video_id": video_id,
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "message": messages[job["status"]]
+        }
+    
     db = get_db()
     segmentation = db.get_segmentation(video_id)
     
     if not segmentation:
         raise HTTPException(status_code=404, detail="No segmentation found for this video")
     
-    # Get video data for coverage calculation
-    video_data = db.get_video(video_id)
-    actual_duration = 0
+    # Get video duration for coverage calculation (without loading the transcript)
+    video_duration = db.get_video_duration(video_id)
+    actual_duration = video_duration or 0
     last_segment_end = 0
     coverage_percentage = 0
     
-    if video_data:
-        transcript = video_data.get("transcript", [])
-        if transcript and len(transcript) > 0:
-            last_snippet = transcript[-1]
-            if isinstance(last_snippet, dict):
-                actual_duration = last_snippet.get("start", 0) + last_snippet.get("duration", 0)
-            else:
-                actual_duration = last_snippet.start + last_snippet.duration
-        
-        # Get last segment end time
-        segments = segmentation["segmentation"].get("segments", [])
-        if segments and len(segments) > 0:
-            last_segment_end = max(seg["end_time"] for seg in segments)
+    if video_duration is not None:
+        # Get last segment end time (stored with the segmentation)
+        if segmentation["last_segment_end"] is not None:
+            last_segment_end = segmentation["last_segment_end"]
             coverage_percentage = (last_segment_end / actual_duration) * 100 if actual_duration > 0 else 0
     
     status_info = {
@@ -2,38 +2,31 @@
 Transcript-related API endpoints.
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import hashlib
+import logging
+from operator import attrgetter
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from helpers.getTranscript import getTranscript
-from helpers import format_duration, extract_video_id
+from helpers.get_video_title import get_video_title
+from helpers import format_duration, extract_video_id, run_coalesced
 from models import get_db
-import requests
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/transcript", tags=["Transcript"])
 
+# Snippets joined into each chunk of a streamed transcript
+STREAM_SNIPPETS_PER_CHUNK = 256
 
-def get_video_title(video_id: str) -> str:
-    """
-    Fetch video title from YouTube using oembed API.
-    
-    Args:
-        video_id: YouTube video ID
-    
-    Returns:
-        Video title or None if unable to fetch
-    """
-    try:
-        url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("title")
-    except Exception as e:
-        print(f"⚠️  Could not fetch title for {video_id}: {e}")
-    return None
+# Transcripts don't change once published, so clients and proxies may keep them a day
+TRANSCRIPT_CACHE_CONTROL = "public, max-age=86400, immutable"
 
 
 @router.get("")
-def get_transcript(video_url: str):
+async def get_transcript(video_url: str, request: Request, response: Response, stream: bool = False):
     """
     Fetch transcript from a YouTube URL or video ID.
     
@@ -42,6 +35,15 @@ def get_transcript(video_url: str):
     - Short URL: ?video_url=https://youtu.be/VIDEO_ID
     - Just the video ID: ?video_url=VIDEO_ID
     
+    Query parameters:
+    - stream: Set to true to stream the transcript text as text/plain instead
+      of returning JSON, for long transcripts (default: false). The video ID,
+      length and snippet count are sent as X-Video-Id, X-Video-Length and
+      X-Snippet-Count headers.
+    
+    Responses carry an ETag and a day-long Cache-Control once the video's
+    title is known; a request whose If-None-Match matches gets 304 Not Modified.
+    
     Returns:
     - video_id: YouTube video ID
     - transcript: Full transcript text
@@ -56,43 +58,83 @@ def get_transcript(video_url: str):
     # Get database instance
     db = get_db()
     
-    # Check if transcript already exists in database
-    cached_video = db.get_video(video_id)
+    # Check if transcript already exists in database (decoding a long
+    # transcript is too slow for the event loop)
+    cached_video = await asyncio.to_thread(db.get_video, video_id)
     if cached_video:
-        print(f"✅ Using cached transcript for {video_id}")
+        logger.info("✅ Using cached transcript for %s", video_id)
         
         # If title is missing, fetch and update it
-        if not cached_video.get("title"):
-            print(f"⚠️  Title missing for {video_id}, fetching...")
-            video_title = get_video_title(video_id)
+        video_title = cached_video.get("title")
+        if not video_title:
+            logger.info("⚠️  Title missing for %s, fetching...", video_id)
+            video_title = await asyncio.to_thread(get_video_title, video_id)
             if video_title:
-                print(f"📺 Fetched title: {video_title}")
-                # Update the video with the title
-                snippets = [
-                    type('Snippet', (), {
-                        'text': s['text'],
-                        'start': s['start'],
-                        'duration': s['duration']
-                    })()
-                    for s in cached_video["transcript"]
-                ]
-                db.save_video(video_id, snippets, title=video_title)
-                cached_video["title"] = video_title
+                logger.info("📺 Fetched title: %s", video_title)
+                # Update only the title; the stored transcript stays as is
+                await asyncio.to_thread(db.update_title, video_id, video_title)
         
-        # Reconstruct full text from cached transcript
-        full_text = ' '.join(snippet["text"] for snippet in cached_video["transcript"])
         video_length = format_duration(cached_video["duration_seconds"])
         
+        cache_headers = _cache_headers(video_id, video_title, cached_video["snippet_count"], video_length, stream)
+        if _not_modified(request, cache_headers):
+            return Response(status_code=304, headers=cache_headers)
+        response.headers.update(cache_headers)
+        
+        if stream:
+            texts = [snippet["text"] for snippet in cached_video["transcript"]]
+            return _stream_transcript(video_id, texts, video_length, cache_headers)
+        
+        # Full text is joined once when the transcript is saved
+        full_text = cached_video["full_text"]
+        
         return {
             "video_id": video_id,
             "transcript": full_text,
             "video_length": video_length,
             "snippet_count": cached_video["snippet_count"],
-            "title": cached_video.get("title")
+            "title": video_title
         }
     
-    # Fetch fresh transcript
-    res = getTranscript(video_id)
+    # Fetch fresh transcript; concurrent requests for the same video share one fetch
+    snippets, video_title = await run_coalesced(("transcript", video_id), lambda: _fetch_transcript(video_id, db))
+    
+    video_length_seconds = snippets[-1].start + snippets[-1].duration if snippets else 0
+    video_length = format_duration(video_length_seconds)
+    
+    cache_headers = _cache_headers(video_id, video_title, len(snippets), video_length, stream)
+    if _not_modified(request, cache_headers):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+    
+    if stream:
+        return _stream_transcript(video_id, list(map(attrgetter('text'), snippets)), video_length, cache_headers)
+    
+    # Extract full text (attrgetter pulls .text in C instead of a Python-level loop)
+    full_text = ' '.join(map(attrgetter('text'), snippets))
+    
+    return {
+        "video_id": video_id,
+        "transcript": full_text,
+        "video_length": video_length,
+        "snippet_count": len(snippets),
+        "title": video_title
+    }
+
+
+async def _fetch_transcript(video_id: str, db) -> tuple:
+    """
+    Fetch a video's transcript and title from YouTube and save them.
+    
+    Args:
+        video_id: YouTube video ID
+        db: Database instance
+    
+    Returns:
+        (snippets, video_title) tuple
+    """
+    # Blocking network calls run in a worker thread
+    res = await asyncio.to_thread(getTranscript, video_id)
     
     if not res:
         raise HTTPException(status_code=404, detail="No transcript available for this video")
@@ -101,24 +143,76 @@ def get_transcript(video_url: str):
     snippets = res.snippets if hasattr(res, 'snippets') else res
     
     # Fetch video title
-    video_title = get_video_title(video_id)
+    video_title = await asyncio.to_thread(get_video_title, video_id)
     if video_title:
-        print(f"📺 Fetched title: {video_title}")
+        logger.info("📺 Fetched title: %s", video_title)
     
     # Save to database with title
-    db.save_video(video_id, snippets, title=video_title)
-    print(f"💾 Saved transcript for {video_id}")
+    await asyncio.to_thread(db.save_video, video_id, snippets, title=video_title)
+    logger.info("💾 Saved transcript for %s", video_id)
     
-    video_length_seconds = snippets[-1].start + snippets[-1].duration if snippets else 0
-    video_length = format_duration(video_length_seconds)
+    return snippets, video_title
+
+
+def _cache_headers(video_id: str, title: Optional[str], snippet_count: int, video_length: str, stream: bool) -> dict:
+    """
+    HTTP caching headers for a transcript response.
+    
+    The ETag is derived from what the response contains, so it is the same
+    for a cached and a freshly fetched transcript, and differs between the
+    JSON and streamed forms.
     
-    # Extract full text
-    full_text = ' '.join(s.text for s in snippets)
+    Args:
+        video_id: YouTube video ID
+        title: Video title (None while it is unknown)
+        snippet_count: Number of transcript snippets
+        video_length: Human-readable duration
+        stream: Whether the response is the streamed text form
     
+    Returns:
+        ETag and Cache-Control headers, or an empty dictionary without a title
+        (the title is looked up again later, so the response may still change)
+    """
+    if not title:
+        return {}
+    key = "\x1f".join((video_id, title, str(snippet_count), video_length, "stream" if stream else "json"))
     return {
-        "video_id": video_id,
-        "transcript": full_text,
-        "video_length": video_length,
-        "snippet_count": len(snippets),
-        "title": video_title
+        "ETag": '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"',
+        "Cache-Control": TRANSCRIPT_CACHE_CONTROL
     }
+
+
+def _not_modified(request: Request, cache_headers: dict) -> bool:
+    """Whether the request's If-None-Match already names this response's ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match or not cache_headers:
+        return False
+    etag = cache_headers["ETag"]
+    # Compression middleware may mark the tag weak (W/"...")
+    return any(tag.strip().removeprefix("W/") in (etag, "*") for tag in if_none_match.split(","))
+
+
+def _stream_transcript(video_id: str, texts: list, video_length: str, headers: Optional[dict] = None) -> StreamingResponse:
+    """
+    Stream transcript text as text/plain, joined with spaces like the JSON response.
+    
+    Args:
+        video_id: YouTube video ID
+        texts: Text of each transcript snippet, in order
+        video_length: Human-readable duration
+        headers: Extra response headers (e.g. caching headers)
+    
+    Returns:
+        StreamingResponse sending STREAM_SNIPPETS_PER_CHUNK snippets per chunk
+    """
+    async def iter_chunks():
+        for i in range(0, len(texts), STREAM_SNIPPETS_PER_CHUNK):
+            chunk = ' '.join(texts[i:i + STREAM_SNIPPETS_PER_CHUNK])
+            yield (chunk if i == 0 else ' ' + chunk).encode()
+    
+    return StreamingResponse(iter_chunks(), media_type="text/plain; charset=utf-8", headers={
+        "X-Video-Id": video_id,
+        "X-Video-Length": video_length,
+        "X-Snippet-Count": str(len(texts)),
+        **(headers or {})
+    })
@@ -2,7 +2,9 @@ from .format_duration import format_duration
 from .extract_video_id import extract_video_id
 from .format_timestamp import format_timestamp
 from .getTranscript import getTranscript
+from .get_video_title import get_video_title, get_video_titles
+from .run_coalesced import run_coalesced
 """helpers package exports."""
 
 
-__all__ = ["format_duration", "extract_video_id", "format_timestamp", "getTranscript"]
\ No newline at end of file
+__all__ = ["format_duration", "extract_video_id", "format_timestamp", "getTranscript", "get_video_title", "get_video_titles", "run_coalesced"]
\ No newline at end of file
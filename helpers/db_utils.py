@@ -2,8 +2,11 @@
 Database initialization and utility functions.
 """
 
+import logging
 from models.database import VideoDatabase, get_db
 
+logger = logging.getLogger(__name__)
+
 
 def init_database(db_path: str = "videos.db") -> VideoDatabase:
     """
@@ -16,7 +19,7 @@ def init_database(db_path: str = "videos.db") -> VideoDatabase:
         VideoDatabase instance
     """
     db = VideoDatabase(db_path)
-    print(f"✅ Database initialized at {db_path}")
+    logger.info("✅ Database initialized at %s", db_path)
     return db
 
 
@@ -35,21 +38,15 @@ def get_database_stats(db: VideoDatabase = None) -> dict:
     
     cursor = db.conn.cursor()
     
-    # Count videos
-    cursor.execute("SELECT COUNT(*) FROM videos")
-    video_count = cursor.fetchone()[0]
-    
-    # Count segmentations
-    cursor.execute("SELECT COUNT(*) FROM segmentations")
-    segmentation_count = cursor.fetchone()[0]
-    
-    # Count segments
-    cursor.execute("SELECT COUNT(*) FROM segments")
-    segment_count = cursor.fetchone()[0]
-    
-    # Get total duration
-    cursor.execute("SELECT SUM(duration_seconds) FROM videos")
-    total_duration = cursor.fetchone()[0] or 0
+    # All counts and the total duration in one query
+    cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM videos),
+            (SELECT COUNT(*) FROM segmentations),
+            (SELECT COUNT(*) FROM segments),
+            (SELECT COALESCE(SUM(duration_seconds), 0) FROM videos)
+    """)
+    video_count, segmentation_count, segment_count, total_duration = cursor.fetchone()
     
     return {
         "videos": video_count,
@@ -62,6 +59,7 @@ def get_database_stats(db: VideoDatabase = None) -> dict:
 
 if __name__ == "__main__":
     # Initialize database when run directly
+    logging.basicConfig(level=logging.INFO)
     db = init_database()
     stats = get_database_stats(db)
     print("\nDatabase Statistics:")
@@ -1,11 +1,20 @@
-from urllib.parse import urlparse, parse_qs
+import re
+from functools import lru_cache
 
+# Every supported form in one scan: watch?v=, youtu.be/, /embed/, /shorts/, /live/, /v/ or a bare ID
+_VIDEO_ID_RE = re.compile(r'(?:[?&]v=|youtu\.be/|/embed/|/shorts/|/live/|/v/|^)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])')
+
+# Clients repeat the same few URLs, so repeat lookups skip the regex
+@lru_cache(maxsize=1024)
 def extract_video_id(video_url: str) -> str:
     """
     Extract video ID from various YouTube URL formats:
     - https://www.youtube.com/watch?v=VIDEO_ID
     - https://youtu.be/VIDEO_ID
     - https://www.youtube.com/embed/VIDEO_ID
+    - https://www.youtube.com/shorts/VIDEO_ID
+    - https://www.youtube.com/live/VIDEO_ID
+    - https://www.youtube.com/v/VIDEO_ID
     - Or just VIDEO_ID directly
     """
     if not video_url:
@@ -15,27 +24,5 @@ def extract_video_id(video_url: str) -> str:
     if len(video_url) == 11 and '/' not in video_url and '?' not in video_url:
         return video_url
     
-    # Parse full URLs
-    try:
-        parsed = urlparse(video_url)
-        
-        # youtu.be format
-        if parsed.hostname in ('youtu.be', 'www.youtu.be'):
-            return parsed.path.lstrip('/')
-        
-        # youtube.com/watch format
-        if parsed.hostname in ('youtube.com', 'www.youtube.com'):
-            if parsed.path == '/watch':
-                return parse_qs(parsed.query).get('v', [None])[0]
-            # youtube.com/embed format
-            elif parsed.path.startswith('/embed/'):
-                return parsed.path.split('/')[2]
-        
-        # If no pattern matched, try to extract 11-char ID
-        for part in video_url.split('/'):
-            if len(part) == 11:
-                return part
-    except Exception:
-        pass
-    
-    return None
+    match = _VIDEO_ID_RE.search(video_url)
+    return match.group(1) if match else None
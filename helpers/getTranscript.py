@@ -1,30 +1,61 @@
+import threading
+from collections import OrderedDict
 from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
 
+# Try English first, then common languages, then any available
+_DEFAULT_LANGS = ('en', 'es', 'fr', 'de', 'pt', 'it', 'ja', 'ko', 'zh-Hans', 'zh-Hant')
+
+# One client for all fetches, so its HTTP session is reused
+_API = YouTubeTranscriptApi()
+
+# (video_id, languages) -> fetched transcript, LRU ordered; errors aren't cached.
+# Kept small since a long video's transcript holds thousands of snippets.
+# Callers run in threadpool workers, so the lock guards it.
+TRANSCRIPT_CACHE_SIZE = 32
+_transcript_cache = OrderedDict()
+_transcript_cache_lock = threading.Lock()
+
 def getTranscript(video_id, languages=None):
     """
     Fetch transcript for a YouTube video with language fallback support.
     
+    Successful fetches are cached in memory, so e.g. /transcript followed by
+    /segment for the same video only downloads the transcript once.
+    
     Args:
         video_id: YouTube video ID
-        languages: List of language codes to try (default: ['en', 'es', 'fr', 'de'])
+        languages: Language codes to try (default: _DEFAULT_LANGS)
     
     Returns:
         Transcript object or error message string
     """
-    if languages is None:
-        # Try English first, then common languages, then any available
-        languages = ['en', 'es', 'fr', 'de', 'pt', 'it', 'ja', 'ko', 'zh-Hans', 'zh-Hant']
-    
-    ytt_api = YouTubeTranscriptApi()
+    key = (video_id, tuple(languages) if languages is not None else _DEFAULT_LANGS)
+    with _transcript_cache_lock:
+        transcript = _transcript_cache.get(key)
+        if transcript is not None:
+            _transcript_cache.move_to_end(key)
+            return transcript
     
+    transcript = _fetch_transcript(video_id, key[1])
+    if not isinstance(transcript, str):
+        with _transcript_cache_lock:
+            _transcript_cache[key] = transcript
+            _transcript_cache.move_to_end(key)
+            while len(_transcript_cache) > TRANSCRIPT_CACHE_SIZE:
+                _transcript_cache.popitem(last=False)
+    return transcript
+
+
+def _fetch_transcript(video_id, languages):
+    """Fetch a transcript from YouTube (see getTranscript)."""
     try:
         # Try to fetch transcript in preferred languages
-        transcript = ytt_api.fetch(video_id, languages=languages)
+        transcript = _API.fetch(video_id, languages=languages)
         return transcript
     except NoTranscriptFound as e:
         # If no transcript in preferred languages, try getting any available transcript
         try:
-            transcript_list = ytt_api.list_transcripts(video_id)
+            transcript_list = _API.list_transcripts(video_id)
             # Get first available transcript (generated or manual)
             transcript = transcript_list.find_transcript(transcript_list._manually_created_transcripts or transcript_list._generated_transcripts)
             # Translate to English if possible
@@ -0,0 +1,127 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# One keep-alive session for all oembed lookups, so title fetches reuse connections to YouTube
+_session = requests.Session()
+_session.headers["User-Agent"] = "ytChatbot/0.1"
+_session.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
+# video_id -> (expiry time, title), LRU ordered; failed lookups aren't cached.
+# Lookups run in threadpool workers, so the lock guards it.
+TITLE_CACHE_SIZE = 4096
+TITLE_CACHE_TTL_SECONDS = 86400
+_title_cache = OrderedDict()
+_title_cache_lock = threading.Lock()
+
+# YouTube Data API v3 accepts up to 50 IDs per videos.list call
+_VIDEOS_LIST_URL = "https://www.googleapis.com/youtube/v3/videos"
+_VIDEOS_PER_CALL = 50
+
+
+def _cached_title(video_id: str):
+    """Title cached for video_id, or None if missing or expired."""
+    with _title_cache_lock:
+        cached = _title_cache.get(video_id)
+        if cached is not None and cached[0] > time.monotonic():
+            _title_cache.move_to_end(video_id)
+            return cached[1]
+    return None
+
+
+def _cache_title(video_id: str, title: str):
+    """Remember a fetched title, evicting the least recently used ones."""
+    with _title_cache_lock:
+        _title_cache[video_id] = (time.monotonic() + TITLE_CACHE_TTL_SECONDS, title)
+        _title_cache.move_to_end(video_id)
+        while len(_title_cache) > TITLE_CACHE_SIZE:
+            _title_cache.popitem(last=False)
+
+
+def get_video_title(video_id: str) -> str:
+    """
+    Fetch video title from YouTube using oembed API.
+    
+    Args:
+        video_id: YouTube video ID
+    
+    Returns:
+        Video title or None if unable to fetch
+    """
+    title = _cached_title(video_id)
+    if title is not None:
+        return title
+    
+    try:
+        url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
+        response = _session.get(url, timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+            title = data.get("title")
+            if title:
+                _cache_title(video_id, title)
+            return title
+    except Exception as e:
+        logger.warning("⚠️  Could not fetch title for %s: %s", video_id, e)
+    return None
+
+
+def get_video_titles(video_ids: list) -> dict:
+    """
+    Fetch titles for several videos, 50 per request when possible.
+    
+    Uses the YouTube Data API v3 videos.list endpoint when YOUTUBE_API_KEY is
+    set, otherwise falls back to one oembed lookup per video. Fetched titles
+    are cached, so later get_video_title() calls for these videos are free.
+    
+    Args:
+        video_ids: YouTube video IDs
+    
+    Returns:
+        Dictionary mapping video ID to title (videos without a title are omitted)
+    """
+    titles = {}
+    missing = []
+    for video_id in dict.fromkeys(video_ids):
+        title = _cached_title(video_id)
+        if title is not None:
+            titles[video_id] = title
+        else:
+            missing.append(video_id)
+    
+    api_key = os.getenv("YOUTUBE_API_KEY")
+    if api_key:
+        for i in range(0, len(missing), _VIDEOS_PER_CALL):
+            batch = missing[i:i + _VIDEOS_PER_CALL]
+            try:
+                response = _session.get(_VIDEOS_LIST_URL, params={
+                    "part": "snippet",
+                    "id": ",".join(batch),
+                    "key": api_key
+                }, timeout=5)
+                response.raise_for_status()
+                for item in response.json().get("items", []):
+                    title = item.get("snippet", {}).get("title")
+                    if title:
+                        _cache_title(item["id"], title)
+                        titles[item["id"]] = title
+            except Exception as e:
+                logger.warning("⚠️  Could not fetch titles for %d videos: %s", len(batch), e)
+        return titles
+    
+    for video_id in missing:
+        title = get_video_title(video_id)
+        if title:
+            titles[video_id] = title
+    return titles
@@ -0,0 +1,30 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+# (event loop, key) -> task running the shared call
+_inflight = {}
+
+
+async def run_coalesced(key: Hashable, make_call: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run make_call() once for all concurrent callers using the same key.
+    
+    The first caller starts the call; callers arriving while it is in flight
+    await the same task and get its result (or exception). Once it finishes,
+    the next caller starts a new call. A caller being cancelled doesn't cancel
+    the call for the others.
+    
+    Args:
+        key: Identifies the call, e.g. ("transcript", video_id)
+        make_call: Creates the coroutine to run
+    
+    Returns:
+        Result of the shared call
+    """
+    inflight_key = (asyncio.get_running_loop(), key)
+    task = _inflight.get(inflight_key)
+    if task is None:
+        task = asyncio.ensure_future(make_call())
+        _inflight[inflight_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(inflight_key, None))
+    return await asyncio.shield(task)
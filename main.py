@@ -1,23 +1,58 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+import asyncio
+import logging
+import os
 import time
 import datetime
 import uvicorn
 from endpoints import transcript_router, segmentation_router, chatbot_router
+from endpoints.responses import FastJSONResponse
 from dotenv import load_dotenv
 from helpers.db_utils import get_database_stats
 from models import get_db
+from agent import create_segmentation_chain
+from agent.chatbot.semantic_cache import get_semantic_cache
 
 load_dotenv()
 
-app = FastAPI(title="ytChatbot API", version="0.1.0")
+# Server logs; set LOG_LEVEL=WARNING to skip per-request info messages
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize the database and warm up the models before serving requests.
+    
+    The segmentation LLM client and the chatbot's embedding model are created
+    here, per worker, so the first /segment or /chat request doesn't pay for
+    them.
+    """
+    get_db()
+    logger.info("✅ Database initialized")
+    
+    try:
+        create_segmentation_chain()
+        logger.info("✅ Segmentation client ready")
+    except ValueError as e:
+        logger.warning("⚠️  Segmentation client not created: %s", e)
+    
+    # Loading the embedding model blocks, so keep it off the event loop
+    await asyncio.to_thread(get_semantic_cache().warm_up)
+    logger.info("✅ Semantic cache ready")
+    
+    yield
+
+
+# Responses are encoded with orjson when it is installed
+app = FastAPI(title="ytChatbot API", version="0.1.0", default_response_class=FastJSONResponse, lifespan=lifespan)
 _start_time = time.time()
 
-# Initialize database on startup
-@app.on_event("startup")
-def startup_event():
-    """Initialize database on application startup."""
-    db = get_db()
-    print("✅ Database initialized")
+# Compress responses over 1 KB (transcripts and segmentations are mostly text)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Include endpoint routers
 app.include_router(transcript_router)
@@ -26,16 +61,18 @@ app.include_router(chatbot_router)
 
 
 @app.get("/health", tags=["System"])
-def health():
+async def health():
     """
     Simple health endpoint returning status, uptime (seconds) and current UTC timestamp.
     """
-    uptime = time.time() - _start_time
-    return {
+    # Probed constantly by load balancers: runs on the event loop (no
+    # threadpool hop), reads the clock once and skips FastAPI's encoder walk
+    now = time.time()
+    return FastJSONResponse({
         "status": "ok",
-        "uptime_seconds": round(uptime, 2),
-        "timestamp_utc": datetime.datetime.utcnow().isoformat() + "Z"
-    }
+        "uptime_seconds": round(now - _start_time, 2),
+        "timestamp_utc": datetime.datetime.fromtimestamp(now, datetime.UTC).isoformat().replace("+00:00", "Z")
+    })
 
 
 @app.get("/stats", tags=["System"])
@@ -49,4 +86,19 @@ def stats():
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    if os.getenv("DEV"):
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # Each worker process has its own GIL, database connections and caches.
+        # Long-video jobs and request coalescing are tracked per process, so
+        # with several workers a job's status is only known to the worker that
+        # started it; hence one worker unless WEB_CONCURRENCY says otherwise.
+        # loop/http "auto" use uvloop and httptools when they are installed.
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            loop="auto",
+            http="auto"
+        )
@@ -1,4 +1,4 @@
-from .pydantic_models import VideoSegment, VideoSegmentation
-from .database import VideoDatabase, get_db
+from .pydantic_models import VideoSegment, VideoSegmentation, VideoSegmentationBatch, ProcessingStats
+from .database import VideoDatabase, CachedVideoDatabase, get_db
 
-__all__ = ["VideoSegment", "VideoSegmentation", "VideoDatabase", "get_db"]
\ No newline at end of file
+__all__ = ["VideoSegment", "VideoSegmentation", "VideoSegmentationBatch", "ProcessingStats", "VideoDatabase", "CachedVideoDatabase", "get_db"]
\ No newline at end of file
@@ -2,11 +2,63 @@
 Database models and schema for storing video data and segmentation.
 """
 
+import logging
 import sqlite3
+import threading
+import time
+from array import array
+from types import SimpleNamespace
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import json
+import zlib
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+try:
+    from compression import zstd  # Standard library from Python 3.14
+except ImportError:
+    zstd = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_dumps(obj) -> str:
+    """Encode a stored JSON column, with orjson when it is installed."""
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
+
+# Decode a stored JSON column, with orjson when it is installed
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# zstd frames start with this magic number; other blobs were written with zlib
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _normalize_topics(topics) -> set:
+    """Distinct lower-cased, stripped topics as stored in segment_topics."""
+    return {topic.strip().lower() for topic in topics if topic.strip()}
+
+
+def _compress(data: bytes) -> bytes:
+    """Compress a stored blob with zstd when available, otherwise zlib."""
+    if zstd is not None:
+        return zstd.compress(data, level=9)
+    return zlib.compress(data, 6)
+
+
+def _decompress(blob: bytes) -> bytes:
+    """Decompress a blob written by _compress (either codec)."""
+    if blob[:4] == _ZSTD_MAGIC:
+        if zstd is None:
+            raise RuntimeError("Transcript was compressed with zstd, which needs Python 3.14+")
+        return zstd.decompress(blob)
+    return zlib.decompress(blob)
 
 
 class VideoDatabase:
@@ -20,14 +72,51 @@ class VideoDatabase:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
-        self.conn = None
-        self._connect()
+        # Each thread gets its own connection (see conn), so queries from the
+        # FastAPI threadpool run in parallel instead of queueing on one
+        # connection. An in-memory database only exists on the connection that
+        # created it, so it keeps a single shared one.
+        in_memory = db_path in ("", ":memory:")
+        self._local = SimpleNamespace() if in_memory else threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        # WAL allows concurrent readers but a single writer; writes queue here
+        # instead of failing with "database is locked" after the busy timeout
+        self._write_lock = threading.Lock()
+        # video_id -> transcript time index (see get_transcript_index), LRU
+        # ordered; read from worker threads, so the lock guards it
+        self._transcript_index = OrderedDict()
+        self._transcript_index_lock = threading.Lock()
         self._create_tables()
     
-    def _connect(self):
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's database connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+    
+    def _connect(self) -> sqlite3.Connection:
         """Establish database connection."""
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row  # Enable column access by name
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        
+        # page_size only applies to a new database, before WAL is enabled
+        conn.execute("PRAGMA page_size=4096")
+        
+        # WAL lets readers run while a segmentation is being written; with WAL,
+        # synchronous=NORMAL is still crash-safe and skips an fsync per commit
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped reads
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
     
     def _create_tables(self):
         """Create database tables if they don't exist."""
@@ -41,10 +130,16 @@ class VideoDatabase:
                 duration_seconds REAL,
                 snippet_count INTEGER,
                 transcript_json TEXT NOT NULL,
+                transcript_compressed BLOB,
+                full_text TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        self._add_missing_column(cursor, "videos", "full_text", "TEXT")
+        # Transcripts are stored compressed here; transcript_json is only read
+        # for rows saved before this column existed
+        self._add_missing_column(cursor, "videos", "transcript_compressed", "BLOB")
         
         # Segmentations table - stores video segmentation results
         cursor.execute("""
@@ -57,10 +152,14 @@ class VideoDatabase:
                 processing_status TEXT DEFAULT 'complete',
                 chunks_processed INTEGER,
                 total_chunks INTEGER,
+                last_segment_end REAL,
+                verified_at TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (video_id) REFERENCES videos (video_id)
             )
         """)
+        self._add_missing_column(cursor, "segmentations", "last_segment_end", "REAL")
+        self._add_missing_column(cursor, "segmentations", "verified_at", "TIMESTAMP")
         
         # Segments table - individual segments for easy querying
         cursor.execute("""
@@ -80,15 +179,66 @@ class VideoDatabase:
             )
         """)
         
+        # Segment topics table - key_topics normalized one row per topic, so
+        # topic lookups are exact index hits instead of scans of the JSON text
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'segment_topics'")
+        topics_existed = cursor.fetchone() is not None
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS segment_topics (
+                segment_id INTEGER NOT NULL,
+                topic TEXT NOT NULL,
+                PRIMARY KEY (segment_id, topic),
+                FOREIGN KEY (segment_id) REFERENCES segments (id)
+            )
+        """)
+        if not topics_existed:
+            # Normalize topics of segments saved before the table existed
+            cursor.execute("SELECT id, key_topics_json FROM segments")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO segment_topics (segment_id, topic) VALUES (?, ?)",
+                [
+                    (row["id"], topic)
+                    for row in cursor.fetchall()
+                    for topic in _normalize_topics(_json_loads(row["key_topics_json"] or "[]"))
+                ]
+            )
+        
+        # Chunk results table - per-chunk LLM results of long-video segmentation,
+        # keyed by the chunk's content hash so retries skip finished chunks
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_results (
+                cache_key TEXT PRIMARY KEY,
+                video_id TEXT NOT NULL,
+                chunk_number INTEGER,
+                segmentation_json TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (video_id) REFERENCES videos (video_id)
+            )
+        """)
+        
         # Create indexes for faster queries
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_segments_video_id 
             ON segments (video_id)
         """)
         
+        # Covers every column get_segments_by_time reads, so time-range
+        # queries are answered from the index without touching segment rows.
+        # It supersedes the plain (video_id, start_time, end_time) index.
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_segments_time_cover'")
+        cover_existed = cursor.fetchone() is not None
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_segments_time_cover 
+            ON segments (video_id, start_time, end_time, title, summary, key_topics_json, difficulty)
+        """)
+        cursor.execute("DROP INDEX IF EXISTS idx_segments_time")
+        if not cover_existed:
+            # Give the query planner statistics for the new index
+            cursor.execute("ANALYZE segments")
+        
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_segments_time 
-            ON segments (video_id, start_time, end_time)
+            CREATE INDEX IF NOT EXISTS idx_segment_topics_topic 
+            ON segment_topics (topic, segment_id)
         """)
         
         cursor.execute("""
@@ -96,8 +246,68 @@ class VideoDatabase:
             ON segmentations (video_id)
         """)
         
+        self.has_fts = self._create_segments_fts(cursor)
+        
         self.conn.commit()
     
+    def _create_segments_fts(self, cursor) -> bool:
+        """
+        Create the FTS5 full-text index over segments, kept in sync by triggers.
+        
+        Args:
+            cursor: Cursor to create the index with
+        
+        Returns:
+            True if the index is available, False if SQLite lacks FTS5
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'segments_fts'")
+        existed = cursor.fetchone() is not None
+        
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts
+                USING fts5(title, summary, key_topics_json, content='segments', content_rowid='id')
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning("⚠️  FTS5 unavailable, segment search falls back to LIKE: %s", e)
+            return False
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS segments_fts_insert AFTER INSERT ON segments BEGIN
+                INSERT INTO segments_fts (rowid, title, summary, key_topics_json)
+                VALUES (new.id, new.title, new.summary, new.key_topics_json);
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS segments_fts_delete AFTER DELETE ON segments BEGIN
+                INSERT INTO segments_fts (segments_fts, rowid, title, summary, key_topics_json)
+                VALUES ('delete', old.id, old.title, old.summary, old.key_topics_json);
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS segments_fts_update AFTER UPDATE ON segments BEGIN
+                INSERT INTO segments_fts (segments_fts, rowid, title, summary, key_topics_json)
+                VALUES ('delete', old.id, old.title, old.summary, old.key_topics_json);
+                INSERT INTO segments_fts (rowid, title, summary, key_topics_json)
+                VALUES (new.id, new.title, new.summary, new.key_topics_json);
+            END
+        """)
+        
+        # Index segments saved before the full-text index existed
+        if not existed:
+            cursor.execute("INSERT INTO segments_fts (segments_fts) VALUES ('rebuild')")
+        
+        return True
+    
+    @staticmethod
+    def _add_missing_column(cursor, table: str, column: str, definition: str):
+        """Add a column introduced after a table was first created (no-op if present)."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in {row["name"] for row in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    
     def save_video(self, video_id: str, transcript_snippets: list, title: Optional[str] = None) -> bool:
         """
         Save video transcript data.
@@ -110,40 +320,111 @@ class VideoDatabase:
         Returns:
             True if saved successfully
         """
-        cursor = self.conn.cursor()
+        return self.save_videos([(video_id, transcript_snippets, title)])
+    
+    def save_videos(self, videos: list) -> bool:
+        """
+        Save several videos' transcript data in one transaction (e.g. a playlist import).
         
-        # Calculate duration and count
-        duration = transcript_snippets[-1].start + transcript_snippets[-1].duration if transcript_snippets else 0
-        snippet_count = len(transcript_snippets)
+        Rows are prepared (serialized and compressed) before the write lock is
+        taken, then written with one executemany and a single commit.
         
-        # Convert snippets to JSON-serializable format
-        transcript_data = [
-            {
-                "text": snippet.text,
-                "start": snippet.start,
-                "duration": snippet.duration
-            }
-            for snippet in transcript_snippets
-        ]
+        Args:
+            videos: (video_id, transcript_snippets, title) tuples; title may be None
         
-        try:
-            cursor.execute("""
-                INSERT INTO videos (video_id, title, duration_seconds, snippet_count, transcript_json)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(video_id) DO UPDATE SET
-                    title = excluded.title,
-                    duration_seconds = excluded.duration_seconds,
-                    snippet_count = excluded.snippet_count,
-                    transcript_json = excluded.transcript_json,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (video_id, title, duration, snippet_count, json.dumps(transcript_data)))
+        Returns:
+            True if all videos were saved, False if none were
+        """
+        rows = []
+        for video_id, transcript_snippets, title in videos:
+            # Calculate duration and count
+            duration = transcript_snippets[-1].start + transcript_snippets[-1].duration if transcript_snippets else 0
+            snippet_count = len(transcript_snippets)
+            
+            # Convert snippets to JSON-serializable format
+            transcript_data = [
+                {
+                    "text": snippet.text,
+                    "start": snippet.start,
+                    "duration": snippet.duration
+                }
+                for snippet in transcript_snippets
+            ]
+            
+            # Joined once here so transcript reads don't rebuild it
+            full_text = ' '.join(snippet["text"] for snippet in transcript_data)
+            
+            # Transcript JSON is repetitive text, so it compresses several times over
+            transcript_compressed = _compress(_json_dumps(transcript_data).encode())
             
-            self.conn.commit()
+            rows.append((video_id, title, duration, snippet_count, transcript_compressed, full_text))
+        
+        if not rows:
             return True
-        except Exception as e:
-            print(f"Error saving video: {e}")
-            self.conn.rollback()
-            return False
+        
+        cursor = self.conn.cursor()
+        
+        with self._write_lock:
+            try:
+                # Take the write lock up front rather than on the first insert
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.executemany("""
+                    INSERT INTO videos (video_id, title, duration_seconds, snippet_count,
+                                        transcript_json, transcript_compressed, full_text)
+                    VALUES (?, ?, ?, ?, '', ?, ?)
+                    ON CONFLICT(video_id) DO UPDATE SET
+                        title = excluded.title,
+                        duration_seconds = excluded.duration_seconds,
+                        snippet_count = excluded.snippet_count,
+                        transcript_json = excluded.transcript_json,
+                        transcript_compressed = excluded.transcript_compressed,
+                        full_text = excluded.full_text,
+                        updated_at = CURRENT_TIMESTAMP
+                """, rows)
+                
+                # Coverage was verified against the old transcript's duration
+                cursor.executemany("""
+                    UPDATE segmentations SET verified_at = NULL
+                    WHERE video_id = ? AND verified_at IS NOT NULL
+                """, [(row[0],) for row in rows])
+                
+                self.conn.commit()
+                with self._transcript_index_lock:
+                    for row in rows:
+                        self._transcript_index.pop(row[0], None)
+                return True
+            except Exception as e:
+                logger.error("Error saving videos: %s", e)
+                self.conn.rollback()
+                return False
+    
+    def update_title(self, video_id: str, title: str) -> bool:
+        """
+        Set the title of an already saved video, leaving its transcript as is.
+        
+        Args:
+            video_id: YouTube video ID
+            title: Video title
+        
+        Returns:
+            True if the video exists and was updated
+        """
+        cursor = self.conn.cursor()
+        
+        with self._write_lock:
+            try:
+                cursor.execute("""
+                    UPDATE videos
+                    SET title = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE video_id = ?
+                """, (title, video_id))
+                
+                self.conn.commit()
+                return cursor.rowcount > 0
+            except Exception as e:
+                logger.error("Error updating title: %s", e)
+                self.conn.rollback()
+                return False
     
     def get_video(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -158,7 +439,7 @@ class VideoDatabase:
         cursor = self.conn.cursor()
         cursor.execute("""
             SELECT video_id, title, duration_seconds, snippet_count, 
-                   transcript_json, created_at, updated_at
+                   transcript_json, transcript_compressed, full_text, created_at, updated_at
             FROM videos
             WHERE video_id = ?
         """, (video_id,))
@@ -167,12 +448,95 @@ class VideoDatabase:
         if not row:
             return None
         
+        return self._video_from_row(row)
+    
+    def get_video_duration(self, video_id: str) -> Optional[float]:
+        """
+        Get a video's stored duration without loading its transcript.
+        
+        Args:
+            video_id: YouTube video ID
+        
+        Returns:
+            Duration in seconds (0 for an empty transcript), or None if the video isn't saved
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT duration_seconds, snippet_count
+            FROM videos
+            WHERE video_id = ?
+        """, (video_id,))
+        
+        row = cursor.fetchone()
+        if not row:
+            return None
+        
+        return row["duration_seconds"] if row["snippet_count"] else 0.0
+    
+    def get_transcript_index(self, video_id: str, max_cached: int = 128) -> Optional[Dict[str, Any]]:
+        """
+        Get a time index over a video's transcript for fast range lookups.
+        
+        Snippets are ordered by start time and stored as parallel arrays, so
+        callers can bisect on "starts" instead of scanning every snippet.
+        Indexes are cached per video and rebuilt after save_video.
+        
+        Args:
+            video_id: YouTube video ID
+            max_cached: Maximum number of video indexes kept in memory
+        
+        Returns:
+            Dictionary with "starts" and "ends" float arrays, "texts" list,
+            "max_duration" (longest snippet duration) and "ends_sorted" (True
+            when ends are non-decreasing too), or None if the video is not found
+        """
+        with self._transcript_index_lock:
+            index = self._transcript_index.get(video_id)
+            if index is not None:
+                self._transcript_index.move_to_end(video_id)
+                return index
+        
+        video = self.get_video(video_id)
+        if not video:
+            return None
+        
+        transcript = sorted(video["transcript"], key=lambda snippet: snippet["start"])
+        durations = [snippet.get("duration", 0) for snippet in transcript]
+        starts = array("d", [snippet["start"] for snippet in transcript])
+        ends = array("d", [start + duration for start, duration in zip(starts, durations)])
+        
+        index = {
+            "starts": starts,
+            "ends": ends,
+            "texts": [snippet["text"] for snippet in transcript],
+            "max_duration": max(durations, default=0),
+            "ends_sorted": all(a <= b for a, b in zip(ends, ends[1:]))
+        }
+        
+        with self._transcript_index_lock:
+            self._transcript_index[video_id] = index
+            self._transcript_index.move_to_end(video_id)
+            while len(self._transcript_index) > max_cached:
+                self._transcript_index.popitem(last=False)
+        
+        return index
+    
+    @staticmethod
+    def _video_from_row(row) -> Dict[str, Any]:
+        """Convert a videos row to the dictionary returned by get_video."""
+        compressed = row["transcript_compressed"]
+        transcript = _json_loads(_decompress(compressed) if compressed is not None else row["transcript_json"])
+        full_text = row["full_text"]
+        if full_text is None:
+            # Saved before full_text was stored
+            full_text = ' '.join(snippet["text"] for snippet in transcript)
         return {
             "video_id": row["video_id"],
             "title": row["title"],
             "duration_seconds": row["duration_seconds"],
             "snippet_count": row["snippet_count"],
-            "transcript": json.loads(row["transcript_json"]),
+            "transcript": transcript,
+            "full_text": full_text,
             "created_at": row["created_at"],
             "updated_at": row["updated_at"]
         }
@@ -195,72 +559,170 @@ class VideoDatabase:
         cursor = self.conn.cursor()
         
         # Determine processing status
-        if chunks_processed and total_chunks and chunks_processed < total_chunks:
+        if chunks_processed is not None and total_chunks is not None and chunks_processed < total_chunks:
             status = "partial"
         else:
             status = "complete"
         
-        # Convert to JSON-serializable format
-        segmentation_data = {
-            "video_id": segmentation_result.video_id,
-            "overall_topic": segmentation_result.overall_topic,
-            "total_segments": segmentation_result.total_segments,
-            "segments": [
-                {
-                    "title": seg.title,
-                    "start_time": seg.start_time,
-                    "end_time": seg.end_time,
-                    "summary": seg.summary,
-                    "key_topics": seg.key_topics,
-                    "difficulty_level": seg.difficulty_level
-                }
-                for seg in segmentation_result.segments
-            ]
-        }
+        # Serialized by pydantic-core in one pass
+        segmentation_json = segmentation_result.model_dump_json()
         
-        try:
-            # Insert segmentation
-            cursor.execute("""
-                INSERT INTO segmentations 
-                (video_id, overall_topic, total_segments, segmentation_json, 
-                 processing_status, chunks_processed, total_chunks)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                video_id,
-                segmentation_result.overall_topic,
-                segmentation_result.total_segments,
-                json.dumps(segmentation_data),
-                status,
-                chunks_processed,
-                total_chunks
-            ))
-            
-            segmentation_id = cursor.lastrowid
-            
-            # Insert individual segments for easy querying
-            for segment in segmentation_result.segments:
+        with self._write_lock:
+            try:
+                # Insert segmentation
                 cursor.execute("""
-                    INSERT INTO segments 
-                    (segmentation_id, video_id, title, start_time, end_time, 
-                     summary, key_topics_json, difficulty)
+                    INSERT INTO segmentations 
+                    (video_id, overall_topic, total_segments, segmentation_json, 
+                     processing_status, chunks_processed, total_chunks, last_segment_end)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
-                    segmentation_id,
                     video_id,
-                    segment.title,
-                    segment.start_time,
-                    segment.end_time,
-                    segment.summary,
-                    json.dumps(segment.key_topics),
-                    segment.difficulty_level
+                    segmentation_result.overall_topic,
+                    segmentation_result.total_segments,
+                    segmentation_json,
+                    status,
+                    chunks_processed,
+                    total_chunks,
+                    max((seg.end_time for seg in segmentation_result.segments), default=None)
                 ))
-            
-            self.conn.commit()
-            return segmentation_id
-        except Exception as e:
-            print(f"Error saving segmentation: {e}")
-            self.conn.rollback()
-            return -1
+                
+                segmentation_id = cursor.lastrowid
+                
+                # Insert individual segments for easy querying, in one prepared statement
+                cursor.executemany("""
+                    INSERT INTO segments 
+                    (segmentation_id, video_id, title, start_time, end_time, 
+                     summary, key_topics_json, difficulty)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (
+                        segmentation_id,
+                        video_id,
+                        segment.title,
+                        segment.start_time,
+                        segment.end_time,
+                        segment.summary,
+                        _json_dumps(segment.key_topics),
+                        segment.difficulty_level
+                    )
+                    for segment in segmentation_result.segments
+                ])
+                
+                # AUTOINCREMENT ids follow insertion order, so they line up with the segments
+                cursor.execute(
+                    "SELECT id FROM segments WHERE segmentation_id = ? ORDER BY id",
+                    (segmentation_id,)
+                )
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO segment_topics (segment_id, topic) VALUES (?, ?)",
+                    [
+                        (row["id"], topic)
+                        for row, segment in zip(cursor.fetchall(), segmentation_result.segments)
+                        for topic in _normalize_topics(segment.key_topics)
+                    ]
+                )
+                
+                self.conn.commit()
+                return segmentation_id
+            except Exception as e:
+                logger.error("Error saving segmentation: %s", e)
+                self.conn.rollback()
+                return -1
+    
+    def mark_segmentation_verified(self, segmentation_id: int) -> bool:
+        """
+        Record that a segmentation was checked to cover its whole video.
+        
+        Args:
+            segmentation_id: Segmentation ID
+        
+        Returns:
+            True if the segmentation exists and was updated
+        """
+        cursor = self.conn.cursor()
+        
+        with self._write_lock:
+            try:
+                cursor.execute("""
+                    UPDATE segmentations SET verified_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, (segmentation_id,))
+                
+                self.conn.commit()
+                return cursor.rowcount > 0
+            except Exception as e:
+                logger.error("Error marking segmentation verified: %s", e)
+                self.conn.rollback()
+                return False
+    
+    def save_chunk_result(self, video_id: str, chunk_number: int, cache_key: str, segmentation_result) -> bool:
+        """
+        Save the segmentation result of one long-video chunk.
+        
+        Args:
+            video_id: YouTube video ID
+            chunk_number: 1-based chunk number
+            cache_key: Content hash of the chunk's chain input
+            segmentation_result: VideoSegmentation object for the chunk
+        
+        Returns:
+            True if successful
+        """
+        cursor = self.conn.cursor()
+        
+        with self._write_lock:
+            try:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO chunk_results
+                    (cache_key, video_id, chunk_number, segmentation_json)
+                    VALUES (?, ?, ?, ?)
+                """, (cache_key, video_id, chunk_number, segmentation_result.model_dump_json()))
+                self.conn.commit()
+                return True
+            except Exception as e:
+                logger.error("Error saving chunk result: %s", e)
+                self.conn.rollback()
+                return False
+    
+    def delete_chunk_results(self, video_id: str) -> bool:
+        """
+        Delete the saved chunk results of a video, e.g. before reprocessing it.
+        
+        Args:
+            video_id: YouTube video ID
+        
+        Returns:
+            True if successful
+        """
+        cursor = self.conn.cursor()
+        
+        with self._write_lock:
+            try:
+                cursor.execute("DELETE FROM chunk_results WHERE video_id = ?", (video_id,))
+                self.conn.commit()
+                return True
+            except Exception as e:
+                logger.error("Error deleting chunk results: %s", e)
+                self.conn.rollback()
+                return False
+    
+    def get_chunk_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a saved chunk segmentation by its content hash.
+        
+        Args:
+            cache_key: Content hash of the chunk's chain input
+        
+        Returns:
+            Segmentation dictionary (VideoSegmentation fields) or None if not found
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT segmentation_json FROM chunk_results WHERE cache_key = ?
+        """, (cache_key,))
+        
+        row = cursor.fetchone()
+        return _json_loads(row["segmentation_json"]) if row else None
     
     def get_segmentation(self, video_id: str, latest: bool = True) -> Optional[Dict[str, Any]]:
         """
@@ -278,7 +740,8 @@ class VideoDatabase:
         if latest:
             cursor.execute("""
                 SELECT id, video_id, overall_topic, total_segments, segmentation_json,
-                       processing_status, chunks_processed, total_chunks, created_at
+                       processing_status, chunks_processed, total_chunks, last_segment_end,
+                       verified_at, created_at
                 FROM segmentations
                 WHERE video_id = ?
                 ORDER BY id DESC
@@ -287,7 +750,8 @@ class VideoDatabase:
         else:
             cursor.execute("""
                 SELECT id, video_id, overall_topic, total_segments, segmentation_json,
-                       processing_status, chunks_processed, total_chunks, created_at
+                       processing_status, chunks_processed, total_chunks, last_segment_end,
+                       verified_at, created_at
                 FROM segmentations
                 WHERE video_id = ?
                 ORDER BY id ASC
@@ -298,16 +762,78 @@ class VideoDatabase:
         if not row:
             return None
         
+        return self._segmentation_from_row(row)
+    
+    @staticmethod
+    def _segmentation_from_row(row, prefix: str = "") -> Dict[str, Any]:
+        """Convert a segmentations row (optionally with prefixed column names) to a dictionary."""
+        segmentation = _json_loads(row[f"{prefix}segmentation_json"])
+        last_segment_end = row[f"{prefix}last_segment_end"]
+        if last_segment_end is None:
+            # Saved before last_segment_end was stored (or has no segments)
+            last_segment_end = max((seg["end_time"] for seg in segmentation.get("segments", [])), default=None)
         return {
-            "id": row["id"],
-            "video_id": row["video_id"],
-            "overall_topic": row["overall_topic"],
-            "total_segments": row["total_segments"],
-            "segmentation": json.loads(row["segmentation_json"]),
-            "processing_status": row["processing_status"],
-            "chunks_processed": row["chunks_processed"],
-            "total_chunks": row["total_chunks"],
-            "created_at": row["created_at"]
+            "id": row[f"{prefix}id"],
+            "video_id": row[f"{prefix}video_id"],
+            "overall_topic": row[f"{prefix}overall_topic"],
+            "total_segments": row[f"{prefix}total_segments"],
+            "segmentation": segmentation,
+            "processing_status": row[f"{prefix}processing_status"],
+            "chunks_processed": row[f"{prefix}chunks_processed"],
+            "total_chunks": row[f"{prefix}total_chunks"],
+            "last_segment_end": last_segment_end,
+            "verified_at": row[f"{prefix}verified_at"],
+            "created_at": row[f"{prefix}created_at"]
+        }
+    
+    def prefetch_video_bundle(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a video and its latest segmentation in a single query.
+        
+        Args:
+            video_id: YouTube video ID
+        
+        Returns:
+            Dictionary with "video" (as get_video) and "segmentation" (as
+            get_segmentation, or None), or None if the video is not found
+        """
+        return self.prefetch_videos([video_id]).get(video_id)
+    
+    def prefetch_videos(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several videos with their latest segmentations in a single query.
+        
+        Args:
+            video_ids: YouTube video IDs
+        
+        Returns:
+            Dictionary mapping each found video ID to its bundle (see prefetch_video_bundle)
+        """
+        if not video_ids:
+            return {}
+        
+        cursor = self.conn.cursor()
+        placeholders = ", ".join("?" for _ in video_ids)
+        cursor.execute(f"""
+            SELECT v.video_id, v.title, v.duration_seconds, v.snippet_count,
+                   v.transcript_json, v.transcript_compressed, v.full_text, v.created_at, v.updated_at,
+                   s.id AS seg_id, s.video_id AS seg_video_id, s.overall_topic AS seg_overall_topic,
+                   s.total_segments AS seg_total_segments, s.segmentation_json AS seg_segmentation_json,
+                   s.processing_status AS seg_processing_status, s.chunks_processed AS seg_chunks_processed,
+                   s.total_chunks AS seg_total_chunks, s.last_segment_end AS seg_last_segment_end,
+                   s.verified_at AS seg_verified_at, s.created_at AS seg_created_at
+            FROM videos v
+            LEFT JOIN segmentations s
+              ON s.id = (SELECT MAX(id) FROM segmentations WHERE video_id = v.video_id)
+            WHERE v.video_id IN ({placeholders})
+        """, list(video_ids))
+        
+        return {
+            row["video_id"]: {
+                "video": self._video_from_row(row),
+                "segmentation": self._segmentation_from_row(row, "seg_") if row["seg_id"] is not None else None
+            }
+            for row in cursor.fetchall()
         }
     
     def get_segments_by_time(self, video_id: str, start_time: float, end_time: float) -> List[Dict[str, Any]]:
@@ -332,22 +858,18 @@ class VideoDatabase:
             ORDER BY start_time
         """, (video_id, start_time, end_time))
         
-        return [
-            {
-                "title": row["title"],
-                "start_time": row["start_time"],
-                "end_time": row["end_time"],
-                "summary": row["summary"],
-                "key_topics": json.loads(row["key_topics_json"]),
-                "difficulty": row["difficulty"]
-            }
-            for row in cursor.fetchall()
-        ]
+        return self._segments_from_rows(cursor.fetchall())
     
     def search_segments(self, video_id: str, query: str) -> List[Dict[str, Any]]:
         """
         Search segments by title, summary, or topics.
         
+        Uses the FTS5 index when available: the query is matched as a phrase
+        whose last word may be a prefix ("machine learn" finds "Machine
+        Learning"), and results are ranked by relevance. Queries without any
+        words, or databases without FTS5, use a LIKE substring scan of titles
+        and summaries instead, plus an exact lookup of the query as a topic.
+        
         Args:
             video_id: YouTube video ID
             query: Search query
@@ -356,32 +878,245 @@ class VideoDatabase:
             List of matching segments
         """
         cursor = self.conn.cursor()
-        search_pattern = f"%{query}%"
         
-        cursor.execute("""
-            SELECT title, start_time, end_time, summary, key_topics_json, difficulty
-            FROM segments
-            WHERE video_id = ?
-              AND (title LIKE ? OR summary LIKE ? OR key_topics_json LIKE ?)
-            ORDER BY start_time
-        """, (video_id, search_pattern, search_pattern, search_pattern))
+        if self.has_fts and any(ch.isalnum() for ch in query):
+            # Quote the query so FTS5 operators in user input are matched literally
+            phrase = '"' + query.replace('"', '""') + '"*'
+            cursor.execute("""
+                SELECT s.title, s.start_time, s.end_time, s.summary, s.key_topics_json, s.difficulty
+                FROM segments_fts
+                JOIN segments s ON s.id = segments_fts.rowid
+                WHERE segments_fts MATCH ?
+                  AND s.video_id = ?
+                ORDER BY segments_fts.rank, s.start_time
+            """, (phrase, video_id))
+        else:
+            search_pattern = f"%{query}%"
+            cursor.execute("""
+                SELECT title, start_time, end_time, summary, key_topics_json, difficulty
+                FROM segments
+                WHERE video_id = ?
+                  AND (title LIKE ? OR summary LIKE ?
+                       OR id IN (SELECT segment_id FROM segment_topics WHERE topic = ?))
+                ORDER BY start_time
+            """, (video_id, search_pattern, search_pattern, query.strip().lower()))
         
+        return self._segments_from_rows(cursor.fetchall())
+    
+    def search_segments_by_topic(self, video_id: str, topic: str) -> List[Dict[str, Any]]:
+        """
+        Find segments tagged with a topic (case-insensitive exact match).
+        
+        Args:
+            video_id: YouTube video ID
+            topic: Topic to look up, e.g. "machine learning"
+        
+        Returns:
+            List of segments having the topic, ordered by start time
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT s.title, s.start_time, s.end_time, s.summary, s.key_topics_json, s.difficulty
+            FROM segment_topics t
+            JOIN segments s ON s.id = t.segment_id
+            WHERE t.topic = ?
+              AND s.video_id = ?
+            ORDER BY s.start_time
+        """, (topic.strip().lower(), video_id))
+        return self._segments_from_rows(cursor.fetchall())
+    
+    @staticmethod
+    def _segments_from_rows(rows) -> List[Dict[str, Any]]:
+        """Build segment dictionaries from segments rows."""
+        # Decode every row's topics in one call: per-call overhead dominates
+        # json.loads on lists this short
+        topics = _json_loads("[" + ",".join(row["key_topics_json"] or "[]" for row in rows) + "]")
         return [
             {
                 "title": row["title"],
                 "start_time": row["start_time"],
                 "end_time": row["end_time"],
                 "summary": row["summary"],
-                "key_topics": json.loads(row["key_topics_json"]),
+                "key_topics": key_topics,
                 "difficulty": row["difficulty"]
             }
-            for row in cursor.fetchall()
+            for row, key_topics in zip(rows, topics)
         ]
     
     def close(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Close the database connections of all threads."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            # Let SQLite refresh query planner statistics it found missing
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            conn.close()
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+class _TTLCache:
+    """Thread-safe LRU of loaded values that expire after a fixed time."""
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """
+        Create an empty cache.
+        
+        Args:
+            max_entries: Maximum number of values kept (least recently used evicted)
+            ttl_seconds: How long a value is served before it is loaded again
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expiry time, value)
+        self._lock = threading.Lock()
+    
+    def get_or_load(self, key, load):
+        """
+        Return the cached value for key, or load() it.
+        
+        Empty results (None, no rows) are returned but not cached, so a video
+        saved after the lookup is found on the next call.
+        
+        Args:
+            key: Hashable cache key
+            load: Function returning the value on a miss
+        
+        Returns:
+            The cached or freshly loaded value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+        
+        value = load()
+        if value:
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+    
+    def clear(self):
+        """Drop all cached values."""
+        with self._lock:
+            self._entries.clear()
+
+
+class CachedVideoDatabase:
+    """
+    Write-through cache over a VideoDatabase.
+    
+    Video, segmentation and segment query reads are served from in-process
+    LRU caches, so a chat session hits SQLite once per video instead of once
+    per turn, and repeated searches from the UI are answered in memory. Cached
+    dictionaries are returned by reference and must not be modified. Writes go
+    to the wrapped database and clear the caches. Other attributes are
+    forwarded to the wrapped database.
+    
+    Writes made by other processes (e.g. other Uvicorn workers) only clear
+    their own caches, so entries expire after ttl_seconds, and misses are
+    never cached. Videos carry their whole decoded transcript, so far fewer
+    of them are kept than of the other reads.
+    """
+    
+    def __init__(self, inner: VideoDatabase, max_entries: int = 4096,
+                 max_videos: int = 64, ttl_seconds: float = 30):
+        """
+        Wrap a database with read caches.
+        
+        Args:
+            inner: Database to read from and write to
+            max_entries: Maximum number of entries kept per cached method
+            max_videos: Maximum number of videos (with transcripts) kept per cached method
+            ttl_seconds: How long a cached read is served before SQLite is asked again
+        """
+        self.inner = inner
+        self._caches = {
+            name: _TTLCache(max_videos if name in ("get_video", "prefetch_video_bundle") else max_entries, ttl_seconds)
+            for name in ("get_video", "get_segmentation", "prefetch_video_bundle",
+                         "get_segments_by_time", "search_segments")
+        }
+    
+    def _cached(self, name: str, *args):
+        """Serve inner.<name>(*args) from its cache."""
+        return self._caches[name].get_or_load(args, lambda: getattr(self.inner, name)(*args))
+    
+    def __getattr__(self, name):
+        """Forward everything that isn't cached to the wrapped database."""
+        return getattr(self.inner, name)
+    
+    def get_video(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Cached VideoDatabase.get_video."""
+        return self._cached("get_video", video_id)
+    
+    def get_segmentation(self, video_id: str, latest: bool = True) -> Optional[Dict[str, Any]]:
+        """Cached VideoDatabase.get_segmentation."""
+        return self._cached("get_segmentation", video_id, latest)
+    
+    def prefetch_video_bundle(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Cached VideoDatabase.prefetch_video_bundle."""
+        return self._cached("prefetch_video_bundle", video_id)
+    
+    def get_segments_by_time(self, video_id: str, start_time: float, end_time: float) -> List[Dict[str, Any]]:
+        """Cached VideoDatabase.get_segments_by_time."""
+        return self._cached("get_segments_by_time", video_id, start_time, end_time)
+    
+    def search_segments(self, video_id: str, query: str) -> List[Dict[str, Any]]:
+        """Cached VideoDatabase.search_segments."""
+        return self._cached("search_segments", video_id, query)
+    
+    def save_video(self, *args, **kwargs) -> bool:
+        """VideoDatabase.save_video, then clear the read caches."""
+        try:
+            return self.inner.save_video(*args, **kwargs)
+        finally:
+            self.cache_clear()
+    
+    def save_videos(self, *args, **kwargs) -> bool:
+        """VideoDatabase.save_videos, then clear the read caches."""
+        try:
+            return self.inner.save_videos(*args, **kwargs)
+        finally:
+            self.cache_clear()
+    
+    def mark_segmentation_verified(self, *args, **kwargs) -> bool:
+        """VideoDatabase.mark_segmentation_verified, then clear the read caches."""
+        try:
+            return self.inner.mark_segmentation_verified(*args, **kwargs)
+        finally:
+            self.cache_clear()
+    
+    def update_title(self, *args, **kwargs) -> bool:
+        """VideoDatabase.update_title, then clear the read caches."""
+        try:
+            return self.inner.update_title(*args, **kwargs)
+        finally:
+            self.cache_clear()
+    
+    def save_segmentation(self, *args, **kwargs) -> int:
+        """VideoDatabase.save_segmentation, then clear the read caches."""
+        try:
+            return self.inner.save_segmentation(*args, **kwargs)
+        finally:
+            self.cache_clear()
+    
+    def cache_clear(self):
+        """Drop all cached reads."""
+        for cache in self._caches.values():
+            cache.clear()
     
     def __enter__(self):
         """Context manager entry."""
@@ -392,12 +1127,15 @@ class VideoDatabase:
         self.close()
 
 
-# Singleton instance
+# Singleton instance (the lock keeps concurrent first calls from opening two)
 _db_instance = None
+_db_lock = threading.Lock()
 
-def get_db() -> VideoDatabase:
+def get_db() -> CachedVideoDatabase:
     """Get or create database singleton instance."""
     global _db_instance
     if _db_instance is None:
-        _db_instance = VideoDatabase()
+        with _db_lock:
+            if _db_instance is None:
+                _db_instance = CachedVideoDatabase(VideoDatabase())
     return _db_instance
@@ -1,10 +1,13 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
 
 class VideoSegment(BaseModel):
     """Represents a logical segment/section within a video."""
     
+    # Immutable; unknown LLM output keys are dropped
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     title: str = Field(
         description="Clear, descriptive title for this segment (e.g., 'Introduction to Linear Regression')"
     )
@@ -24,11 +27,18 @@ class VideoSegment(BaseModel):
         default="medium",
         description="Estimated difficulty: 'easy', 'medium', or 'hard'"
     )
+    
+    @property
+    def key_topics_set(self) -> frozenset:
+        """Lowercased key topics, for topic similarity checks."""
+        return frozenset(topic.lower() for topic in self.key_topics)
 
 
 class VideoSegmentation(BaseModel):
     """Complete segmentation result for a video."""
     
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     video_id: str = Field(
         description="YouTube video ID"
     )
@@ -42,3 +52,26 @@ class VideoSegmentation(BaseModel):
         default=None,
         description="Overall topic or theme of the entire video"
     )
+
+
+class VideoSegmentationBatch(BaseModel):
+    """Segmentation results for several transcript chunks sent in one request."""
+    
+    segmentations: List[VideoSegmentation] = Field(
+        description="One segmentation per transcript chunk, in the same order as the chunks"
+    )
+
+
+class ProcessingStats(BaseModel):
+    """How much of a long video's chunked segmentation was processed."""
+    
+    chunks_processed: int = Field(
+        description="Number of chunks whose segments are included, in order from the start"
+    )
+    total_chunks: int = Field(
+        description="Total number of chunks the video was split into"
+    )
+    rate_limited: bool = Field(
+        default=False,
+        description="Whether processing stopped early because of a rate limit"
+    )
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from langchain_groq import ChatGroq
 from dotenv import load_dotenv
 load_dotenv()
@@ -6,3 +7,13 @@ instruction_model=ChatGroq(
     model="llama-3.3-70b-versatile",
     temperature=0.1,
 )
+
+
+# Small, fast model used to draft answers to easy questions, created on first
+# use so importing the config doesn't build a second client
+@lru_cache(maxsize=1)
+def get_draft_model():
+    return ChatGroq(
+        model="llama-3.1-8b-instant",
+        temperature=0.1,
+    )
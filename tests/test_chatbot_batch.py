@@ -0,0 +1,101 @@
+"""
+Test batching several chatbot questions into one agent call.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from types import SimpleNamespace
+import pytest
+
+
+def _load_conversational(monkeypatch):
+    """Import the chatbot module (its models need some API key, never used here)."""
+    if not os.getenv("GROQ_API_KEY"):
+        monkeypatch.setenv("GROQ_API_KEY", "test")
+    from agent.chatbot import conversational
+    return conversational
+
+
+class FakeAgent:
+    """Agent stand-in answering each call with the next canned reply."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.messages = []
+
+    def invoke(self, payload):
+        self.messages.append(payload["messages"])
+        return {"messages": [SimpleNamespace(content=self.replies.pop(0))]}
+
+
+def _use_fakes(monkeypatch, conversational, replies):
+    """Swap the agent, prompt formatting and answer cache for local fakes."""
+    from agent.chatbot.semantic_cache import SemanticCache
+
+    fake_agent = FakeAgent(replies)
+    cache = SemanticCache()
+    monkeypatch.setattr(conversational, "agent", fake_agent)
+    monkeypatch.setattr(conversational, "get_semantic_cache", lambda: cache)
+    monkeypatch.setattr(conversational, "_format_messages", lambda video_id, title, message, history=None: message)
+    return fake_agent, cache
+
+
+def _items(*questions):
+    return [{"video_id": "vid", "video_title": "Title", "user_message": q} for q in questions]
+
+
+def test_split_batched_answers(monkeypatch):
+    """Tagged answers are split out; missing or empty tags give None."""
+    conversational = _load_conversational(monkeypatch)
+    split = conversational._split_batched_answers
+
+    assert split("[1] first answer\n[2] second\nanswer", 2) == ["first answer", "second\nanswer"]
+    assert split("[2] only the second\n[1] first", 2) == ["first", "only the second"]
+    assert split("[1] first answer", 2) == ["first answer", None]
+    assert split("[1]\n[2] second", 2) == [None, "second"]
+    assert split("untagged blob", 2) == [None, None]
+    print("✅ Batched answers split by tag")
+
+
+def test_untagged_batch_reply_is_asked_again(monkeypatch):
+    """Questions the batched reply doesn't tag are answered one by one and cached alone."""
+    conversational = _load_conversational(monkeypatch)
+    fake_agent, cache = _use_fakes(monkeypatch, conversational, [
+        "untagged blob", "answer a", "answer c"
+    ])
+
+    responses = conversational.run_chatbot_batch(_items("q a", "q c"))
+
+    assert responses == ["answer a", "answer c"]
+    assert fake_agent.messages[1:] == ["q a", "q c"], "Untagged questions not asked separately"
+    assert cache.get("vid", "q c") == "answer c"
+    assert cache.get("vid", "q a") == "answer a"
+    print("✅ Untagged batch reply re-asked per question")
+
+
+def test_partially_tagged_batch_reply(monkeypatch):
+    """Tagged answers are kept and only the missing question is asked again."""
+    conversational = _load_conversational(monkeypatch)
+    fake_agent, cache = _use_fakes(monkeypatch, conversational, [
+        "[2] answer b", "answer a"
+    ])
+
+    responses = conversational.run_chatbot_batch(_items("q a", "q b"))
+
+    assert responses == ["answer a", "answer b"]
+    assert len(fake_agent.messages) == 2
+    assert fake_agent.messages[1] == "q a"
+    assert cache.get("vid", "q b") == "answer b"
+    print("✅ Partially tagged batch reply handled")
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as mp:
+        test_split_batched_answers(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_untagged_batch_reply_is_asked_again(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_partially_tagged_batch_reply(mp)
+    print("\n🎉 All tests passed!")
@@ -13,8 +13,8 @@ from models.pydantic_models import VideoSegment, VideoSegmentation
 def test_coverage_detection():
     """Test that incomplete coverage is properly detected."""
     
-    # Use test database
-    db = VideoDatabase("test_coverage.db")
+    # Use an in-memory test database
+    db = VideoDatabase(":memory:")
     
     print("Testing coverage-based detection...\n")
     
@@ -98,6 +98,7 @@ def test_coverage_detection():
     is_complete = _verify_segmentation_coverage(cached_complete, "coverage_test", db)
     
     assert is_complete, "Should detect as complete (100% covered)"
+    assert db.get_segmentation("coverage_test")["verified_at"] is not None, "Complete segmentation not marked verified"
     print("✅ Correctly detected as complete\n")
     
     # Test Case 3: Borderline case (96% coverage)
@@ -143,7 +144,6 @@ def test_coverage_detection():
     
     # Cleanup
     db.close()
-    os.remove("test_coverage.db")
     print("✅ Cleanup complete")
     
     print("\n🎉 Coverage detection works correctly!")
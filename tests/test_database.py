@@ -6,15 +6,15 @@ import os
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models import VideoDatabase
+from models import VideoDatabase, CachedVideoDatabase
 from models.pydantic_models import VideoSegment, VideoSegmentation
 
 
 def test_database():
     """Test basic database operations."""
     
-    # Use test database
-    db = VideoDatabase("test_videos.db")
+    # Use an in-memory test database
+    db = VideoDatabase(":memory:")
     
     print("✅ Database created")
     
@@ -42,6 +42,9 @@ def test_database():
     assert video["video_id"] == "test123"
     assert video["title"] == "Test Video"
     assert len(video["transcript"]) == 3
+    assert video["full_text"] == "Hello world This is a test Testing database"
+    assert db.get_video_duration("test123") == 7
+    assert db.get_video_duration("missing") is None
     print("✅ Video retrieved")
     
     # Test saving segmentation
@@ -80,6 +83,7 @@ def test_database():
     assert saved_seg is not None, "Failed to retrieve segmentation"
     assert saved_seg["overall_topic"] == "Database Testing"
     assert saved_seg["total_segments"] == 2
+    assert saved_seg["last_segment_end"] == max(seg.end_time for seg in segments)
     print("✅ Segmentation retrieved")
     
     # Test time-based query
@@ -91,11 +95,52 @@ def test_database():
     results = db.search_segments("test123", "database")
     assert len(results) == 1, "Search failed"
     assert "database" in results[0]["key_topics"]
+    assert len(db.search_segments("test123", "main cont")) == 1, "Prefix search failed"
+    assert db.search_segments("test123", 'intro" OR "main') == [], "Query operators not escaped"
+    assert [s["title"] for s in db.search_segments_by_topic("test123", "Database")] == ["Main Content"]
+    assert db.search_segments_by_topic("test123", "data") == [], "Topic lookup matched a substring"
     print("✅ Search works")
     
+    # Test prefetching video and latest segmentation together
+    bundle = db.prefetch_video_bundle("test123")
+    assert bundle is not None, "Prefetch failed"
+    assert bundle["video"]["title"] == "Test Video"
+    assert bundle["segmentation"]["id"] == seg_id
+    assert bundle["segmentation"]["segmentation"]["overall_topic"] == "Database Testing"
+    assert db.prefetch_video_bundle("missing") is None
+    print("✅ Prefetch bundle works")
+    
+    # Test cached reads and invalidation on write
+    cached_db = CachedVideoDatabase(db)
+    assert cached_db.get_video("test123") is cached_db.get_video("test123"), "Video not cached"
+    assert cached_db.get_segmentation("test123") is cached_db.get_segmentation("test123"), "Segmentation not cached"
+    assert cached_db.search_segments("test123", "database") is cached_db.search_segments("test123", "database"), "Search not cached"
+    assert cached_db.get_video("later") is None
+    db.save_video("later", snippets, "Saved Later")
+    assert cached_db.get_video("later") is not None, "Miss was cached"
+    cached_db.save_video("test123", snippets, "Renamed Video")
+    assert cached_db.get_video("test123")["title"] == "Renamed Video", "Cache not cleared on write"
+    assert cached_db.update_title("test123", "Retitled Video"), "Failed to update title"
+    assert cached_db.get_video("test123")["title"] == "Retitled Video", "Cache not cleared on title update"
+    assert len(cached_db.get_video("test123")["transcript"]) == 3, "Title update touched the transcript"
+    assert not db.update_title("missing", "Title")
+    print("✅ Cached database works")
+    
+    # Test saving several videos in one transaction
+    assert db.save_videos([("bulk1", snippets, "Bulk One"), ("bulk2", snippets[:1], None)]), "Bulk save failed"
+    assert db.get_video("bulk1")["title"] == "Bulk One"
+    assert db.get_video("bulk2")["snippet_count"] == 1
+    print("✅ Bulk save works")
+    
+    # Test per-chunk results keyed by content hash
+    assert db.get_chunk_result("chunk-key") is None
+    assert db.save_chunk_result("test123", 1, "chunk-key", segmentation), "Failed to save chunk result"
+    saved_chunk = db.get_chunk_result("chunk-key")
+    assert VideoSegmentation.model_validate(saved_chunk) == segmentation, "Chunk result round-trip failed"
+    print("✅ Chunk results work")
+    
     # Cleanup
     db.close()
-    os.remove("test_videos.db")
     print("✅ Cleanup complete")
     
     print("\n🎉 All tests passed!")
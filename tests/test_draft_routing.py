@@ -0,0 +1,92 @@
+"""
+Test which chatbot turns are offered to the small draft model.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from types import SimpleNamespace
+import pytest
+
+
+def _load_conversational(monkeypatch):
+    """Import the chatbot module (its models need some API key, never used here)."""
+    if not os.getenv("GROQ_API_KEY"):
+        monkeypatch.setenv("GROQ_API_KEY", "test")
+    from agent.chatbot import conversational
+    return conversational
+
+
+@pytest.mark.parametrize("message", [
+    "hi",
+    "Hello!",
+    "  hey there  ",
+    "Thanks so much!!",
+    "thank you",
+    "ok",
+    "Got it.",
+    "Good morning",
+    "bye",
+    "Who are you?",
+    "what can you do",
+])
+def test_small_talk(monkeypatch, message):
+    """Greetings, thanks and questions about the assistant are small talk."""
+    assert _load_conversational(monkeypatch)._is_small_talk(message)
+
+
+@pytest.mark.parametrize("message", [
+    "",
+    "hi, what is this video about?",
+    "thanks, can you explain backpropagation?",
+    "What happens at 3:10?",
+    "Summarize the video",
+    "ok so what is a transformer",
+    "history",
+    "okay then explain attention",
+])
+def test_not_small_talk(monkeypatch, message):
+    """Anything that may be about the video goes to the agent."""
+    assert not _load_conversational(monkeypatch)._is_small_talk(message)
+
+
+class FakeModel:
+    """Model stand-in answering every call with the same reply, counting the calls."""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def invoke(self, payload):
+        self.calls += 1
+        message = SimpleNamespace(content=self.content, tool_calls=[])
+        return {"messages": [message]} if isinstance(payload, dict) else message
+
+
+def test_draft_routing(monkeypatch):
+    """Only small-talk turns reach the draft model, which is created on first use."""
+    conversational = _load_conversational(monkeypatch)
+    from agent.chatbot.semantic_cache import SemanticCache
+    from src.config import get_draft_model
+
+    assert get_draft_model.cache_info().currsize == 0, "Draft model created at import"
+
+    draft, agent = FakeModel("Hello! Ask me about the video."), FakeModel("The agent's answer.")
+    cache = SemanticCache()
+    monkeypatch.setattr(conversational, "_get_draft_llm", lambda: draft)
+    monkeypatch.setattr(conversational, "agent", agent)
+    monkeypatch.setattr(conversational, "get_semantic_cache", lambda: cache)
+    monkeypatch.setattr(conversational, "_format_messages", lambda video_id, title, message, history=None: [message])
+
+    item = {"video_id": "vid", "video_title": "Title"}
+    assert conversational.run_chatbot(**item, user_message="Hi!") == "Hello! Ask me about the video."
+    assert (draft.calls, agent.calls) == (1, 0)
+
+    assert conversational.run_chatbot(**item, user_message="What is this video about?") == "The agent's answer."
+    assert (draft.calls, agent.calls) == (1, 1)
+    print("✅ Only small talk is drafted")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
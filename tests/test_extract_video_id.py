@@ -0,0 +1,45 @@
+"""
+Test extracting video IDs from YouTube URLs.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from helpers import extract_video_id
+
+VIDEO_ID = "i_LwzRVP7bg"
+
+
+@pytest.mark.parametrize("video_url", [
+    f"https://www.youtube.com/watch?v={VIDEO_ID}",
+    f"https://www.youtube.com/watch?feature=share&v={VIDEO_ID}&t=42s",
+    f"https://youtu.be/{VIDEO_ID}",
+    f"https://youtu.be/{VIDEO_ID}?t=10",
+    f"https://www.youtube.com/embed/{VIDEO_ID}",
+    f"https://www.youtube.com/shorts/{VIDEO_ID}",
+    f"https://www.youtube.com/live/{VIDEO_ID}?si=abc",
+    f"https://www.youtube.com/v/{VIDEO_ID}",
+    f"http://youtube.com/v/{VIDEO_ID}?version=3",
+    VIDEO_ID,
+])
+def test_extract_video_id(video_url):
+    """Every supported URL form gives the video ID."""
+    assert extract_video_id(video_url) == VIDEO_ID
+
+
+@pytest.mark.parametrize("video_url", [
+    "",
+    None,
+    "https://www.youtube.com/",
+    "https://www.youtube.com/watch?v=tooshort",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}xyz",
+])
+def test_extract_video_id_invalid(video_url):
+    """URLs without a video ID give None."""
+    assert extract_video_id(video_url) is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
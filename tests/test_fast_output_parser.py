@@ -0,0 +1,66 @@
+"""
+Test the single-pass Pydantic output parser used by the segmentation chains.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import pytest
+from langchain_core.exceptions import OutputParserException
+from agent.video_segmenter.fast_output_parser import FastPydanticOutputParser
+from models.pydantic_models import VideoSegmentation
+
+PARSER = FastPydanticOutputParser(pydantic_object=VideoSegmentation)
+
+ANSWER = json.dumps({
+    "video_id": "vid",
+    "total_segments": 1,
+    "overall_topic": "Testing",
+    "segments": [{
+        "title": "Intro",
+        "start_time": 0,
+        "end_time": 30,
+        "summary": "The introduction.",
+        "key_topics": ["intro"],
+        "difficulty_level": "easy"
+    }]
+})
+
+
+def test_valid_json():
+    """Plain JSON is parsed into the model."""
+    result = PARSER.parse(ANSWER)
+    assert isinstance(result, VideoSegmentation)
+    assert result.segments[0].title == "Intro"
+    print("✅ Valid JSON parsed")
+
+
+def test_fenced_json():
+    """JSON inside a Markdown code fence is parsed too."""
+    assert PARSER.parse(f"```json\n{ANSWER}\n```") == PARSER.parse(ANSWER)
+    assert PARSER.parse(f"```\n{ANSWER}\n```") == PARSER.parse(ANSWER)
+    print("✅ Fenced JSON parsed")
+
+
+def test_fenced_json_with_prose():
+    """Text around a fenced answer goes through the regular parser."""
+    text = f"Here is the segmentation:\n```json\n{ANSWER}\n```\nHope this helps!"
+    assert PARSER.parse(text) == PARSER.parse(ANSWER)
+    print("✅ Fenced JSON surrounded by prose parsed")
+
+
+@pytest.mark.parametrize("text", [
+    "not json at all",
+    '{"video_id": "vid"}',
+    ANSWER.replace('"total_segments": 1', '"total_segments": "many"'),
+])
+def test_invalid_output_raises(text):
+    """Unparseable answers, or ones the model rejects, raise OutputParserException."""
+    with pytest.raises(OutputParserException):
+        PARSER.parse(text)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
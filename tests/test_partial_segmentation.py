@@ -13,8 +13,8 @@ from models.pydantic_models import VideoSegment, VideoSegmentation
 def test_partial_segmentation():
     """Test that partial segmentations are correctly flagged and handled."""
     
-    # Use test database
-    db = VideoDatabase("test_partial.db")
+    # Use an in-memory test database (nothing here needs durability)
+    db = VideoDatabase(":memory:")
     
     print("Testing partial segmentation handling...")
     
@@ -92,8 +92,7 @@ def test_partial_segmentation():
     cursor.execute("SELECT id, processing_status, chunks_processed, total_chunks FROM segmentations WHERE video_id = ?", ("test_partial",))
     rows = cursor.fetchall()
     print(f"\nDEBUG: All segmentations for test_partial:")
-    for row in rows:
-        print(f"  ID {row[0]}: status={row[1]}, chunks={row[2]}/{row[3]}")
+    print("\n".join(f"  ID {row[0]}: status={row[1]}, chunks={row[2]}/{row[3]}" for row in rows))
     
     # Retrieve latest (should be complete)
     latest = db.get_segmentation("test_partial", latest=True)
@@ -109,7 +108,6 @@ def test_partial_segmentation():
     
     # Cleanup
     db.close()
-    os.remove("test_partial.db")
     print("✅ Cleanup complete")
     
     print("\n🎉 Partial segmentation handling works correctly!")
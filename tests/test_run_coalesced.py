@@ -0,0 +1,85 @@
+"""
+Test coalescing concurrent identical calls.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import pytest
+from helpers import run_coalesced
+
+
+def test_concurrent_calls_share_one_call():
+    """Concurrent callers with the same key share one call and its result."""
+    calls = []
+
+    async def fetch(name):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        return f"result of {name}"
+
+    async def main():
+        results = await asyncio.gather(
+            run_coalesced(("fetch", "a"), lambda: fetch("a")),
+            run_coalesced(("fetch", "a"), lambda: fetch("a")),
+            run_coalesced(("fetch", "b"), lambda: fetch("b")),
+        )
+        # The call finished, so the next caller starts a new one
+        again = await run_coalesced(("fetch", "a"), lambda: fetch("a"))
+        return results, again
+
+    results, again = asyncio.run(main())
+    assert results == ["result of a", "result of a", "result of b"]
+    assert again == "result of a"
+    assert calls == ["a", "b", "a"]
+    print("✅ Concurrent identical calls coalesced")
+
+
+def test_exception_reaches_every_caller():
+    """An exception from the shared call is raised in every waiting caller."""
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            *[run_coalesced("failing", fail) for _ in range(3)],
+            return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) and str(result) == "boom" for result in results)
+    print("✅ Exception delivered to every caller")
+
+
+def test_cancelled_caller_keeps_call_running():
+    """Cancelling one caller doesn't cancel the call for the others."""
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(run_coalesced("slow", slow))
+        second = asyncio.ensure_future(run_coalesced("slow", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+    print("✅ Cancelled caller doesn't cancel the shared call")
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_call()
+    test_exception_reaches_every_caller()
+    test_cancelled_caller_keeps_call_running()
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,177 @@
+"""
+Test chunked segmentation of long videos with stubbed LLM chains.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from types import SimpleNamespace
+import groq
+import httpx
+import pytest
+from models.pydantic_models import VideoSegmentation
+
+import agent.video_segmenter.segment_long_video  # noqa: F401 (module is shadowed by its function below)
+from agent.video_segmenter.cache import clear_segmentation_cache, lookup
+
+segment_long_video = sys.modules["agent.video_segmenter.segment_long_video"]
+
+# 400s of transcript: with 200s chunks and 20s overlap, that's 3 chunks
+SNIPPETS = [SimpleNamespace(text=f"Sentence {i}", start=i * 10, duration=10) for i in range(40)]
+CHUNK_OPTIONS = {"chunk_duration": 200, "overlap_duration": 20, "chunks_per_call": 2}
+
+
+def _segmentation(video_id: str) -> VideoSegmentation:
+    return VideoSegmentation(video_id=video_id, segments=[], total_segments=0, overall_topic=f"Topic of {video_id}")
+
+
+class FakeChain:
+    """Single-chunk chain answering every chunk, counting the calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def ainvoke(self, payload):
+        self.calls.append(payload["video_id"])
+        return _segmentation(payload["video_id"])
+
+
+class FakeBatchedChain:
+    """Batched chain that raises the given error, or answers every chunk."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    async def ainvoke(self, payload):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(segmentations=[_segmentation(f"part {i}") for i in range(payload["count"])])
+
+
+def _use_chains(monkeypatch, chain, batched_chain):
+    monkeypatch.setattr(segment_long_video, "create_segmentation_chain", lambda api_key=None: chain)
+    monkeypatch.setattr(segment_long_video, "create_batched_segmentation_chain", lambda api_key=None: batched_chain)
+    monkeypatch.setattr(segment_long_video, "format_chunk_batch", lambda inputs: {"count": len(inputs)})
+    clear_segmentation_cache()
+
+
+def test_failed_batch_falls_back_per_chunk(monkeypatch):
+    """A batched call failing with a non-rate-limit error retries its chunks one by one."""
+    chain, batched_chain = FakeChain(), FakeBatchedChain(ValueError("bad chunk"))
+    _use_chains(monkeypatch, chain, batched_chain)
+
+    _, stats = asyncio.run(segment_long_video.segment_long_video_with_stats("fallback", SNIPPETS, **CHUNK_OPTIONS))
+
+    assert batched_chain.calls == 1
+    assert sorted(chain.calls) == ["fallback (part 1)", "fallback (part 2)", "fallback (part 3)"]
+    assert stats.chunks_processed == stats.total_chunks == 3
+    assert not stats.rate_limited
+    print("✅ Failed batch retried chunk by chunk")
+
+
+def test_batched_results_cached_separately(monkeypatch):
+    """Results of the batched prompt aren't reused by one-by-one runs."""
+    chain, batched_chain = FakeChain(), FakeBatchedChain()
+    _use_chains(monkeypatch, chain, batched_chain)
+
+    # Chunks 1 and 2 share a call, chunk 3 is sent alone
+    asyncio.run(segment_long_video.segment_long_video_with_stats("batched", SNIPPETS, **CHUNK_OPTIONS))
+    assert batched_chain.calls == 1
+    assert chain.calls == ["batched (part 3)"]
+
+    _, chunk_inputs, _ = segment_long_video._prepare_chunks("batched", SNIPPETS, 400, 200, 20)
+    assert lookup(chunk_inputs[0], segment_long_video.BATCHED_KEY_FIELDS) is not None
+    assert lookup(chunk_inputs[0]) is None, "Batched result reused under the single-chunk key"
+
+    # An unbatched run asks the single-chunk chain again
+    asyncio.run(segment_long_video.segment_long_video_with_stats(
+        "batched", SNIPPETS, chunk_duration=200, overlap_duration=20, chunks_per_call=1
+    ))
+    assert sorted(chain.calls[1:]) == ["batched (part 1)", "batched (part 2)"], "Unbatched run reused batched results"
+    print("✅ Batched results cached under their own key")
+
+
+def _http_error(status_code: int, headers: dict = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status_code}", request=request, response=response)
+
+
+def _groq_rate_limit(headers: dict = None) -> groq.RateLimitError:
+    response = _http_error(429, headers).response
+    return groq.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_rate_limit_errors():
+    """Only groq.RateLimitError and HTTP 429 count as rate limits."""
+    is_rate_limit = segment_long_video._is_rate_limit_error
+
+    assert is_rate_limit(_groq_rate_limit())
+    assert is_rate_limit(_http_error(429))
+    assert is_rate_limit(SimpleNamespace(status_code=429))
+    assert not is_rate_limit(_http_error(500))
+    assert not is_rate_limit(ValueError("rate limit exceeded"))
+    assert not is_rate_limit(RuntimeError("context length limit reached"))
+    print("✅ Rate limit errors classified")
+
+
+def _run_retries(monkeypatch, errors: list):
+    """Run _retry_rate_limited on a call raising errors in turn, returning (result, calls, delays)."""
+    delays = []
+    calls = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    async def call():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "done"
+
+    monkeypatch.setattr(segment_long_video.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(segment_long_video.random, "uniform", lambda a, b: 0)
+    result = asyncio.run(segment_long_video._retry_rate_limited(call))
+    return result, len(calls), delays
+
+
+def test_rate_limit_retries(monkeypatch):
+    """Rate-limited calls back off exponentially, honour Retry-After, and give up eventually."""
+    retries = segment_long_video.RATE_LIMIT_RETRIES
+
+    # Exponential backoff, capped at RATE_LIMIT_MAX_DELAY
+    result, calls, delays = _run_retries(monkeypatch, [_groq_rate_limit()] * 3)
+    assert (result, calls) == ("done", 4)
+    assert delays == [1.0, 2.0, 4.0]
+
+    with pytest.raises(groq.RateLimitError):
+        _run_retries(monkeypatch, [_groq_rate_limit()] * retries)
+    _, _, delays = _run_retries(monkeypatch, [_http_error(429)] * (retries - 1))
+    assert len(delays) == retries - 1
+    assert max(delays) <= segment_long_video.RATE_LIMIT_MAX_DELAY
+
+    # Retry-After header wins over the backoff
+    _, _, delays = _run_retries(monkeypatch, [_groq_rate_limit({"retry-after": "7"})])
+    assert delays == [7.0]
+
+    # Other errors are raised at once
+    with pytest.raises(ValueError):
+        _run_retries(monkeypatch, [ValueError("rate limit exceeded")])
+    with pytest.raises(httpx.HTTPStatusError):
+        _run_retries(monkeypatch, [_http_error(500)])
+    print("✅ Rate limit retries and backoff")
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as mp:
+        test_failed_batch_falls_back_per_chunk(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_batched_results_cached_separately(mp)
+    test_rate_limit_errors()
+    with pytest.MonkeyPatch.context() as mp:
+        test_rate_limit_retries(mp)
+    print("\n🎉 All tests passed!")
@@ -0,0 +1,106 @@
+"""
+Test sharing LLM calls between concurrent short-video segmentations.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from types import SimpleNamespace
+import pytest
+from models.pydantic_models import VideoSegmentation
+
+import agent.video_segmenter.segment_video_batched  # noqa: F401 (module is shadowed by its function below)
+from agent.video_segmenter.cache import clear_segmentation_cache
+
+segment_video_batched = sys.modules["agent.video_segmenter.segment_video_batched"]
+
+
+def _segmentation(video_id: str, topic: str) -> VideoSegmentation:
+    return VideoSegmentation(video_id=video_id, segments=[], total_segments=0, overall_topic=topic)
+
+
+class FakeChain:
+    """Single-video chain, counting the videos it was asked about."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def ainvoke(self, payload):
+        self.calls.append(payload["video_id"])
+        return _segmentation(payload["video_id"], "single")
+
+
+class FakeBatchedChain:
+    """Batched chain answering with results for the given video IDs, in that order."""
+
+    def __init__(self, video_ids):
+        self.video_ids = video_ids
+
+    async def ainvoke(self, payload):
+        return SimpleNamespace(segmentations=[_segmentation(video_id, "batched") for video_id in self.video_ids])
+
+
+def _use_chains(monkeypatch, returned_ids):
+    chain = FakeChain()
+    monkeypatch.setattr(segment_video_batched, "create_segmentation_chain", lambda api_key=None: chain)
+    monkeypatch.setattr(segment_video_batched, "create_batched_segmentation_chain", lambda api_key=None: FakeBatchedChain(returned_ids))
+    monkeypatch.setattr(segment_video_batched, "format_chunk_batch", lambda payloads: payloads)
+    clear_segmentation_cache()
+    return chain
+
+
+def _payloads(*video_ids):
+    return [{"video_id": video_id, "transcript": f"[00:00] Transcript of {video_id}"} for video_id in video_ids]
+
+
+def test_results_out_of_order(monkeypatch):
+    """Results returned in another order still go to the right requests."""
+    chain = _use_chains(monkeypatch, ["c", "a", "b"])
+
+    results = asyncio.run(segment_video_batched._segment_payloads(None, _payloads("a", "b", "c")))
+
+    assert [result.video_id for result in results] == ["a", "b", "c"]
+    assert all(result.overall_topic == "batched" for result in results)
+    assert chain.calls == []
+    print("✅ Out-of-order results matched by video ID")
+
+
+def test_missing_results_retried(monkeypatch):
+    """Videos left out of the batched answer are segmented one by one."""
+    chain = _use_chains(monkeypatch, ["c", "a", "unknown"])
+
+    results = asyncio.run(segment_video_batched._segment_payloads(None, _payloads("a", "b", "c")))
+
+    assert [result.video_id for result in results] == ["a", "b", "c"]
+    assert [result.overall_topic for result in results] == ["batched", "single", "batched"]
+    assert chain.calls == ["b"]
+    print("✅ Missing results retried one by one")
+
+
+def test_concurrent_requests_share_a_call(monkeypatch):
+    """Requests arriving together are answered from one batched call."""
+    chain = _use_chains(monkeypatch, ["y", "x"])
+    snippets = [SimpleNamespace(text="Hello", start=0, duration=1)]
+
+    async def main():
+        return await asyncio.gather(
+            segment_video_batched.segment_video_batched("x", snippets),
+            segment_video_batched.segment_video_batched("y", snippets),
+        )
+
+    results = asyncio.run(main())
+    assert [result.video_id for result in results] == ["x", "y"]
+    assert chain.calls == []
+    print("✅ Concurrent requests share one call")
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as mp:
+        test_results_out_of_order(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_missing_results_retried(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_concurrent_requests_share_a_call(mp)
+    print("\n🎉 All tests passed!")
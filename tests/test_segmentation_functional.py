@@ -2,35 +2,56 @@
 Test script for functional LCEL-style video segmentation.
 """
 
-from agent import (
-    segment_video,
-    create_segmentation_chain,
-    prepare_segmentation_input
-)
-
+# agent (LangChain) is imported inside the functions that use it, so
+# collecting the tests doesn't pay for loading the segmentation stack
+from collections import namedtuple
+from functools import lru_cache
+import pytest
 from helpers import extract_video_id, format_duration, format_timestamp,getTranscript
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Example video used by every test in this module
+VIDEO_URL = "https://www.youtube.com/watch?v=i_LwzRVP7bg"
+
+VideoSetup = namedtuple("VideoSetup", ["video_id", "transcript", "chain"])
+
+
+@lru_cache(maxsize=1)
+def _get_chain():
+    """Segmentation chain shared by the tests in this module."""
+    from agent import create_segmentation_chain
+    return create_segmentation_chain()
+
+
+def _load_video_setup() -> VideoSetup:
+    """Extract the example video's ID, fetch its transcript and build the chain."""
+    video_id = extract_video_id(VIDEO_URL)
+    return VideoSetup(video_id, getTranscript(video_id), _get_chain())
+
 
-def test_functional_segmentation():
+@pytest.fixture(scope="module")
+def video_setup():
+    """Example video setup, done once for the whole module."""
+    return _load_video_setup()
+
+
+def test_functional_segmentation(video_setup):
     """Test functional segment_video() approach."""
+    from agent import segment_video
     
     print("=" * 60)
     print("FUNCTIONAL LCEL SEGMENTATION TEST")
     print("=" * 60)
     
-    # Example video
-    video_url = "https://www.youtube.com/watch?v=i_LwzRVP7bg"
-    video_id = extract_video_id(video_url)
+    video_id = video_setup.video_id
     
-    print(f"\nVideo URL: {video_url}")
+    print(f"\nVideo URL: {VIDEO_URL}")
     print(f"Video ID: {video_id}\n")
     
-    # Get transcript
-    print("Fetching transcript...")
-    transcript = getTranscript(video_id)
+    # Transcript was fetched once for the module
+    transcript = video_setup.transcript
     
     if not transcript:
         print("❌ No transcript available")
@@ -77,24 +98,17 @@ def test_functional_segmentation():
     return result
 
 
-def test_chain_directly():
+def test_chain_directly(video_setup):
     """Test by creating and using the chain directly (more LCEL-style)."""
+    from agent import prepare_segmentation_input
     
     print("\n\n" + "=" * 60)
     print("DIRECT CHAIN TEST (Pure LCEL)")
     print("=" * 60)
     
-    video_url = "https://www.youtube.com/watch?v=i_LwzRVP7bg"
-    video_id = extract_video_id(video_url)
+    video_id, transcript, chain = video_setup
     
     print(f"\nVideo ID: {video_id}")
-    
-    # Get transcript
-    transcript = getTranscript(video_id)
-    
-    # Create chain once
-    print("\nCreating LCEL chain...")
-    chain = create_segmentation_chain()
     print("✓ Chain created")
     
     # Prepare input
@@ -115,22 +129,18 @@ def test_chain_directly():
     return result
 
 
-def test_chain_reuse():
+def test_chain_reuse(video_setup):
     """Test reusing the same chain multiple times (efficient pattern)."""
+    from agent import prepare_segmentation_input
     
     print("\n\n" + "=" * 60)
     print("CHAIN REUSE TEST")
     print("=" * 60)
     
-    # Create chain once (can be reused across requests)
-    print("\nCreating chain...")
-    chain = create_segmentation_chain()
+    # Chain was created once for the module (can be reused across requests)
+    video_id, transcript, chain = video_setup
     print("✓ Chain created (this chain can be reused)")
     
-    video_url = "https://www.youtube.com/watch?v=i_LwzRVP7bg"
-    video_id = extract_video_id(video_url)
-    transcript = getTranscript(video_id)
-    
     # Use the same chain multiple times
     print("\nInvoking chain (1st time)...")
     input_data = prepare_segmentation_input(video_id, transcript.snippets)
@@ -147,14 +157,17 @@ def test_chain_reuse():
 if __name__ == "__main__":
     print("\n🎯 FUNCTIONAL LCEL VIDEO SEGMENTATION TESTS\n")
     
+    # Fetch the transcript and build the chain once for all tests
+    setup = _load_video_setup()
+    
     # Test 1: Simple functional approach
-    test_functional_segmentation()
+    test_functional_segmentation(setup)
     
     # Test 2: Direct chain usage
-    test_chain_directly()
+    test_chain_directly(setup)
     
     # Test 3: Chain reuse pattern
-    test_chain_reuse()
+    test_chain_reuse(setup)
     
     print("\n" + "=" * 60)
     print("✅ All functional tests completed!")
@@ -0,0 +1,167 @@
+"""
+Test background segmentation jobs for long videos.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from models import VideoDatabase
+from models.pydantic_models import ProcessingStats, VideoSegment, VideoSegmentation
+
+VIDEO_ID = "longvideo01"
+
+# Two hours of transcript, so /segment hands the video to a background job
+SNIPPETS = [SimpleNamespace(text=f"Sentence {i}", start=i * 60, duration=60) for i in range(120)]
+
+
+def _load_segmentation_endpoints(monkeypatch):
+    """Import the segmentation endpoints (the chatbot models need some API key, never used here)."""
+    if not os.getenv("GROQ_API_KEY"):
+        monkeypatch.setenv("GROQ_API_KEY", "test")
+    from endpoints import segmentation
+    return segmentation
+
+
+def test_rate_limit_on_first_chunk(monkeypatch):
+    """A job rate limited before any chunk finished is saved as partial, not complete."""
+    segmentation = _load_segmentation_endpoints(monkeypatch)
+
+    async def rate_limited_at_first_chunk(video_id, transcript_snippets, **kwargs):
+        result = VideoSegmentation(
+            video_id=video_id,
+            segments=[],
+            total_segments=0,
+            overall_topic="Long video content [Partial: 0/3 chunks processed up to 00:00]"
+        )
+        return result, ProcessingStats(chunks_processed=0, total_chunks=3, rate_limited=True)
+
+    monkeypatch.setattr(segmentation, "segment_long_video_with_stats", rate_limited_at_first_chunk)
+
+    db = VideoDatabase(":memory:")
+    job = {"job_id": "job", "video_id": "long_video", "status": "queued", "error": None}
+    asyncio.run(segmentation._run_long_video_job(job, [], db))
+
+    saved = db.get_segmentation("long_video")
+    assert saved is not None, "Partial segmentation not saved"
+    assert saved["processing_status"] == "partial", f"Expected 'partial', got '{saved['processing_status']}'"
+    assert saved["chunks_processed"] == 0
+    assert saved["total_chunks"] == 3
+    assert job["status"] != "failed"
+    db.close()
+    print("✅ Rate limit on the first chunk saved as partial")
+
+
+class StubSegmenter:
+    """segment_long_video_with_stats stand-in that waits for release(), then answers or fails."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+        self._released = threading.Event()
+
+    def release(self):
+        self._released.set()
+
+    async def __call__(self, video_id, transcript_snippets, **kwargs):
+        self.calls += 1
+        await asyncio.to_thread(self._released.wait, 5)
+        if self.error is not None:
+            raise self.error
+        segment = VideoSegment(title="Everything", start_time=0, end_time=7200, summary="The whole video.", key_topics=["all"])
+        result = VideoSegmentation(video_id=video_id, segments=[segment], total_segments=1, overall_topic="Long video")
+        return result, ProcessingStats(chunks_processed=2, total_chunks=2)
+
+
+def _app(monkeypatch, segmenter) -> FastAPI:
+    """Segmentation router with stubbed transcript, title and segmenter, and an in-memory database."""
+    segmentation = _load_segmentation_endpoints(monkeypatch)
+    db = VideoDatabase(":memory:")
+    monkeypatch.setattr(segmentation, "get_db", lambda: db)
+    monkeypatch.setattr(segmentation, "getTranscript", lambda video_id: SNIPPETS)
+    monkeypatch.setattr(segmentation, "get_video_title", lambda video_id: "Long Video")
+    monkeypatch.setattr(segmentation, "segment_long_video_with_stats", segmenter)
+    monkeypatch.setattr(segmentation, "_jobs", {})
+
+    app = FastAPI()
+    app.include_router(segmentation.router)
+    return app
+
+
+def _wait_for_status(client: TestClient, expected: str) -> dict:
+    """Poll /segment/status until it reports the expected status."""
+    for _ in range(200):
+        status = client.get("/segment/status", params={"video_url": VIDEO_ID})
+        if status.status_code == 200 and status.json()["status"] == expected:
+            return status.json()
+        time.sleep(0.01)
+    raise AssertionError(f"Status never became {expected!r}, last: {status.status_code} {status.text}")
+
+
+def test_job_lifecycle(monkeypatch):
+    """A long video is queued, polled, deduplicated and finally served from the database."""
+    segmenter = StubSegmenter()
+    with TestClient(_app(monkeypatch, segmenter)) as client:
+        response = client.get("/segment", params={"video_url": VIDEO_ID})
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] in ("queued", "running")
+        assert job["status_url"] == f"/segment/status?video_url={VIDEO_ID}"
+
+        status = _wait_for_status(client, "running")
+        assert status["job_id"] == job["job_id"]
+
+        # A second submit while the job runs joins it instead of starting another
+        again = client.get("/segment", params={"video_url": VIDEO_ID})
+        assert again.status_code == 202
+        assert again.json()["job_id"] == job["job_id"]
+        assert segmenter.calls == 1
+
+        segmenter.release()
+        status = _wait_for_status(client, "complete")
+        assert status["is_actually_complete"]
+
+        done = client.get("/segment", params={"video_url": VIDEO_ID})
+        assert done.status_code == 200
+        assert done.json()["segments"][0]["title"] == "Everything"
+        assert segmenter.calls == 1
+    print("✅ Job queued, polled, deduplicated and served")
+
+
+def test_failed_job(monkeypatch):
+    """A failed job reports its error and is replaced by a new job on the next submit."""
+    segmenter = StubSegmenter(RuntimeError("LLM unavailable"))
+    segmenter.release()
+    with TestClient(_app(monkeypatch, segmenter)) as client:
+        first = client.get("/segment", params={"video_url": VIDEO_ID}).json()
+
+        status = _wait_for_status(client, "failed")
+        assert status["job_id"] == first["job_id"]
+        assert "LLM unavailable" in status["message"]
+
+        # Retrying starts a fresh job, which clears the failure once it succeeds
+        segmenter.error = None
+        retry = client.get("/segment", params={"video_url": VIDEO_ID})
+        assert retry.status_code == 202
+        assert retry.json()["job_id"] != first["job_id"]
+
+        _wait_for_status(client, "complete")
+        assert segmenter.calls == 2
+    print("✅ Failed job reported and retried")
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as mp:
+        test_rate_limit_on_first_chunk(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_job_lifecycle(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_failed_job(mp)
+    print("\n🎉 All tests passed!")
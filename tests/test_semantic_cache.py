@@ -0,0 +1,75 @@
+"""
+Test the semantic cache of chatbot answers.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+from agent.chatbot.semantic_cache import SemanticCache
+
+
+class DigitBlindCache(SemanticCache):
+    """Cache whose keys ignore digits, like embeddings that barely see them."""
+
+    def _embed(self, text):
+        return re.sub(r"[\d:]", "", text.lower()).strip()
+
+    def _similarity(self, a, b):
+        return 1.0 if a == b else 0.0
+
+
+def test_semantic_cache():
+    """Test hits, misses, expiry and clearing."""
+    cache = SemanticCache()
+
+    # Hit on the same question (punctuation and case don't matter)
+    cache.set("vid", "What is a transformer?", "A model.")
+    assert cache.get("vid", "what is a transformer") == "A model."
+    print("✅ Hit")
+
+    # Miss on another question or another video
+    assert cache.get("vid", "What is attention?") is None
+    assert cache.get("other", "What is a transformer?") is None
+    print("✅ Miss")
+
+    # Empty answers are not stored
+    cache.set("vid", "Say nothing", "")
+    cache.set("vid", "Say nothing either", "  ")
+    assert cache.get("vid", "Say nothing") is None
+    assert cache.get("vid", "Say nothing either") is None
+    print("✅ Empty answers skipped")
+
+    # Expired answers are dropped
+    expiring = SemanticCache(ttl_seconds=0)
+    expiring.set("vid", "What is a transformer?", "A model.")
+    assert expiring.get("vid", "What is a transformer?") is None
+    print("✅ TTL")
+
+    # Clearing one video keeps the others
+    cache.set("other", "What is a transformer?", "Another model.")
+    cache.clear("vid")
+    assert cache.get("vid", "What is a transformer?") is None
+    assert cache.get("other", "What is a transformer?") == "Another model."
+    cache.clear()
+    assert cache.get("other", "What is a transformer?") is None
+    print("✅ Clear")
+
+
+def test_numbers_must_match():
+    """Questions differing only in a number or timestamp don't share answers."""
+    cache = DigitBlindCache()
+    cache.set("vid", "What happens at 3:10?", "The intro ends.")
+
+    assert cache.get("vid", "What happens at 3:10?") == "The intro ends."
+    assert cache.get("vid", "What happens at 13:10?") is None
+    assert cache.get("vid", "What happens at 3:11?") is None
+    assert cache.get("vid", "What happens at?") is None
+    print("✅ Numbers and timestamps must match")
+
+
+if __name__ == "__main__":
+    test_semantic_cache()
+    test_numbers_must_match()
+    print("\n🎉 All tests passed!")
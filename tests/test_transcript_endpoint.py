@@ -0,0 +1,88 @@
+"""
+Test HTTP caching of the transcript endpoint.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from models import VideoDatabase
+
+VIDEO_ID = "abcdefghijk"
+
+
+def _load_transcript_endpoints(monkeypatch):
+    """Import the transcript endpoints (the endpoints package loads the chatbot, whose models need some API key)."""
+    if not os.getenv("GROQ_API_KEY"):
+        monkeypatch.setenv("GROQ_API_KEY", "test")
+    from endpoints import transcript
+    return transcript
+
+
+def _client(monkeypatch) -> TestClient:
+    """Client for the transcript router, backed by an in-memory database holding one video."""
+    transcript = _load_transcript_endpoints(monkeypatch)
+    db = VideoDatabase(":memory:")
+    db.save_video(VIDEO_ID, [
+        SimpleNamespace(text="Hello world", start=0, duration=5),
+        SimpleNamespace(text="Goodbye", start=5, duration=5)
+    ], "Test Video")
+    monkeypatch.setattr(transcript, "get_db", lambda: db)
+
+    app = FastAPI()
+    app.include_router(transcript.router)
+    return TestClient(app)
+
+
+def test_if_none_match(monkeypatch):
+    """A request naming the current ETag gets 304 Not Modified."""
+    client = _client(monkeypatch)
+
+    response = client.get("/transcript", params={"video_url": VIDEO_ID})
+    assert response.status_code == 200
+    assert response.json()["transcript"] == "Hello world Goodbye"
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "public, max-age=86400, immutable"
+
+    not_modified = client.get("/transcript", params={"video_url": VIDEO_ID}, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+
+    # Weak tags (e.g. from compression middleware) and tag lists match too
+    weak = client.get("/transcript", params={"video_url": VIDEO_ID}, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert weak.status_code == 304
+
+    changed = client.get("/transcript", params={"video_url": VIDEO_ID}, headers={"If-None-Match": '"other"'})
+    assert changed.status_code == 200
+    print("✅ If-None-Match answered with 304")
+
+
+def test_stream_etag_differs(monkeypatch):
+    """The streamed and JSON forms have different ETags."""
+    client = _client(monkeypatch)
+
+    json_etag = client.get("/transcript", params={"video_url": VIDEO_ID}).headers["etag"]
+    streamed = client.get("/transcript", params={"video_url": VIDEO_ID, "stream": "true"})
+    assert streamed.status_code == 200
+    assert streamed.text == "Hello world Goodbye"
+    assert streamed.headers["etag"] != json_etag
+
+    # The JSON form's ETag doesn't validate the streamed form
+    response = client.get("/transcript", params={"video_url": VIDEO_ID, "stream": "true"}, headers={"If-None-Match": json_etag})
+    assert response.status_code == 200
+    response = client.get("/transcript", params={"video_url": VIDEO_ID, "stream": "true"}, headers={"If-None-Match": streamed.headers["etag"]})
+    assert response.status_code == 304
+    print("✅ Streamed and JSON ETags differ")
+
+
+if __name__ == "__main__":
+    with pytest.MonkeyPatch.context() as mp:
+        test_if_none_match(mp)
+    with pytest.MonkeyPatch.context() as mp:
+        test_stream_etag_differs(mp)
+    print("\n🎉 All tests passed!")